@@ -9,11 +9,24 @@ Usage:
     Additionally none of these functions actually care about the data type of provided control points. This way these
     functions can support points or matrices or Maya attribute names. The output mapping will use the same control
     point that were provided.
+
+    The batch functions evaluate many parameters at once with NumPy and return dense weight matrices, one row per
+    parameter and one column per provided control point.
+
+    Knot data is precomputed once per cv count, degree and knot vector in a SplineBasis. Every function builds or
+    reuses one from a cache, a basis can also be passed explicitly when sampling the same curve many times.
+
+    pruneWeights and pruneWeightMatrix drop negligible weights before they are wired into wtAddMatrix nodes, every
+    removed weight is one less connection for Maya to evaluate.
 Examples:
     This module does include some Maya examples at the very end. These example functions are intended to be used for 
     testing or serve as a starting point for use elsewhere. They are not designed to be functional auto-riggers.
 """
 
+from bisect import bisect_right
+
+import numpy as np
+
 
 def defaultKnots(count, degree=3):
     """
@@ -29,148 +42,239 @@ def defaultKnots(count, degree=3):
     return [float(knot) for knot in knots]
 
 
-def pointOnCurveWeights(cvs, t, degree, knots=None):
+class SplineBasis(object):
     """
-    Creates a mapping of cvs to curve weight values on a spline curve.
-    While all cvs are required, only the cvs with non-zero weights will be returned.
-    This function is based on de Boor's algorithm for evaluating splines and has been modified to consolidate weights.
+    Precomputed knot data for a curve with a given cv count, degree and knot vector.
+    The knot vector is validated and normalized once, the parameter remapping is stored and the reciprocal of every
+    knot interval the de Boor algorithm divides by is cached. Use SplineBasis.get to share instances between calls.
+
+    Knot vectors can either have len(cvs) + degree + 1 values or use Maya's convention of len(cvs) + degree - 1 values,
+    without the first and last knot. Periodic bases wrap the first degree cvs around the end of the curve, count is
+    then the amount of unique cvs and cv indices are wrapped with SplineBasis.wrap.
+    """
+
+    _cache = {}
+
+    def __init__(self, count, degree=3, knots=None, periodic=False):
+        """
+        Args:
+            count(int): The number of cvs, without the wrapped ones on periodic curves.
+            degree(int): The curve degree.
+            knots(list, optional): A list of knot values. Defaults to an even knot distribution.
+            periodic(bool, optional): Build a closed curve that loops back onto its first cvs.
+        """
+
+        order = degree + 1  # Our functions often use order instead of degree
+        if count <= degree and not periodic:
+            raise CurveException(f'Curves of degree {degree} require at least {degree + 1} cvs')
+        if periodic and count < 2:
+            raise CurveException('Periodic curves require at least 2 cvs')
+
+        # Periodic curves are evaluated as open curves over their wrapped cvs
+        spanCount = count + degree if periodic else count
+        if not knots:
+            knots = [i for i in range(spanCount + order)] if periodic else defaultKnots(count, degree)
+
+        # Maya omits the first and last knot, they never contribute inside the curve domain
+        if len(knots) == spanCount + degree - 1:
+            knots = [knots[0]] + list(knots) + [knots[-1]]
+
+        if len(knots) != spanCount + order:
+            raise CurveException(f'Not enough knots provided. Curves with {spanCount} cvs must have a knot vector of length {spanCount + order}. '
+                                 f'Received a knot vector of length {len(knots)}: {knots}. '
+                                 'Total knot count must equal len(cvs) + degree + 1.')
+
+        if any(knots[i] > knots[i + 1] for i in range(len(knots) - 1)):
+            raise CurveException(f'Knot values must never decrease. Received {knots}.')
+
+        self.count = count
+        self.degree = degree
+        self.periodic = periodic
+        self.knots = [float(knot) for knot in knots]
+        self.innerKnots = self.knots[order:len(knots) - order]
+
+        # Remapping of the t value to the curve domain, between the knots bounding the first and last segments.
+        min = self.knots[degree]
+        max = self.knots[spanCount]
+        if max <= min:
+            raise CurveException(f'Knot vector {knots} has an empty domain.')
+        self.offset = min
+        self.scale = max - min
+
+        # reciprocals[width][i] is 1 / (knots[i + width] - knots[i]), empty intervals are set to zero
+        self.reciprocals = [[]]
+        for width in range(1, order):
+            self.reciprocals.append([
+                1.0 / (self.knots[i + width] - self.knots[i]) if self.knots[i + width] != self.knots[i] else 0.0
+                for i in range(len(knots) - width)
+            ])
+
+        # Array versions used by the batch functions
+        self.knotArray = np.asarray(self.knots)
+        self.innerKnotArray = np.asarray(self.innerKnots)
+        self.reciprocalArray = np.zeros((order, len(knots)))
+        for width in range(1, order):
+            self.reciprocalArray[width, :len(knots) - width] = self.reciprocals[width]
+
+    @classmethod
+    def get(cls, count, degree=3, knots=None, periodic=False):
+        """
+        Gets a cached basis, building it on the first request.
+        Args:
+            count(int): The number of cvs.
+            degree(int): The curve degree.
+            knots(list, optional): A list of knot values.
+            periodic(bool, optional): Build a closed curve.
+        Returns:
+            SplineBasis: The basis for these curve parameters.
+        """
+
+        key = (count, degree, tuple(knots) if knots else None, periodic)
+        basis = cls._cache.get(key)
+        if basis is None:
+            basis = cls._cache[key] = cls(count, degree, knots, periodic)
+        return basis
+
+    def wrap(self, index):
+        """
+        Maps the cv indices of the evaluated curve to the provided cvs, looping them on periodic curves.
+        Args:
+            index(int): A cv index or an array of them.
+        Returns:
+            int: The matching index in the provided cvs.
+        """
+
+        return index % self.count if self.periodic else index
+
+    def segment(self, t):
+        """
+        Remaps a parameter value to the knot range and finds the segment it lies in.
+        Args:
+            t(float): A parameter value.
+        Returns:
+            tuple: The remapped parameter and the segment index.
+        """
+
+        t = (t * self.scale) + self.offset
+        return t, bisect_right(self.innerKnots, t) + self.degree
+
+    def segments(self, ts):
+        """
+        Remaps parameter values to the knot range and finds the segment each of them lies in.
+        Args:
+            ts(list): A list or array of parameter values.
+        Returns:
+            tuple: The remapped parameters and their segment indices as arrays.
+        """
+
+        ts = (np.atleast_1d(np.asarray(ts, dtype=float)) * self.scale) + self.offset
+        return ts, np.searchsorted(self.innerKnotArray, ts, side='right') + self.degree
+
+
+def _curveBasis(count, degree, knots=None, basis=None):
+    """
+    Gets the basis to use for a curve, checking a provided one matches the cv count.
     Args:
-        cvs(list): A list of cvs, these are used for the return value.
-        t(float): A parameter value. 
-        degree(int): The curve dimensions. 
-        knots(list): A list of knot values. 
+        count(int): The number of cvs.
+        degree(int): The curve degree.
+        knots(list): A list of knot values.
+        basis(SplineBasis): A precomputed basis.
     Returns:
-        list: A list of control point, weight pairs.
+        SplineBasis: The basis to use.
     """
 
-    order = degree + 1  # Our functions often use order instead of degree
-    if len(cvs) <= degree:
-        raise CurveException(f'Curves of degree {degree} require at least {degree + 1} cvs')
-
-    knots = knots or defaultKnots(len(cvs), degree)  # Defaults to even knot distribution
-    if len(knots) != len(cvs) + order:
-        raise CurveException(f'Not enough knots provided. Curves with {len(cvs)} cvs must have a knot vector of length {len(cvs) + order}. '
-                             f'Received a knot vector of length {len(knots)}: {knots}. '
-                             'Total knot count must equal len(cvs) + degree + 1.')
+    if basis is None:
+        return SplineBasis.get(count, degree, knots)
 
-    # Convert cvs into hash-able indices
-    _cvs = cvs
-    cvs = [i for i in range(len(cvs))]
+    if basis.count != count or basis.degree != degree:
+        raise CurveException(f'Basis was built for {basis.count} cvs of degree {basis.degree}, '
+                             f'received {count} cvs of degree {degree}.')
+    return basis
 
-    # Remap the t value to the range of knot values.
-    min = knots[order] - 1
-    max = knots[len(knots) - 1 - order] + 1
-    t = (t * (max - min)) + min
 
-    # Determine which segment the t lies in
-    segment = degree
-    for index, knot in enumerate(knots[order:len(knots) - order]):
-        if knot <= t:
-            segment = index + order
+def _deBoor(t, segment, degree, basis):
+    """
+    Runs a modified version of de Boors algorithm on the cvs of a single segment.
+    Args:
+        t(float): The remapped parameter value.
+        segment(int): The segment index.
+        degree(int): The degree to evaluate, this can be lower than the basis degree.
+        basis(SplineBasis): The curve basis.
+    Returns:
+        list: The weight of each of the degree + 1 cvs of the segment.
+    """
 
-    # Filter out cvs we won't be using
-    cvs = [cvs[j + segment - degree] for j in range(0, degree + 1)]
+    knots = basis.knots
+    order = degree + 1
 
-    # Run a modified version of de Boors algorithm
-    cvWeights = [{cv: 1.0} for cv in cvs]
-    for r in range(1, degree + 1):
+    # Each cv starts with a full weight on itself, weights[j][k] is the weight of cv k in the j-th point
+    weights = [[1.0 if k == j else 0.0 for k in range(order)] for j in range(order)]
+    for r in range(1, order):
+        reciprocals = basis.reciprocals[order - r]
         for j in range(degree, r - 1, -1):
-            right = j + 1 + segment - r
             left = j + segment - degree
-            alpha = (t - knots[left]) / (knots[right] - knots[left])
-
-            weights = {}
-            for cv, weight in cvWeights[j].items():
-                weights[cv] = weight * alpha
-
-            for cv, weight in cvWeights[j - 1].items():
-                if cv in weights:
-                    weights[cv] += weight * (1 - alpha)
-                else:
-                    weights[cv] = weight * (1 - alpha)
+            alpha = (t - knots[left]) * reciprocals[left]
+            weights[j] = [a * alpha + b * (1 - alpha) for a, b in zip(weights[j], weights[j - 1])]
 
-            cvWeights[j] = weights
+    return weights[degree]
 
-    cvWeights = cvWeights[degree]
-    return [[_cvs[index], weight] for index, weight in cvWeights.items()]
 
-
-def tangentOnCurveWeights(cvs, t, degree, knots=None):
+def pointOnCurveWeights(cvs, t, degree, knots=None, basis=None):
     """
-    Creates a mapping of cvs to curve tangent weight values.
+    Creates a mapping of cvs to curve weight values on a spline curve.
     While all cvs are required, only the cvs with non-zero weights will be returned.
+    This function is based on de Boor's algorithm for evaluating splines and has been modified to consolidate weights.
     Args:
         cvs(list): A list of cvs, these are used for the return value.
         t(float): A parameter value. 
         degree(int): The curve dimensions. 
         knots(list): A list of knot values. 
+        basis(SplineBasis, optional): A precomputed basis, replaces knots.
     Returns:
         list: A list of control point, weight pairs.
     """
 
-    order = degree + 1  # Our functions often use order instead of degree
-    if len(cvs) <= degree:
-        raise CurveException(f'Curves of degree {degree} require at least {degree + 1} cvs')
+    basis = _curveBasis(len(cvs), degree, knots, basis)
+    t, segment = basis.segment(t)
+    weights = _deBoor(t, segment, degree, basis)
 
-    knots = knots or defaultKnots(len(cvs), degree)  # Defaults to even knot distribution
-    if len(knots) != len(cvs) + order:
-        raise CurveException(f'Not enough knots provided. Curves with {len(cvs)} cvs must have a knot vector of length {len(cvs) + order}. '
-                             f'Received a knot vector of length {len(knots)}: {knots}. '
-                             f'Total knot count must equal len(cvs) + degree + 1.')
+    first = segment - degree
+    return [[cvs[basis.wrap(first + index)], weights[index]] for index in range(degree, -1, -1)]
 
-    # Remap the t value to the range of knot values.
-    min = knots[order] - 1
-    max = knots[len(knots) - 1 - order] + 1
-    t = (t * (max - min)) + min
 
-    # Determine which segment the t lies in
-    segment = degree
-    for index, knot in enumerate(knots[order:len(knots) - order]):
-        if knot <= t:
-            segment = index + order
+def tangentOnCurveWeights(cvs, t, degree, knots=None, basis=None):
+    """
+    Creates a mapping of cvs to curve tangent weight values.
+    While all cvs are required, only the cvs with non-zero weights will be returned.
+    Args:
+        cvs(list): A list of cvs, these are used for the return value.
+        t(float): A parameter value. 
+        degree(int): The curve dimensions. 
+        knots(list): A list of knot values. 
+        basis(SplineBasis, optional): A precomputed basis, replaces knots.
+    Returns:
+        list: A list of control point, weight pairs.
+    """
 
-    # Convert cvs into hash-able indices
-    _cvs = cvs
-    cvs = [i for i in range(len(cvs))]
+    basis = _curveBasis(len(cvs), degree, knots, basis)
+    t, segment = basis.segment(t)
 
     # In order to find the tangent we need to find points on a lower degree curve
-    degree = degree - 1
-    qWeights = [{cv: 1.0} for cv in range(0, degree + 1)]
-
-    # Get the DeBoor weights for this lower degree curve
-    for r in range(1, degree + 1):
-        for j in range(degree, r - 1, -1):
-            right = j + 1 + segment - r
-            left = j + segment - degree
-            alpha = (t - knots[left]) / (knots[right] - knots[left])
-
-            weights = {}
-            for cv, weight in qWeights[j].items():
-                weights[cv] = weight * alpha
-
-            for cv, weight in qWeights[j - 1].items():
-                if cv in weights:
-                    weights[cv] += weight * (1 - alpha)
-                else:
-                    weights[cv] = weight * (1 - alpha)
-
-            qWeights[j] = weights
-    weights = qWeights[degree]
+    weights = _deBoor(t, segment, degree - 1, basis)
 
     # Take the lower order weights and match them to our actual cvs
+    reciprocals = basis.reciprocals[degree]
     cvWeights = []
-    for j in range(0, degree + 1):
-        weight = weights[j]
-        cv0 = j + segment - degree
-        cv1 = j + segment - degree - 1
-        alpha = weight * (degree + 1) / (knots[j + segment + 1] - knots[j + segment - degree])
-        cvWeights.append([cvs[cv0], alpha])
-        cvWeights.append([cvs[cv1], -alpha])
+    for j in range(0, degree):
+        cv0 = j + segment - degree + 1
+        alpha = weights[j] * degree * reciprocals[cv0]
+        cvWeights.append([cvs[basis.wrap(cv0)], alpha])
+        cvWeights.append([cvs[basis.wrap(cv0 - 1)], -alpha])
 
-    return [[_cvs[index], weight] for index, weight in cvWeights]
+    return cvWeights
 
 
-def pointOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
+def pointOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
     """
     Creates a mapping of cvs to surface point weight values.
     Args:
@@ -180,20 +284,21 @@ def pointOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
         uKnots(list, optional): A list of knot integers along u.
         vKnots(list, optional): A list of knot integers along v.
         degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
     Returns:
         list: A list of control point, weight pairs.
     """
-    matrixWeightRows = [pointOnCurveWeights(row, u, degree, uKnots) for row in cvs]
-    matrixWeightColumns = pointOnCurveWeights([i for i in range(len(matrixWeightRows))], v, degree, vKnots)
-    surfaceMatrixWeights = []
-    for index, weight in matrixWeightColumns:
-        matrixWeights = matrixWeightRows[index]
-        surfaceMatrixWeights.extend([[m, (w * weight)] for m, w in matrixWeights])
+    uBasis = _curveBasis(len(cvs[0]), degree, uKnots, uBasis)
+    vBasis = _curveBasis(len(cvs), degree, vKnots, vBasis)
 
-    return surfaceMatrixWeights
+    # The surface is separable, each direction is evaluated once on the row and column indices
+    columnWeights = pointOnCurveWeights(range(uBasis.count), u, degree, basis=uBasis)
+    rowWeights = pointOnCurveWeights(range(vBasis.count), v, degree, basis=vBasis)
+    return [[cvs[row][column], w * weight] for row, weight in rowWeights for column, w in columnWeights]
 
 
-def tangentUOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
+def tangentUOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
     """
     Creates a mapping of cvs to surface tangent weight values along the u axis.
     Args:
@@ -203,21 +308,21 @@ def tangentUOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
         uKnots(list, optional): A list of knot integers along u.
         vKnots(list, optional): A list of knot integers along v.
         degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
     Returns:
         list: A list of control point, weight pairs.
     """
 
-    matrixWeightRows = [pointOnCurveWeights(row, u, degree, uKnots) for row in cvs]
-    matrixWeightColumns = tangentOnCurveWeights([i for i in range(len(matrixWeightRows))], v, degree, vKnots)
-    surfaceMatrixWeights = []
-    for index, weight in matrixWeightColumns:
-        matrixWeights = matrixWeightRows[index]
-        surfaceMatrixWeights.extend([[m, (w * weight)] for m, w in matrixWeights])
+    uBasis = _curveBasis(len(cvs[0]), degree, uKnots, uBasis)
+    vBasis = _curveBasis(len(cvs), degree, vKnots, vBasis)
 
-    return surfaceMatrixWeights
+    columnWeights = pointOnCurveWeights(range(uBasis.count), u, degree, basis=uBasis)
+    rowWeights = tangentOnCurveWeights(range(vBasis.count), v, degree, basis=vBasis)
+    return [[cvs[row][column], w * weight] for row, weight in rowWeights for column, w in columnWeights]
 
 
-def tangentVOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
+def tangentVOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
     """
     Creates a mapping of cvs to surface tangent weight values along the v axis.
     Args:
@@ -227,14 +332,345 @@ def tangentVOnSurfaceWeights(cvs, u, v, uKnots=None, vKnots=None, degree=3):
         uKnots(list, optional): A list of knot integers along u.
         vKnots(list, optional): A list of knot integers along v.
         degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
     Returns:
         list: A list of control point, weight pairs.
     """
-    # Re-order the cvs
-    rowCount = len(cvs)
-    columnCount = len(cvs[0])
-    reorderedCvs = [[cvs[row][col] for row in range(rowCount)] for col in range(columnCount)]
-    return tangentUOnSurfaceWeights(reorderedCvs, v, u, uKnots=vKnots, vKnots=uKnots, degree=degree)
+    uBasis = _curveBasis(len(cvs[0]), degree, uKnots, uBasis)
+    vBasis = _curveBasis(len(cvs), degree, vKnots, vBasis)
+
+    # Same as tangentUOnSurfaceWeights with the grid transposed, without building the transposed grid
+    columnWeights = tangentOnCurveWeights(range(uBasis.count), u, degree, basis=uBasis)
+    rowWeights = pointOnCurveWeights(range(vBasis.count), v, degree, basis=vBasis)
+    return [[cvs[row][column], w * weight] for column, weight in columnWeights for row, w in rowWeights]
+
+
+def pointOnCurveWeightMatrix(cvs, ts, degree, knots=None, basis=None):
+    """
+    Creates a dense matrix of curve weight values for many parameters at once.
+    Each row holds the same weights pointOnCurveWeights would return for that parameter, cvs that don't contribute
+    have a weight of zero.
+    Args:
+        cvs(list): A list of cvs, only its length is used.
+        ts(list): A list or array of parameter values.
+        degree(int): The curve dimensions.
+        knots(list): A list of knot values.
+        basis(SplineBasis, optional): A precomputed basis, replaces knots.
+    Returns:
+        numpy.ndarray: A (len(ts), len(cvs)) array of weights.
+    """
+
+    basis = _curveBasis(len(cvs), degree, knots, basis)
+    first, weights = _batchLocalWeights(ts, basis)
+    return _denseMatrix(basis.wrap(first[:, None] + np.arange(degree + 1)), weights, len(cvs))
+
+
+def tangentOnCurveWeightMatrix(cvs, ts, degree, knots=None, basis=None):
+    """
+    Creates a dense matrix of curve tangent weight values for many parameters at once.
+    Each row holds the summed weights tangentOnCurveWeights would return for that parameter.
+    Args:
+        cvs(list): A list of cvs, only its length is used.
+        ts(list): A list or array of parameter values.
+        degree(int): The curve dimensions.
+        knots(list): A list of knot values.
+        basis(SplineBasis, optional): A precomputed basis, replaces knots.
+    Returns:
+        numpy.ndarray: A (len(ts), len(cvs)) array of tangent weights.
+    """
+
+    basis = _curveBasis(len(cvs), degree, knots, basis)
+    first, weights = _batchLocalWeights(ts, basis, tangent=True)
+    return _denseMatrix(basis.wrap(first[:, None] + np.arange(degree + 1)), weights, len(cvs))
+
+
+def pointOnSurfaceWeightArrays(cvs, us, vs, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
+    """
+    Creates sparse surface point weights for many (u, v) samples at once.
+    The u and v directions are evaluated once each for every sample and combined as an outer product, sample i is
+    the weighted sum of cvs[rows[i, k]][columns[i, k]] by weights[i, k].
+    Args:
+        cvs(list): A list of cv rows, only the grid size is used.
+        us(list): A list or array of u parameter values.
+        vs(list): A list or array of v parameter values, one per u value.
+        uKnots(list, optional): A list of knot integers along u.
+        vKnots(list, optional): A list of knot integers along v.
+        degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
+    Returns:
+        tuple: The rows, columns and weights arrays, each of shape (len(us), (degree + 1) ** 2).
+    """
+
+    return _surfaceWeightArrays(cvs, us, vs, uKnots, vKnots, degree, uBasis, vBasis)
+
+
+def tangentUOnSurfaceWeightArrays(cvs, us, vs, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
+    """
+    Creates sparse surface tangent weights along the u axis for many (u, v) samples at once.
+    Matches tangentUOnSurfaceWeights, with the weights of duplicated cvs summed.
+    Args:
+        cvs(list): A list of cv rows, only the grid size is used.
+        us(list): A list or array of u parameter values.
+        vs(list): A list or array of v parameter values, one per u value.
+        uKnots(list, optional): A list of knot integers along u.
+        vKnots(list, optional): A list of knot integers along v.
+        degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
+    Returns:
+        tuple: The rows, columns and weights arrays, each of shape (len(us), (degree + 1) ** 2).
+    """
+
+    return _surfaceWeightArrays(cvs, us, vs, uKnots, vKnots, degree, uBasis, vBasis, rowTangent=True)
+
+
+def tangentVOnSurfaceWeightArrays(cvs, us, vs, uKnots=None, vKnots=None, degree=3, uBasis=None, vBasis=None):
+    """
+    Creates sparse surface tangent weights along the v axis for many (u, v) samples at once.
+    Matches tangentVOnSurfaceWeights, with the weights of duplicated cvs summed.
+    Args:
+        cvs(list): A list of cv rows, only the grid size is used.
+        us(list): A list or array of u parameter values.
+        vs(list): A list or array of v parameter values, one per u value.
+        uKnots(list, optional): A list of knot integers along u.
+        vKnots(list, optional): A list of knot integers along v.
+        degree(int, optional): The degree of the curve. Minimum is 2.
+        uBasis(SplineBasis, optional): A precomputed basis along u, replaces uKnots.
+        vBasis(SplineBasis, optional): A precomputed basis along v, replaces vKnots.
+    Returns:
+        tuple: The rows, columns and weights arrays, each of shape (len(us), (degree + 1) ** 2).
+    """
+
+    return _surfaceWeightArrays(cvs, us, vs, uKnots, vKnots, degree, uBasis, vBasis, columnTangent=True)
+
+
+def pruneWeights(weights, epsilon=1e-4, topK=None, normalize=True):
+    """
+    Reduces a list of control point, weight pairs to the ones that matter.
+    Duplicated cvs are merged, weights with an absolute value at or below epsilon are removed and only the topK
+    largest ones are kept. The remaining weights are then renormalized so they keep the sum of the original weights,
+    point weights still sum to one and tangent weights still sum to zero.
+    Args:
+        weights(list): A list of control point, weight pairs.
+        epsilon(float, optional): Weights at or below this absolute value are removed.
+        topK(int, optional): The maximum amount of weights to keep.
+        normalize(bool, optional): Renormalize the remaining weights.
+    Returns:
+        tuple: The pruned list of control point, weight pairs and the amount of pairs removed.
+    """
+
+    # Merge duplicated cvs, cvs aren't required to be hashable
+    merged = []
+    for cv, weight in weights:
+        for pair in merged:
+            if pair[0] == cv:
+                pair[1] += weight
+                break
+        else:
+            merged.append([cv, weight])
+
+    pruned = [pair for pair in merged if abs(pair[1]) > epsilon]
+    if topK is not None:
+        pruned = sorted(pruned, key=lambda pair: abs(pair[1]), reverse=True)[:topK]
+
+    if normalize and pruned:
+        total = sum(weight for cv, weight in weights)
+        values = _renormalize([weight for cv, weight in pruned], total, _isZeroSum(total, [w for cv, w in weights]))
+        pruned = [[cv, value] for (cv, weight), value in zip(pruned, values)]
+
+    return pruned, len(weights) - len(pruned)
+
+
+def pruneWeightMatrix(matrix, epsilon=1e-4, topK=None, normalize=True):
+    """
+    Reduces each row of a dense weight matrix to the weights that matter.
+    This is the batch version of pruneWeights, removed weights are set to zero.
+    Args:
+        matrix(numpy.ndarray): A (samples, cvs) array of weights.
+        epsilon(float, optional): Weights at or below this absolute value are removed.
+        topK(int, optional): The maximum amount of weights to keep per row.
+        normalize(bool, optional): Renormalize the remaining weights of each row.
+    Returns:
+        tuple: The pruned matrix and the amount of non-zero weights removed.
+    """
+
+    matrix = np.array(matrix, dtype=float)
+    magnitudes = np.abs(matrix)
+    keep = magnitudes > epsilon
+    if topK is not None:
+        ranks = np.argsort(np.argsort(-magnitudes, axis=1, kind='stable'), axis=1)
+        keep &= ranks < topK
+
+    pruned = np.where(keep, matrix, 0.0)
+    if normalize:
+        totals = matrix.sum(axis=1)
+        kept = pruned.sum(axis=1)
+
+        # Rows with a sum, like point weights, are scaled back to their total
+        scaled = ~_isZeroSum(totals, magnitudes.sum(axis=1)) & (kept != 0)
+        pruned[scaled] *= (totals[scaled] / kept[scaled])[:, None]
+
+        # Rows summing to zero, like tangent weights, get the residual spread by magnitude
+        spread = np.abs(pruned).sum(axis=1)
+        shifted = ~scaled & (spread > 0)
+        residual = (kept[shifted] - totals[shifted]) / spread[shifted]
+        pruned[shifted] -= residual[:, None] * np.abs(pruned[shifted])
+
+    return pruned, int(np.count_nonzero(matrix) - np.count_nonzero(pruned))
+
+
+def _isZeroSum(total, weights):
+    """
+    Checks if weights sum to zero, like tangent weights, relative to their magnitude.
+    Args:
+        total(float): The sum of the weights, or an array of sums.
+        weights(list): The weights, or an array of absolute weight sums matching total.
+    Returns:
+        bool: True if the weights sum to zero.
+    """
+
+    magnitude = np.sum(np.abs(weights)) if isinstance(weights, list) else weights
+    return np.abs(total) <= 1e-9 * np.maximum(magnitude, 1.0)
+
+
+def _renormalize(values, total, zeroSum):
+    """
+    Adjusts a list of weights so they sum to a given total.
+    Args:
+        values(list): A list of weights.
+        total(float): The expected sum.
+        zeroSum(bool): The expected sum is zero, the weights are shifted instead of scaled.
+    Returns:
+        list: The adjusted weights.
+    """
+
+    kept = sum(values)
+    if not zeroSum and kept != 0:
+        return [value * (total / kept) for value in values]
+
+    # Weights summing to zero can't be scaled, the residual is spread by magnitude instead
+    spread = sum(abs(value) for value in values)
+    if not spread:
+        return values
+    residual = (kept - total) / spread
+    return [value - residual * abs(value) for value in values]
+
+
+def _surfaceWeightArrays(cvs, us, vs, uKnots, vKnots, degree, uBasis, vBasis, rowTangent=False, columnTangent=False):
+    """
+    Combines the column weights along u and the row weights along v of many samples.
+    Args:
+        cvs(list): A list of cv rows, only the grid size is used.
+        us(list): A list or array of u parameter values.
+        vs(list): A list or array of v parameter values.
+        uKnots(list): A list of knot integers along u.
+        vKnots(list): A list of knot integers along v.
+        degree(int): The degree of the curve.
+        uBasis(SplineBasis): A precomputed basis along u.
+        vBasis(SplineBasis): A precomputed basis along v.
+        rowTangent(bool): Use tangent weights across the rows.
+        columnTangent(bool): Use tangent weights across the columns.
+    Returns:
+        tuple: The rows, columns and weights arrays.
+    """
+
+    uBasis = _curveBasis(len(cvs[0]), degree, uKnots, uBasis)
+    vBasis = _curveBasis(len(cvs), degree, vKnots, vBasis)
+    if np.shape(us) != np.shape(vs):
+        raise CurveException(f'Received {np.size(us)} u values and {np.size(vs)} v values.')
+
+    firstColumns, columnWeights = _batchLocalWeights(us, uBasis, tangent=columnTangent)
+    firstRows, rowWeights = _batchLocalWeights(vs, vBasis, tangent=rowTangent)
+
+    order = degree + 1
+    count = len(firstRows)
+    local = np.arange(order)
+    rows = np.broadcast_to(vBasis.wrap(firstRows[:, None] + local)[:, :, None], (count, order, order))
+    columns = np.broadcast_to(uBasis.wrap(firstColumns[:, None] + local)[:, None, :], (count, order, order))
+    weights = columnWeights[:, None, :] * rowWeights[:, :, None]
+
+    shape = (count, order * order)
+    return rows.reshape(shape), columns.reshape(shape), weights.reshape(shape)
+
+
+def _batchLocalWeights(ts, basis, tangent=False):
+    """
+    Gets the weights of the cvs of the segment each parameter lies in.
+    Args:
+        ts(list): A list or array of parameter values.
+        basis(SplineBasis): The curve basis.
+        tangent(bool): Get tangent weights instead of point weights.
+    Returns:
+        tuple: The index of the first cv of each segment and a (len(ts), degree + 1) array of weights.
+    """
+
+    degree = basis.degree
+    ts, segments = basis.segments(ts)
+    first = segments - degree
+    if not tangent:
+        return first, _batchDeBoor(ts, segments, degree, basis)
+
+    # In order to find the tangent we need to find points on a lower degree curve
+    weights = _batchDeBoor(ts, segments, degree - 1, basis)
+
+    # Take the lower order weights and match them to our actual cvs, in the same order as the scalar function
+    reciprocals = basis.reciprocalArray[degree]
+    tangentWeights = np.zeros((len(ts), degree + 1))
+    for j in range(0, degree):
+        alpha = weights[:, j] * degree * reciprocals[first + j + 1]
+        tangentWeights[:, j + 1] += alpha
+        tangentWeights[:, j] -= alpha
+
+    return first, tangentWeights
+
+
+def _denseMatrix(columns, weights, count):
+    """
+    Scatters local segment weights into a dense weight matrix.
+    Args:
+        columns(numpy.ndarray): The cv index of each local weight.
+        weights(numpy.ndarray): The local weights of each segment.
+        count(int): The number of cvs.
+    Returns:
+        numpy.ndarray: A (len(columns), count) array of weights.
+    """
+
+    # Weights are accumulated since periodic curves can map several local weights to the same cv
+    rows = np.broadcast_to(np.arange(len(columns))[:, None], columns.shape)
+    matrix = np.zeros((len(columns), count))
+    np.add.at(matrix, (rows, columns), weights)
+    return matrix
+
+
+def _batchDeBoor(ts, segments, degree, basis):
+    """
+    Runs the modified de Boor's algorithm for many parameters at once.
+    Args:
+        ts(numpy.ndarray): The remapped parameter values.
+        segments(numpy.ndarray): The segment index of each parameter.
+        degree(int): The degree to evaluate, this can be lower than the basis degree.
+        basis(SplineBasis): The curve basis.
+    Returns:
+        numpy.ndarray: A (len(ts), degree + 1) array of weights for the cvs of each segment.
+    """
+
+    knots = basis.knotArray
+    order = degree + 1
+
+    # Each cv starts with a full weight on itself, weights[:, j, k] is the weight of cv k in the j-th point
+    weights = np.zeros((len(ts), order, order))
+    weights[:, range(order), range(order)] = 1.0
+
+    for r in range(1, order):
+        reciprocals = basis.reciprocalArray[order - r]
+        for j in range(degree, r - 1, -1):
+            left = j + segments - degree
+            alpha = ((ts - knots[left]) * reciprocals[left])[:, None]
+            weights[:, j] = weights[:, j] * alpha + weights[:, j - 1] * (1 - alpha)
+
+    return weights[:, degree]
 
 
 class CurveException(BaseException):
@@ -245,7 +681,10 @@ class CurveException(BaseException):
 
 
 import math
+import time
+import timeit
 from maya import cmds
+from .mayatools_api import GraphBuilder
 
 
 def _testCube(radius=1.0, color=(1,1,1), name='cube', position=(0,0,0)):
@@ -276,7 +715,7 @@ def _testSphere(radius=1.0, color=(1,1,1), name='sphere', position=(0,0,0)):
 
 
 
-def _testMatrixOnCurve(count=4, p_count=None, degree=3):
+def _testMatrixOnCurve(count=4, p_count=None, degree=3, epsilon=None, top_k=None, batch=False):
     """
     Creates an example curve with the given cv and point counts.
     
@@ -284,12 +723,21 @@ def _testMatrixOnCurve(count=4, p_count=None, degree=3):
         count (int): The amount of cvs. 
         p_count (int): The amount of points to attach to the curve.
         degree (int): The degree of the curve.
+        epsilon (float): Prune weights at or below this value, see pruneWeights.
+        top_k (int): Keep only this many weights per wtAddMatrix node, see pruneWeights.
+        batch (bool): Collect the matrix networks in a GraphBuilder and commit them in one pass.
+
+    Returns:
+        int: The amount of wtAddMatrix connections saved by pruning.
     """
 
     p_count = p_count or count * 4
     c_radius = 1.0
     p_radius = 0.5
     spacing = c_radius * 5
+    prune = epsilon is not None or top_k is not None
+    saved = 0
+    graph = GraphBuilder() if batch else cmds
 
     # Create the control points
     cv_matrices = []
@@ -304,34 +752,47 @@ def _testMatrixOnCurve(count=4, p_count=None, degree=3):
 
         # Create the position matrix
         point_matrix_weigths = pointOnCurveWeights(cv_matrices, t, degree=degree)
-        point_matrix_node = cmds.createNode('wtAddMatrix', name=f'pointMatrix0{i + 1}')
+        if prune:
+            point_matrix_weigths, removed = pruneWeights(point_matrix_weigths, epsilon or 0.0, top_k)
+            saved += removed
+        point_matrix_node = graph.createNode('wtAddMatrix', name=f'pointMatrix0{i + 1}')
         for index, (matrix, weight) in enumerate(point_matrix_weigths):
-            cmds.connectAttr(matrix, f'{point_matrix_node}.wtMatrix[{index}].matrixIn')
-            cmds.setAttr(f'{point_matrix_node}.wtMatrix[{index}].weightIn', weight)
+            graph.connectAttr(matrix, f'{point_matrix_node}.wtMatrix[{index}].matrixIn')
+            graph.setAttr(f'{point_matrix_node}.wtMatrix[{index}].weightIn', weight)
 
         # Create the tangent matrix
         tangent_matrix_weigths = tangentOnCurveWeights(cv_matrices, t, degree=degree)
-        tangent_matrix_node = cmds.createNode('wtAddMatrix', name=f'tangentMatrix0{i + 1}')
+        if prune:
+            tangent_matrix_weigths, removed = pruneWeights(tangent_matrix_weigths, epsilon or 0.0, top_k)
+            saved += removed
+        tangent_matrix_node = graph.createNode('wtAddMatrix', name=f'tangentMatrix0{i + 1}')
         for index, (matrix, weight) in enumerate(tangent_matrix_weigths):
-            cmds.connectAttr(matrix, f'{tangent_matrix_node}.wtMatrix[{index}].matrixIn')
-            cmds.setAttr(f'{tangent_matrix_node}.wtMatrix[{index}].weightIn', weight)
+            graph.connectAttr(matrix, f'{tangent_matrix_node}.wtMatrix[{index}].matrixIn')
+            graph.setAttr(f'{tangent_matrix_node}.wtMatrix[{index}].weightIn', weight)
 
         # Create an aim matrix node
-        aim_matrix_node = cmds.createNode('aimMatrix', name=f'aimMatrix0{i + 1}')
-        cmds.connectAttr(f'{point_matrix_node}.matrixSum', f'{aim_matrix_node}.inputMatrix')
-        cmds.connectAttr(f'{tangent_matrix_node}.matrixSum', f'{aim_matrix_node}.primaryTargetMatrix')
-        cmds.setAttr(f'{aim_matrix_node}.primaryMode', 1)
-        cmds.setAttr(f'{aim_matrix_node}.primaryInputAxis', 1, 0, 0)
-        cmds.setAttr(f'{aim_matrix_node}.secondaryInputAxis', 0, 1, 0)
-        cmds.setAttr(f'{aim_matrix_node}.secondaryMode', 0)
+        aim_matrix_node = graph.createNode('aimMatrix', name=f'aimMatrix0{i + 1}')
+        graph.connectAttr(f'{point_matrix_node}.matrixSum', f'{aim_matrix_node}.inputMatrix')
+        graph.connectAttr(f'{tangent_matrix_node}.matrixSum', f'{aim_matrix_node}.primaryTargetMatrix')
+        graph.setAttr(f'{aim_matrix_node}.primaryMode', 1)
+        graph.setAttr(f'{aim_matrix_node}.primaryInputAxis', 1, 0, 0)
+        graph.setAttr(f'{aim_matrix_node}.secondaryInputAxis', 0, 1, 0)
+        graph.setAttr(f'{aim_matrix_node}.secondaryMode', 0)
 
         # Remove scale
-        pick_matrix_node = cmds.createNode('pickMatrix', name=f'noScale0{i + 1}')
-        cmds.connectAttr(f'{aim_matrix_node}.outputMatrix', f'{pick_matrix_node}.inputMatrix')
-        cmds.setAttr(f'{pick_matrix_node}.useScale', False)
-        cmds.setAttr(f'{pick_matrix_node}.useShear', False)
+        pick_matrix_node = graph.createNode('pickMatrix', name=f'noScale0{i + 1}')
+        graph.connectAttr(f'{aim_matrix_node}.outputMatrix', f'{pick_matrix_node}.inputMatrix')
+        graph.setAttr(f'{pick_matrix_node}.useScale', False)
+        graph.setAttr(f'{pick_matrix_node}.useShear', False)
+
+        graph.connectAttr(f'{pick_matrix_node}.outputMatrix', f'{p_node}.offsetParentMatrix')
+
+    if batch:
+        graph.commit()
 
-        cmds.connectAttr(f'{pick_matrix_node}.outputMatrix', f'{p_node}.offsetParentMatrix')
+    if prune:
+        print(f'Pruning saved {saved} wtAddMatrix connections.')
+    return saved
 
 
 def _testMatrixOnCircularCurve(count=4, pCount=None, degree=3):
@@ -358,10 +819,8 @@ def _testMatrixOnCircularCurve(count=4, pCount=None, degree=3):
         cv = _testSphere(cRadius, color=(0.7, 1, 1), name=f'cv{i}', position=(x * spacing, 0, y * spacing))
         cvMatrices.append(f'{cv}.worldMatrix[0]')
 
-    # Modify the control point list so that they loop
-    cvMatrices = cvMatrices + cvMatrices[:3]
-    knots = [i for i in range(len(cvMatrices) + degree + 1)]
-    knots = [float(knot) for knot in knots]
+    # A periodic basis loops the control points
+    basis = SplineBasis.get(count, degree, periodic=True)
 
     # Attach the cubes
     for i in range(pCount):
@@ -369,7 +828,7 @@ def _testMatrixOnCircularCurve(count=4, pCount=None, degree=3):
         pNode = _testCube(pRadius, color=(0, 0.5, 1), name=f'p{i}')
 
         # Create the position matrix
-        pointMatrixWeights = pointOnCurveWeights(cvMatrices, t, degree=degree, knots=knots)
+        pointMatrixWeights = pointOnCurveWeights(cvMatrices, t, degree=degree, basis=basis)
         pointMatrixNode = cmds.createNode('wtAddMatrix', name=f'pointMatrix0{i + 1}')
         pointMatrix = f'{pointMatrixNode}.matrixSum'
         for index, (matrix, weight) in enumerate(pointMatrixWeights):
@@ -377,7 +836,7 @@ def _testMatrixOnCircularCurve(count=4, pCount=None, degree=3):
             cmds.setAttr(f'{pointMatrixNode}.wtMatrix[{index}].weightIn', weight)
 
         # Create the tangent matrix
-        tangentMatrixWeights = tangentOnCurveWeights(cvMatrices, t, degree=degree, knots=knots)
+        tangentMatrixWeights = tangentOnCurveWeights(cvMatrices, t, degree=degree, basis=basis)
         tangentMatrixNode = cmds.createNode('wtAddMatrix', name=f'tangentMatrix0{i + 1}')
         tangentMatrix = f'{tangentMatrixNode}.matrixSum'
         for index, (matrix, weight) in enumerate(tangentMatrixWeights):
@@ -481,4 +940,54 @@ def _testMatrixOnSurface(cvs=3, uCount=None, vCount=None, degree=3):
             outputMatrix = f'{pickMatrixNode}.outputMatrix'
 
             cmds.connectAttr(outputMatrix, f'{pNode}.offsetParentMatrix')
-            
\ No newline at end of file
+            
+
+
+def _benchmarkCurveWeights(count=100, samples=1000, degree=3, repeat=5):
+    """
+    Compares the scalar weight functions with their batch counterparts.
+
+    Args:
+        count (int): The amount of cvs.
+        samples (int): The amount of parameters to evaluate.
+        degree (int): The degree of the curve.
+        repeat (int): The amount of timed runs, the fastest one is kept.
+    """
+
+    cvs = [f'cv{i}.worldMatrix[0]' for i in range(count)]
+    ts = [i / (float(samples) - 1) for i in range(samples)]
+    indices = {cv: index for index, cv in enumerate(cvs)}
+
+    def loop(function):
+        matrix = np.zeros((samples, count))
+        for row, t in enumerate(ts):
+            for cv, weight in function(cvs, t, degree):
+                matrix[row, indices[cv]] += weight
+        return matrix
+
+    for scalar, batch in ((pointOnCurveWeights, pointOnCurveWeightMatrix),
+                          (tangentOnCurveWeights, tangentOnCurveWeightMatrix)):
+        if not np.array_equal(loop(scalar), batch(cvs, ts, degree)):
+            raise CurveException(f'{batch.__name__} does not match {scalar.__name__}')
+
+        loopTime = min(timeit.repeat(lambda: loop(scalar), number=1, repeat=repeat))
+        batchTime = min(timeit.repeat(lambda: batch(cvs, ts, degree), number=1, repeat=repeat))
+        print(f'{scalar.__name__}: {loopTime * 1000:.2f}ms | {batch.__name__}: {batchTime * 1000:.2f}ms '
+              f'| x{loopTime / batchTime:.1f} ({samples} samples, {count} cvs)')
+
+
+def _benchmarkMatrixOnCurve(count=10, p_count=200, degree=3):
+    """
+    Times _testMatrixOnCurve with individual maya.cmds calls and with a GraphBuilder, each in a new scene.
+
+    Args:
+        count (int): The amount of cvs.
+        p_count (int): The amount of points to attach to the curve.
+        degree (int): The degree of the curve.
+    """
+
+    for batch in (False, True):
+        cmds.file(new=True, force=True)
+        start = time.perf_counter()
+        _testMatrixOnCurve(count, p_count, degree, batch=batch)
+        print(f'_testMatrixOnCurve(batch={batch}): {time.perf_counter() - start:.3f}s ({p_count} points, {count} cvs)')
@@ -1,6 +1,8 @@
 import maya.cmds as cmds
 from typing import Literal
 
+from ..expression import compile_expression
+
 def find_alembic_node(node: str):
     
     shape = cmds.listRelatives(node, shapes = True, fullPath = True)
@@ -14,7 +16,10 @@ def find_alembic_node(node: str):
         
     cmds.error(f'Found no alembic node connected to : {shape}')
 
-def offset_alembic(alembic_node: str, fps: Literal["24 fps", "16 fps", "12 fps", "8 fps", "6 fps"] = "24 fps"):
+def offset_alembic(alembic_node: str, fps: Literal["24 fps", "16 fps", "12 fps", "8 fps", "6 fps"] = "24 fps", native: bool = True):
+    '''Step the playback of an alembic node. With native, the frame modulo expression is compiled into
+    floatMath, condition and animCurve nodes, which don't block the parallel evaluation.
+    '''
 
     fps_dict = {
         "24 fps": 1, 
@@ -28,9 +33,17 @@ def offset_alembic(alembic_node: str, fps: Literal["24 fps", "16 fps", "12 fps",
     if old_expression_node:
         cmds.delete(old_expression_node)
 
+    network_name = f'Fps_{alembic_node}'
+    old_network = cmds.ls(f'{network_name}_*')
+    if old_network:
+        cmds.delete(old_network)
+
     fps_factor: int = fps_dict[fps]
     exp_string: str = f'offset = frame % {fps_factor};'
-    cmds.expression(object = alembic_node, string = exp_string)
+    if native:
+        compile_expression(exp_string, name = network_name, obj = alembic_node)
+    else:
+        cmds.expression(object = alembic_node, string = exp_string)
     print(f'Alembic node : {alembic_node} switched on {fps}')
 
 class FpsWindow():
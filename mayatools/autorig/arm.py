@@ -1,6 +1,5 @@
 from ...utils.imports import *
 from .. import (
-    constants_maya,
     display,
     curve,
     matrix,
@@ -14,19 +13,6 @@ from .. import (
     tools,
     joint
 )
-reload(constants_maya)
-reload(display)
-reload(curve)
-reload(matrix)
-reload(attribute)
-reload(offset)
-reload(mathfuncs)
-reload(vector)
-reload(rig)
-reload(ribbon)
-reload(rivet)
-reload(tools)
-reload(joint)
 from ..constants_maya import *
 
 def create_fk_arm(proxy_arm_jnt: str):
@@ -1,4 +1,5 @@
 from ...utils.imports import *
+from ...utils.profiler import profile
 from . import (
     arm,
     leg,
@@ -11,14 +12,6 @@ from .. import (
     curve,
     rig
 )
-reload(arm)
-reload(leg)
-reload(spine)
-reload(matrix)
-reload(offset)
-reload(attribute)
-reload(curve)
-reload(rig)
 
 def autorig_body(
     proxy_clavicle_jnt_l: str, proxy_arm_jnt_l: str, 
@@ -40,6 +33,7 @@ def autorig_body(
     leg.create_hip_leg_setup(proxy_root, proxy_leg_jnt_l, proxy_leg_jnt_r, geo_l, geo_r, sub = leg_sub)
 
 
+@profile
 def run_autorig_body(arm_sub: int = 5, leg_sub: int = 5):
 
     autorig_body(
@@ -1,6 +1,5 @@
 from ...utils.imports import *
 from .. import (
-    constants_maya,
     curve,
     display,
     offset,
@@ -13,18 +12,6 @@ from .. import (
     joint,
     tools
 )
-reload(constants_maya)
-reload(curve)
-reload(display)
-reload(offset)
-reload(matrix)
-reload(rig)
-reload(mathfuncs)
-reload(attribute)
-reload(vector)
-reload(ribbon)
-reload(joint)
-reload(tools)
 from ..constants_maya import *
 
 def create_fk_leg(proxy_leg_jnt: str):
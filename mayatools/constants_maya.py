@@ -187,6 +187,7 @@ AIM_MTX = "aimMtx"
 MULT_MTX = "multMtx"
 DECO_MTX = "decoMtx"
 WTADD_MTX = "wtAddMtx"
+PICK_MTX = "pickMtx"
 
 W_MTX = "worldMatrix[0]"
 WI_MTX = "wordlInverseMatrix[0]"
@@ -12,10 +12,12 @@ from .curve_mod import (
     star_control,
     control,
     poly_to_curve,
+    edges_to_curve,
     poly_curve_rebuild,
     parent_shapes,
     get_curve_length,
     get_curve_vertex_count,
+    curve_basis,
     loc_on_curve,
     ensure_direction
 )
\ No newline at end of file
@@ -1,13 +1,9 @@
 from ...utils.imports import *
-from .. import constants_maya
+from ... import mayatools_api as api
+from ... import deboor_funcs
 from .. import display
-from .. import offset
 from .. import tools
 
-reload(constants_maya)
-reload(display)
-reload(offset)
-reload(tools)
 from ..constants_maya import SHAPES_CTRL
 
 
@@ -253,6 +249,17 @@ def poly_to_curve(
 
     om.MGlobal.displayInfo(f"Polygon edge to convert : {edge}")
 
+    # with the default options, without history nor smooth preview, an open chain of edges is built straight from
+    # the cached topology, anything else goes through polyToCurve
+    if not ch and degree == 1 and form == 0 and conform_preview == 1:
+        try:
+            dag_path, edge_ids = api.componentIndices(edge)
+            vertices, closed = api.getTopology(dag_path).edgeChain(edge_ids)
+        except ValueError:
+            closed = True
+        if not closed and not cmds.getAttr(f"{dag_path.fullPathName()}.displaySmoothMesh"):
+            return edges_to_curve(edge, name=name)
+
     cmds.select(edge)
     mel.eval(
         f"polyToCurve -form {form} -degree {degree} -conformToSmoothMeshPreview {conform_preview};"
@@ -267,6 +274,35 @@ def poly_to_curve(
     return curve
 
 
+def edges_to_curve(edges, degree: int = 1, name: str = "polyToCurve") -> str:
+    """Create a curve through the vertices of connected polygon edges, without selection nor history.
+
+    Parameters
+    ----------
+    edges : Union[str, List[str]]
+        The polygon edges, such as "mesh.e[10:24]".
+    degree : int, optional
+        Degree of the resulting curve, default is 1.
+    name : str, optional
+        Name of the created curve, default is "polyToCurve".
+
+    Returns
+    -------
+    str
+        The name of the created curve.
+    """
+
+    dag_path, edge_ids = api.componentIndices(edges)
+    vertices, closed = api.getTopology(dag_path).edgeChain(edge_ids)
+
+    points = om.MFnMesh(dag_path).getPoints(om.MSpace.kWorld)
+    positions = [tuple(points[vertex])[:3] for vertex in vertices]
+    if closed:
+        positions.append(positions[0])
+
+    return cmds.curve(name=name, degree=degree, point=positions)
+
+
 def poly_curve_rebuild(
     edge,
     name="polyToCurveReb",
@@ -365,25 +401,101 @@ def get_curve_vertex_count(curve: str) -> int:
     return degree + span
 
 
-def loc_on_curve(curve: str, num: int, name: str = "loc", scale=0.02):
-    """ """
+def curve_basis(curve: str) -> deboor_funcs.SplineBasis:
+    """Get the spline basis of a NURBS curve in Maya.
+
+    Parameters
+    ----------
+    curve : str
+        The name of the NURBS curve shape.
+
+    Returns
+    -------
+    deboor_funcs.SplineBasis
+        A cached basis matching the curve degree, form and knots, periodic curves are closed.
+    """
+
+    sel = om.MSelectionList()
+    sel.add(curve)
+    curve_fn = om.MFnNurbsCurve(sel.getDagPath(0))
+
+    degree: int = curve_fn.degree
+    periodic: bool = curve_fn.form == om.MFnNurbsCurve.kPeriodic
+    count: int = curve_fn.numCVs - degree if periodic else curve_fn.numCVs
+
+    return deboor_funcs.SplineBasis.get(count, degree, list(curve_fn.knots()), periodic)
+
+
+def loc_on_curve(
+    curve: str, num: int, name: str = "loc", scale=0.02, weights: bool = False
+):
+    """Create locators evenly spread along the parameter range of a NURBS curve.
+
+    Parameters
+    ----------
+    curve : str
+        The name of the NURBS curve.
+    num : int
+        The number of locators.
+    name : str, optional
+        The base name of the locators, default is "loc".
+    scale : float, optional
+        The local scale of the locators, default is 0.02.
+    weights : bool, optional
+        Compute the curve weights of each locator with deboor_funcs instead of creating a pointOnCurveInfo node per
+        locator. Locators on a cv read it from a single curveInfo node and locators between two cvs use a
+        blendColors node, other locators fall back to a pointOnCurveInfo. Default is False.
+
+    Returns
+    -------
+    list
+        The names of the locators.
+    """
 
     curve_shape: str = cmds.listRelatives(curve, shapes=True)[0]
     loc_list: list = []
 
+    if weights:
+        basis = curve_basis(curve_shape)
+        curve_info = cmds.createNode("curveInfo", name=f"curveInfo_{name}")
+        cmds.connectAttr(f"{curve_shape}.worldSpace[0]", f"{curve_info}.inputCurve")
+        cvs = [f"{curve_info}.controlPoints[{i}]" for i in range(basis.count)]
+
     for i in range(num):
 
-        poci = cmds.createNode("pointOnCurveInfo", name=f"poci_{name}_{i+1:02}")
-        cmds.connectAttr(f"{curve_shape}.worldSpace[0]", f"{poci}.inputCurve")
-        cmds.setAttr(f"{poci}.turnOnPercentage", 1)
         parameter = (1 / (num - 1)) * i
-        cmds.setAttr(f"{poci}.parameter", parameter)
 
         loc = cmds.spaceLocator(name=f"{name}_{i+1:02}")[0]
         tools.set_local_scale(loc, scale)
         display.color_node(loc, "red")
         loc_list.append(loc)
-        cmds.connectAttr(f"{poci}.result.position", f"{loc}.translate")
+
+        cv_weights = []
+        if weights:
+            cv_weights, _ = deboor_funcs.pruneWeights(
+                deboor_funcs.pointOnCurveWeights(
+                    cvs, parameter, basis.degree, basis=basis
+                ),
+                epsilon=1e-6,
+            )
+
+        if len(cv_weights) == 1:
+            cmds.connectAttr(cv_weights[0][0], f"{loc}.translate")
+
+        elif len(cv_weights) == 2:
+            (cv_01, weight), (cv_02, _) = cv_weights
+            blend = cmds.createNode("blendColors", name=f"blend_{name}_{i+1:02}")
+            cmds.connectAttr(cv_01, f"{blend}.color1")
+            cmds.connectAttr(cv_02, f"{blend}.color2")
+            cmds.setAttr(f"{blend}.blender", weight)
+            cmds.connectAttr(f"{blend}.output", f"{loc}.translate")
+
+        else:
+            poci = cmds.createNode("pointOnCurveInfo", name=f"poci_{name}_{i+1:02}")
+            cmds.connectAttr(f"{curve_shape}.worldSpace[0]", f"{poci}.inputCurve")
+            cmds.setAttr(f"{poci}.turnOnPercentage", 1)
+            cmds.setAttr(f"{poci}.parameter", parameter)
+            cmds.connectAttr(f"{poci}.result.position", f"{loc}.translate")
 
     return loc_list
 
@@ -1,8 +1,6 @@
 from ...utils.imports import *
 from .. import tools
 
-reload(tools)
-
 
 def color_node(
     nodes: Union[str, list],
@@ -0,0 +1,8 @@
+from .expression_mod import (
+    tokenize,
+    Parser,
+    ExpressionCompiler,
+    compile_expression,
+    compile_expression_node,
+    compile_scene_expressions
+)
\ No newline at end of file
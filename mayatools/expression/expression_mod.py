@@ -0,0 +1,665 @@
+from ...utils.imports import *
+from ...mayatools_api import GraphBuilder
+
+TOKENS = re.compile(
+    r"""
+    \s*(?:
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+        | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+        | (?P<variable>\$\w+)
+        | (?P<name>[A-Za-z_][\w:]*(?:\|[A-Za-z_][\w:]*)*)
+        | (?P<operator><<|>>|&&|\|\||==|!=|<=|>=|\+=|-=|\*=|/=|[-+*/%<>=!(){};,.\[\]?:])
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# floatMath operations
+ADD, SUBTRACT, MULTIPLY, DIVIDE, MIN, MAX, POWER = range(7)
+
+# condition operations
+COMPARISONS = {"==": 0, "!=": 1, ">": 2, ">=": 3, "<": 4, "<=": 5}
+
+FOLD = {
+    ADD: lambda a, b: a + b,
+    SUBTRACT: lambda a, b: a - b,
+    MULTIPLY: lambda a, b: a * b,
+    DIVIDE: lambda a, b: a / b,
+    MIN: min,
+    MAX: max,
+    POWER: lambda a, b: a**b,
+}
+
+COMPARE = {
+    0: lambda a, b: a == b,
+    1: lambda a, b: a != b,
+    2: lambda a, b: a > b,
+    3: lambda a, b: a >= b,
+    4: lambda a, b: a < b,
+    5: lambda a, b: a <= b,
+}
+
+BINARY = {"+": ADD, "-": SUBTRACT, "*": MULTIPLY, "/": DIVIDE}
+
+FUNCTIONS = ("abs", "min", "max", "pow", "sqrt", "clamp", "floor", "ceil", "mag")
+
+
+def tokenize(string: str) -> list:
+    """Split an expression string into (kind, text) tokens, comments are dropped."""
+
+    tokens, position = [], 0
+    string = string.rstrip()
+    while position < len(string):
+        match = TOKENS.match(string, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected character in expression : {string[position:position + 20]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind != "comment":
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class Parser:
+    """Parse the subset of MEL used by expressions into nested tuples.
+
+    Statements : float / int declarations, assignments to variables and attributes, including +=, -=, *= and /=,
+    if / else if / else and blocks. Expressions : numbers, variables, attributes, frame and time, arithmetic,
+    comparisons, logical operators, the ternary operator and the FUNCTIONS, mag taking a vector literal.
+
+    Integer literals and int variables are typed as in MEL : values assigned to an int variable are truncated, and
+    the division of two integers is truncated, both with a ("trunc", value) tree.
+    """
+
+    def __init__(self, string: str):
+        self.tokens = tokenize(string)
+        self.index = 0
+        self.integers = set()
+
+    def is_integer(self, tree: tuple) -> bool:
+        """Check if an expression tree has an int value in MEL."""
+
+        kind = tree[0]
+        if kind == "number":
+            return len(tree) > 2 and tree[2]
+        if kind == "variable":
+            return tree[1] in self.integers
+        if kind == "trunc":
+            return True
+        if kind == "binary":
+            _, operator, left, right = tree
+            if operator in COMPARISONS or operator in ("&&", "||"):
+                return True
+            return self.is_integer(left) and self.is_integer(right)
+        if kind == "select":
+            return self.is_integer(tree[2]) and self.is_integer(tree[3])
+        return False
+
+    def operation(self, operator: str, left: tuple, right: tuple) -> tuple:
+        tree = ("binary", operator, left, right)
+        if operator == "/" and self.is_integer(left) and self.is_integer(right):
+            return ("trunc", tree)
+        return tree
+
+    def assignment(self, target: tuple, value: tuple) -> tuple:
+        if target[0] == "variable" and target[1] in self.integers and not self.is_integer(value):
+            value = ("trunc", value)
+        return ("assign", target, value)
+
+    def peek(self, offset: int = 0) -> tuple:
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, text: str = None) -> tuple:
+        token = self.peek()
+        if token[0] is None or (text is not None and token[1] != text):
+            raise ValueError(f"Expected {text!r} in expression, found {token[1]!r}")
+        self.index += 1
+        return token
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.index += 1
+            return True
+        return False
+
+    def parse(self) -> list:
+        statements = []
+        while self.peek()[0] is not None:
+            statements.extend(self.statement())
+        return statements
+
+    def block(self) -> list:
+        if not self.accept("{"):
+            return self.statement()
+        statements = []
+        while not self.accept("}"):
+            statements.extend(self.statement())
+        return statements
+
+    def statement(self) -> list:
+        kind, text = self.peek()
+
+        if text == ";":
+            self.take()
+            return []
+
+        if text == "{":
+            return self.block()
+
+        if text == "if":
+            self.take()
+            self.take("(")
+            condition = self.expression()
+            self.take(")")
+            then = self.block()
+            otherwise = self.block() if self.accept("else") else []
+            return [("if", condition, then, otherwise)]
+
+        if text in ("float", "int"):
+            self.take()
+            statements = []
+            while True:
+                _, variable = self.take()
+                if not variable.startswith("$"):
+                    raise ValueError(f"Expected a variable after {text}, found {variable!r}")
+                if text == "int":
+                    self.integers.add(variable)
+                else:
+                    self.integers.discard(variable)
+                value = self.expression() if self.accept("=") else ("number", 0.0, text == "int")
+                statements.append(self.assignment(("variable", variable), value))
+                if not self.accept(","):
+                    break
+            self.take(";")
+            return statements
+
+        if kind in ("variable", "name"):
+            target = self.primary()
+            if target[0] not in ("variable", "plug"):
+                raise ValueError(f"Can't assign to {target!r}")
+            _, operator = self.take()
+            if operator not in ("=", "+=", "-=", "*=", "/="):
+                raise ValueError(f"Unsupported assignment operator {operator!r}")
+            value = self.expression()
+            if operator != "=":
+                value = self.operation(operator[0], target, value)
+            self.take(";")
+            return [self.assignment(target, value)]
+
+        raise ValueError(f"Unsupported statement starting with {text!r}")
+
+    def expression(self) -> tuple:
+        condition = self.binary(0)
+        if self.accept("?"):
+            then = self.expression()
+            self.take(":")
+            return ("select", condition, then, self.expression())
+        return condition
+
+    PRECEDENCE = (("||",), ("&&",), ("==", "!="), ("<", ">", "<=", ">="), ("+", "-"), ("*", "/", "%"))
+
+    def binary(self, level: int) -> tuple:
+        if level == len(self.PRECEDENCE):
+            return self.unary()
+
+        left = self.binary(level + 1)
+        while self.peek()[0] == "operator" and self.peek()[1] in self.PRECEDENCE[level]:
+            _, operator = self.take()
+            left = self.operation(operator, left, self.binary(level + 1))
+        return left
+
+    def unary(self) -> tuple:
+        if self.accept("-"):
+            return ("binary", "-", ("number", 0.0, True), self.unary())
+        if self.accept("+"):
+            return self.unary()
+        if self.accept("!"):
+            return ("binary", "==", self.unary(), ("number", 0.0))
+        return self.primary()
+
+    def primary(self) -> tuple:
+        kind, text = self.take()
+
+        if kind == "number":
+            return ("number", float(text), text.isdigit())
+
+        if kind == "variable":
+            return ("variable", text)
+
+        if text == "(":
+            value = self.expression()
+            self.take(")")
+            return value
+
+        if kind == "name":
+            if text in ("frame", "time") and self.peek()[1] != ".":
+                return (text,)
+
+            if self.peek()[1] == "(":
+                if text not in FUNCTIONS:
+                    raise ValueError(f"Unsupported function {text!r}")
+                self.take("(")
+                vector = text == "mag" and self.accept("<<")
+                arguments = [self.expression()]
+                while self.accept(","):
+                    arguments.append(self.expression())
+                if vector:
+                    self.take(">>")
+                self.take(")")
+                return ("call", text, arguments)
+
+            path = text
+            while self.peek()[1] in (".", "["):
+                if self.accept("["):
+                    path += f"[{int(float(self.take()[1]))}]"
+                    self.take("]")
+                else:
+                    self.take(".")
+                    path += f".{self.take()[1]}"
+            return ("plug", path)
+
+        raise ValueError(f"Unexpected {text!r} in expression")
+
+
+def _is_constant(value) -> bool:
+    return isinstance(value, float)
+
+
+class ExpressionCompiler:
+    """Compile expression strings into floatMath, condition, distanceBetween and animCurve networks.
+
+    Values are folded while compiling : constants are float numbers and computed values are plug strings, so constant
+    arithmetic and branches with constant conditions don't create any node. Branches are compiled on both sides and
+    merged with condition nodes on every variable or attribute they assign differently. time divides the frame by
+    the frame rate of the scene when compiling, it is wrong once the frame rate changes.
+
+    Args:
+        name (str): Prefix of the created node names.
+        obj (str): Default object of the attributes written without node name, as the -object flag of expressions.
+    """
+
+    def __init__(self, name: str, obj: str = None):
+        self.name = name
+        self.obj = obj
+        self.graph = GraphBuilder()
+        self.booleans = set()
+        self.reads = set()
+        self.curves = []
+        self.count = 0
+
+    def node(self, node_type: str) -> str:
+        self.count += 1
+        return self.graph.createNode(node_type, f"{self.name}_{node_type}_{self.count:02}")
+
+    def input(self, plug: str, value):
+        if _is_constant(value):
+            self.graph.setAttr(plug, value)
+        else:
+            self.graph.connectAttr(value, plug)
+
+    # node emitters
+
+    def math(self, operation: int, a, b):
+        if _is_constant(a) and _is_constant(b):
+            return float(FOLD[operation](a, b))
+        if operation in (ADD, SUBTRACT) and b == 0.0:
+            return a
+        if operation == ADD and a == 0.0:
+            return b
+        if operation in (MULTIPLY, DIVIDE, POWER) and b == 1.0:
+            return a
+        if operation == MULTIPLY and a == 1.0:
+            return b
+
+        node = self.node("floatMath")
+        self.graph.setAttr(f"{node}.operation", operation)
+        self.input(f"{node}.floatA", a)
+        self.input(f"{node}.floatB", b)
+        return f"{node}.outFloat"
+
+    def select(self, condition, then, otherwise):
+        if _is_constant(condition):
+            return then if condition else otherwise
+        if then == otherwise:
+            return then
+
+        node = self.node("condition")
+        self.graph.setAttr(f"{node}.operation", COMPARISONS["!="])
+        self.input(f"{node}.firstTerm", condition)
+        self.input(f"{node}.colorIfTrueR", then)
+        self.input(f"{node}.colorIfFalseR", otherwise)
+        plug = f"{node}.outColorR"
+        if {then, otherwise} <= self.booleans | {0.0, 1.0}:
+            self.booleans.add(plug)
+        return plug
+
+    def compare(self, operation: int, a, b):
+        if _is_constant(a) and _is_constant(b):
+            return float(COMPARE[operation](a, b))
+
+        # a boolean compared to 1 or 0 is itself or its negation
+        if a in self.booleans and b in (0.0, 1.0) and operation in (0, 1):
+            return a if (operation == 0) == (b == 1.0) else self.select(a, 0.0, 1.0)
+
+        node = self.node("condition")
+        self.graph.setAttr(f"{node}.operation", operation)
+        self.input(f"{node}.firstTerm", a)
+        self.input(f"{node}.secondTerm", b)
+        self.graph.setAttr(f"{node}.colorIfTrueR", 1.0)
+        self.graph.setAttr(f"{node}.colorIfFalseR", 0.0)
+        self.booleans.add(f"{node}.outColorR")
+        return f"{node}.outColorR"
+
+    def boolean(self, value):
+        if _is_constant(value):
+            return float(bool(value))
+        if value in self.booleans:
+            return value
+        return self.compare(COMPARISONS["!="], value, 0.0)
+
+    def fraction(self, value):
+        """Fractional part through a cycling linear animCurveUU from (0, 0) to (1, 1).
+
+        The curve gives the value of its last key, 1, at the end of each cycle : a condition wraps it back to 0, so
+        integer inputs have no fraction.
+        """
+
+        if _is_constant(value):
+            return value - math.floor(value)
+        curve = self.node("animCurveUU")
+        self.input(f"{curve}.input", value)
+        self.curves.append(curve)
+
+        node = self.node("condition")
+        self.graph.setAttr(f"{node}.operation", COMPARISONS[">="])
+        self.graph.connectAttr(f"{curve}.output", f"{node}.firstTerm")
+        self.graph.setAttr(f"{node}.secondTerm", 1.0)
+        self.graph.setAttr(f"{node}.colorIfTrueR", 0.0)
+        self.graph.connectAttr(f"{curve}.output", f"{node}.colorIfFalseR")
+        return f"{node}.outColorR"
+
+    def modulo(self, a, b):
+        """MEL modulo keeps the sign of the dividend, as C fmod."""
+
+        if _is_constant(a) and _is_constant(b):
+            return math.fmod(a, b)
+        quotient = self.math(DIVIDE, a, b)
+        wrapped = self.math(MULTIPLY, self.fraction(quotient), b)
+        # floored modulo to truncated modulo : negative dividends with a remainder move back by one divisor
+        if _is_constant(a) and a >= 0:
+            return wrapped
+        negative = self.compare(COMPARISONS["<"], a, 0.0)
+        remainder = self.compare(COMPARISONS["!="], wrapped, 0.0)
+        return self.select(self.select(negative, remainder, 0.0), self.math(SUBTRACT, wrapped, b), wrapped)
+
+    def truncate(self, value):
+        """Integer part toward zero, as MEL converts floats to int."""
+
+        if _is_constant(value):
+            return float(math.trunc(value))
+        if value in self.booleans:
+            return value
+        fraction = self.fraction(value)
+        floor = self.math(SUBTRACT, value, fraction)
+        # floor to truncation : negative values with a fraction move up by one
+        negative = self.compare(COMPARISONS["<"], value, 0.0)
+        remainder = self.compare(COMPARISONS["!="], fraction, 0.0)
+        return self.select(self.select(negative, remainder, 0.0), self.math(ADD, floor, 1.0), floor)
+
+    def distance(self, vector: list):
+        if all(_is_constant(value) for value in vector):
+            return math.sqrt(sum(value * value for value in vector))
+        node = self.node("distanceBetween")
+        for value, axis in zip(vector, "XYZ"):
+            self.input(f"{node}.point1{axis}", value)
+        return f"{node}.distance"
+
+    # compilation
+
+    def plug(self, path: str) -> str:
+        if "." in path:
+            return path
+        if not self.obj:
+            raise ValueError(f"Attribute {path!r} needs a node name or an expression object")
+        return f"{self.obj}.{path}"
+
+    def value(self, tree: tuple, env: dict):
+        kind = tree[0]
+
+        if kind == "number":
+            return tree[1]
+
+        if kind == "variable":
+            if tree[1] not in env:
+                raise ValueError(f"Undeclared variable {tree[1]}")
+            return env[tree[1]]
+
+        if kind == "plug":
+            plug = self.plug(tree[1])
+            if plug not in env:
+                self.reads.add(plug)
+            return env.get(plug, plug)
+
+        if kind == "frame":
+            return "time1.outTime"
+
+        if kind == "time":
+            # the frame rate is read once, the network must be compiled again when the scene frame rate changes
+            fps = mel.eval("currentTimeUnitToFPS()")
+            return self.math(DIVIDE, "time1.outTime", float(fps))
+
+        if kind == "select":
+            return self.select(self.boolean(self.value(tree[1], env)), self.value(tree[2], env), self.value(tree[3], env))
+
+        if kind == "trunc":
+            return self.truncate(self.value(tree[1], env))
+
+        if kind == "binary":
+            _, operator, left, right = tree
+            a = self.value(left, env)
+
+            if operator == "&&":
+                return self.select(self.boolean(a), self.boolean(self.value(right, env)), 0.0)
+            if operator == "||":
+                return self.select(self.boolean(a), 1.0, self.boolean(self.value(right, env)))
+
+            b = self.value(right, env)
+            if operator in COMPARISONS:
+                return self.compare(COMPARISONS[operator], a, b)
+            if operator == "%":
+                return self.modulo(a, b)
+            return self.math(BINARY[operator], a, b)
+
+        if kind == "call":
+            _, function, arguments = tree
+            values = [self.value(argument, env) for argument in arguments]
+            return self.call(function, values)
+
+        raise ValueError(f"Unsupported expression {tree!r}")
+
+    def call(self, function: str, values: list):
+        count = {"abs": 1, "sqrt": 1, "floor": 1, "ceil": 1, "pow": 2, "clamp": 3, "mag": 3}.get(function)
+        if count and len(values) != count or function in ("min", "max") and len(values) < 2:
+            raise ValueError(f"Wrong number of arguments for {function}")
+
+        if function == "abs":
+            return self.math(MAX, values[0], self.math(SUBTRACT, 0.0, values[0]))
+        if function in ("min", "max"):
+            result = values[0]
+            for value in values[1:]:
+                result = self.math(MIN if function == "min" else MAX, result, value)
+            return result
+        if function == "pow":
+            return self.math(POWER, *values)
+        if function == "sqrt":
+            return self.math(POWER, values[0], 0.5)
+        if function == "clamp":
+            minimum, maximum, value = values
+            return self.math(MAX, minimum, self.math(MIN, maximum, value))
+        if function == "floor":
+            return self.math(SUBTRACT, values[0], self.fraction(values[0]))
+        if function == "ceil":
+            return self.math(SUBTRACT, 0.0, self.call("floor", [self.math(SUBTRACT, 0.0, values[0])]))
+        if function == "mag":
+            return self.distance(values)
+
+    def run(self, statements: list, env: dict) -> dict:
+        for statement in statements:
+            if statement[0] == "assign":
+                _, target, tree = statement
+                key = target[1] if target[0] == "variable" else self.plug(target[1])
+                env[key] = self.value(tree, env)
+
+            elif statement[0] == "if":
+                _, condition, then, otherwise = statement
+                condition = self.boolean(self.value(condition, env))
+                if _is_constant(condition):
+                    env = self.run(then if condition else otherwise, env)
+                    continue
+
+                then_env = self.run(then, dict(env))
+                otherwise_env = self.run(otherwise, dict(env))
+                for key in then_env.keys() | otherwise_env.keys():
+                    if key.startswith("$") and not (key in then_env and key in otherwise_env):
+                        # variables declared in a single branch are local to it
+                        continue
+                    if not (key in then_env and key in otherwise_env):
+                        raise ValueError(f"{key} is only assigned in one branch, it would keep its last value")
+                    env[key] = self.select(condition, then_env[key], otherwise_env[key])
+
+        return env
+
+    def compile(self, string: str) -> dict:
+        """Compile an expression and queue its network in the graph.
+
+        Returns:
+            dict: Value driving each assigned attribute, a plug or a constant.
+        """
+
+        env = self.run(Parser(string).parse(), {})
+        outputs = {key: value for key, value in env.items() if not key.startswith("$")}
+        if not outputs:
+            raise ValueError("The expression doesn't assign any attribute")
+        feedback = self.reads & outputs.keys()
+        if feedback:
+            raise ValueError(f"The expression reads its own outputs : {sorted(feedback)}")
+        return outputs
+
+    def commit(self, outputs: dict) -> dict:
+        """Create the network and connect it to the assigned attributes.
+
+        Returns:
+            dict: The actual name of every created node, keyed by the requested name.
+        """
+
+        for plug, value in outputs.items():
+            if value == plug:
+                continue
+            if _is_constant(value):
+                self.graph.setAttr(plug, value)
+            else:
+                self.graph.connectAttr(value, plug, force=True)
+
+        names = self.graph.commit()
+
+        for curve in self.curves:
+            curve = names.get(curve, curve)
+            for key in (0.0, 1.0):
+                cmds.setKeyframe(curve, float=key, value=key, inTangentType="linear", outTangentType="linear")
+            cmds.setInfinity(curve, preInfinite="cycle", postInfinite="cycle")
+
+        return names
+
+
+def _ensure_float_math():
+    if "floatMath" not in cmds.allNodeTypes():
+        cmds.loadPlugin("lookdevKit", quiet=True)
+
+
+def compile_expression(string: str, name: str, obj: str = None) -> dict:
+    """Build the native node network equivalent to an expression string.
+
+    Args:
+        string (str): Expression string, in the subset of MEL read by Parser.
+        name (str): Prefix of the created node names.
+        obj (str): Default object of the attributes written without node name.
+
+    Returns:
+        dict: The actual name of every created node, keyed by the requested name.
+    """
+
+    _ensure_float_math()
+    compiler = ExpressionCompiler(name, obj)
+    outputs = compiler.compile(string)
+
+    cmds.undoInfo(openChunk=True, chunkName="compile_expression")
+    try:
+        return compiler.commit(outputs)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+
+def compile_expression_node(expression_node: str) -> dict:
+    """Replace an expression node by its native node network.
+
+    The expression is compiled before anything is changed in the scene, so an unsupported expression is left intact,
+    and only deleted once the network is committed. The network, its keys and the deletion are a single undo step.
+
+    Returns:
+        dict: The actual name of every created node, keyed by the requested name.
+    """
+
+    string = cmds.expression(expression_node, query=True, string=True)
+    obj = cmds.expression(expression_node, query=True, object=True) or None
+
+    _ensure_float_math()
+    compiler = ExpressionCompiler(expression_node, obj)
+    outputs = compiler.compile(string)
+
+    cmds.undoInfo(openChunk=True, chunkName="compile_expression_node")
+    try:
+        names = compiler.commit(outputs)
+        cmds.delete(expression_node)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return names
+
+
+def compile_scene_expressions(expression_nodes: list = None, dry_run: bool = False) -> dict:
+    """Replace the expressions of the scene by native node networks where they are supported.
+
+    Args:
+        expression_nodes (list): Expressions to convert. All the expressions of the scene when None.
+        dry_run (bool): Only check which expressions are supported.
+
+    Returns:
+        dict: Names of the converted expressions, and the reason each other expression was skipped.
+    """
+
+    report = {"converted": [], "skipped": {}}
+
+    cmds.undoInfo(openChunk=True, chunkName="compile_scene_expressions")
+    try:
+        for expression_node in cmds.ls(type="expression") if expression_nodes is None else expression_nodes:
+            try:
+                if dry_run:
+                    string = cmds.expression(expression_node, query=True, string=True)
+                    obj = cmds.expression(expression_node, query=True, object=True) or None
+                    ExpressionCompiler(expression_node, obj).compile(string)
+                else:
+                    compile_expression_node(expression_node)
+                report["converted"].append(expression_node)
+            except ValueError as error:
+                report["skipped"][expression_node] = str(error)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    om.MGlobal.displayInfo(
+        f"Expressions {'supported' if dry_run else 'converted'} : {len(report['converted'])}, "
+        f"skipped : {len(report['skipped'])}"
+    )
+    for expression_node, reason in report["skipped"].items():
+        om.MGlobal.displayWarning(f"{expression_node} skipped : {reason}")
+
+    return report
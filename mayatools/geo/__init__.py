@@ -1,4 +1,18 @@
 from .geo_mod import (
     create_cube_under_joint,
     create_cubes_under_joints
+)
+from .symmetry import (
+    symmetry_map,
+    clear_symmetry_cache,
+    destination_vertices,
+    mirror_name,
+    mirror_influence_columns,
+    mirror_weights,
+    mirror_skin_weights,
+    mirror_deltas,
+    get_target_deltas,
+    set_target_deltas,
+    mirror_blendshape_target,
+    mirror_selection
 )
\ No newline at end of file
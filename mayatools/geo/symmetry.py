@@ -0,0 +1,305 @@
+import numpy as np
+
+from ...utils.imports import *
+from ..skin import skin_weights
+from ..skin.skin_mod import (
+    find_skin_cluster,
+    get_points,
+    index_ranges,
+    topology_fingerprint,
+    vertex_components,
+)
+from ..skin.skin_relax import vertex_adjacency
+from ..skin.skin_transfer import PointGrid
+
+_SYMMETRY_MAPS = {}
+
+
+def _walk_topology(
+    mirror: np.ndarray,
+    points: np.ndarray,
+    mirrored_points: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+) -> np.ndarray:
+    """Match the vertices left without mirror, in place, by walking from their matched neighbours.
+
+    The mirror of a vertex must be a neighbour of the mirrors of its matched neighbours : the candidate adjacent to
+    most of them wins, the distance to the mirrored position breaks ties.
+    """
+
+    changed = True
+    while changed:
+        changed = False
+
+        for vertex in np.flatnonzero(mirror < 0):
+            if mirror[vertex] >= 0:
+                continue
+
+            neighbours = indices[indptr[vertex] : indptr[vertex + 1]]
+            matched = mirror[neighbours][mirror[neighbours] >= 0]
+            if not matched.size:
+                continue
+
+            candidates = np.concatenate([indices[indptr[m] : indptr[m + 1]] for m in matched])
+            candidates, counts = np.unique(candidates[mirror[candidates] < 0], return_counts=True)
+            if not candidates.size:
+                continue
+
+            candidates = candidates[counts == counts.max()]
+            distances = np.linalg.norm(points[candidates] - mirrored_points[vertex], axis=1)
+            match = candidates[np.argmin(distances)]
+
+            mirror[vertex], mirror[match] = match, vertex
+            changed = True
+
+    return mirror
+
+
+def symmetry_map(
+    mesh: str,
+    axis: Literal["x", "y", "z"] = "x",
+    tolerance: float = 0.001,
+    use_cache: bool = True,
+) -> np.ndarray:
+    """Get the mirror vertex of each vertex of a mesh.
+
+    Mirrored object space positions are matched with a grid hash within the tolerance, keeping mutual matches only.
+    The remaining vertices are matched by walking the topology from their matched neighbours. Maps are cached by
+    topology fingerprint, axis and tolerance. A cached map is reused when the pairs it matched by position are still
+    mirrored within the tolerance, a reshaped mesh is matched again.
+
+    Args:
+        mesh (str): Name of the mesh.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        tolerance (float): Maximum distance between a mirrored position and its mirror vertex.
+        use_cache (bool): Reuse the map of a mesh of identical topology, axis and tolerance.
+
+    Returns:
+        np.ndarray: Mirror vertex index of each vertex, -1 when none was found. Center vertices are their own mirror.
+    """
+
+    points = get_points(mesh, om.MSpace.kObject)
+    mirrored_points = points.copy()
+    mirrored_points[:, "xyz".index(axis)] *= -1
+
+    key = (topology_fingerprint(mesh), axis, tolerance)
+    if use_cache and key in _SYMMETRY_MAPS:
+        mirror, matched = _SYMMETRY_MAPS[key]
+        distances = np.linalg.norm(points[mirror[matched]] - mirrored_points[matched], axis=1)
+        if (distances <= tolerance).all():
+            return mirror.copy()
+
+    nearest, distances = PointGrid(points).nearest(mirrored_points)
+    mirror = np.where(distances <= tolerance, nearest, -1)
+
+    matched = np.flatnonzero(mirror >= 0)
+    mirror[matched[mirror[mirror[matched]] != matched]] = -1
+    # the pairs matched by position, checked against the positions of the next mesh using the cached map
+    matched = np.flatnonzero(mirror >= 0)
+
+    if (mirror < 0).any():
+        indptr, indices = vertex_adjacency(mesh)
+        _walk_topology(mirror, points, mirrored_points, indptr, indices)
+
+    unmatched = int((mirror < 0).sum())
+    if unmatched:
+        om.MGlobal.displayWarning(f"{unmatched} vertices without mirror on {mesh}")
+
+    _SYMMETRY_MAPS[key] = (mirror.copy(), matched)
+    return mirror
+
+
+def clear_symmetry_cache():
+    _SYMMETRY_MAPS.clear()
+
+
+def destination_vertices(
+    mesh: str,
+    mirror: np.ndarray,
+    axis: Literal["x", "y", "z"] = "x",
+    direction: Literal["+", "-"] = "+",
+    tolerance: float = 0.001,
+) -> np.ndarray:
+    """Get the indices of the vertices receiving mirrored data, on the side opposite to the direction."""
+
+    coordinates = get_points(mesh, om.MSpace.kObject)[:, "xyz".index(axis)]
+    destination = coordinates < -tolerance if direction == "+" else coordinates > tolerance
+    return np.flatnonzero(destination & (mirror >= 0))
+
+
+def mirror_name(name: str, sides: tuple = ("L", "R")) -> str:
+    """Swap the side tokens of a name, such as fk_arm_L -> fk_arm_R."""
+
+    swap = {sides[0]: sides[1], sides[1]: sides[0]}
+    short_name = name.split("|")[-1]
+    namespace, _, short_name = short_name.rpartition(":")
+    tokens = [swap.get(token, token) for token in short_name.split("_")]
+    return f"{namespace}:{'_'.join(tokens)}" if namespace else "_".join(tokens)
+
+
+def mirror_influence_columns(influences: list, sides: tuple = ("L", "R")) -> np.ndarray:
+    """Get the column of the mirror influence of each influence, itself when it has none."""
+
+    short_names = [name.split("|")[-1] for name in influences]
+    positions = {name: i for i, name in enumerate(short_names)}
+    return np.array([positions.get(mirror_name(name, sides), i) for i, name in enumerate(short_names)], dtype=int)
+
+
+def mirror_weights(weights: np.ndarray, mirror: np.ndarray, columns: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    """Copy the weights of the mirror vertices with swapped influence columns, in place.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        mirror (np.ndarray): Mirror vertex of each vertex.
+        columns (np.ndarray): Mirror influence column of each influence.
+        vertices (np.ndarray): Indices of the vertices to overwrite.
+
+    Returns:
+        np.ndarray: The mirrored weights.
+    """
+
+    weights[vertices] = weights[mirror[vertices]][:, columns]
+    return weights
+
+
+def mirror_skin_weights(
+    mesh: str,
+    axis: Literal["x", "y", "z"] = "x",
+    direction: Literal["+", "-"] = "+",
+    tolerance: float = 0.001,
+    sides: tuple = ("L", "R"),
+):
+    """Mirror the skin weights of a mesh across an axis, with a single weight read and write.
+
+    Args:
+        mesh (str): Name of the skinned mesh.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        direction (Literal["+", "-"]): "+" copies the positive side onto the negative side, "-" the opposite.
+        tolerance (float): Symmetry tolerance.
+        sides (tuple): Side tokens swapped in the influence names.
+    """
+
+    skin_cluster = find_skin_cluster(mesh)
+    if not skin_cluster:
+        om.MGlobal.displayError(f"No skinCluster found on {mesh}")
+        return
+
+    mirror = symmetry_map(mesh, axis, tolerance)
+    vertices = destination_vertices(mesh, mirror, axis, direction, tolerance)
+
+    weights, influences = skin_weights.get_weights(skin_cluster)
+    mirror_weights(weights, mirror, mirror_influence_columns(influences, sides), vertices)
+    skin_weights.set_weights(skin_cluster, weights[vertices], vertices)
+
+
+def mirror_deltas(
+    deltas: np.ndarray,
+    mirror: np.ndarray,
+    axis: Literal["x", "y", "z"] = "x",
+    vertices: np.ndarray = None,
+) -> np.ndarray:
+    """Mirror vertex deltas across an axis.
+
+    Args:
+        deltas (np.ndarray): Deltas of shape (vertex count, 3).
+        mirror (np.ndarray): Mirror vertex of each vertex.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        vertices (np.ndarray): Indices of the vertices to overwrite, the others are kept. All vertices when None,
+            which flips the deltas. Vertices without mirror keep their deltas.
+
+    Returns:
+        np.ndarray: The mirrored deltas.
+    """
+
+    flipped = deltas.copy()
+    valid = np.flatnonzero(mirror >= 0)
+    flipped[valid] = deltas[mirror[valid]]
+    flipped[valid, "xyz".index(axis)] *= -1
+
+    if vertices is None:
+        return flipped
+
+    mirrored = deltas.copy()
+    mirrored[vertices] = flipped[vertices]
+    return mirrored
+
+
+def _target_item(blendshape: str, target_index: int) -> str:
+    return f"{blendshape}.inputTarget[0].inputTargetGroup[{target_index}].inputTargetItem[6000]"
+
+
+def get_target_deltas(blendshape: str, target_index: int, vertex_count: int) -> np.ndarray:
+    """Get the deltas of a blendShape target as an array of shape (vertex count, 3)."""
+
+    item = _target_item(blendshape, target_index)
+    points = cmds.getAttr(f"{item}.inputPointsTarget") or []
+    components = cmds.getAttr(f"{item}.inputComponentsTarget") or []
+
+    indices = []
+    for component in components:
+        start, _, end = re.search(r"\[(\d+):?(\d*)\]", component).groups()
+        indices.extend(range(int(start), int(end or start) + 1))
+
+    deltas = np.zeros((vertex_count, 3))
+    if points:
+        deltas[indices] = np.array(points, dtype=float)[:, :3]
+    return deltas
+
+
+def set_target_deltas(blendshape: str, target_index: int, deltas: np.ndarray, epsilon: float = 1e-6):
+    """Set the deltas of a blendShape target, storing only the moving vertices as compact component ranges."""
+
+    item = _target_item(blendshape, target_index)
+    indices = np.flatnonzero(np.abs(deltas).max(axis=1) > epsilon)
+    components = [f"vtx[{start}]" if start == end else f"vtx[{start}:{end}]" for start, end in index_ranges(indices)]
+
+    points = [(*delta, 1.0) for delta in deltas[indices].tolist()]
+    cmds.setAttr(f"{item}.inputPointsTarget", len(points), *points, type="pointArray")
+    cmds.setAttr(f"{item}.inputComponentsTarget", len(components), *components, type="componentList")
+
+
+def mirror_blendshape_target(
+    blendshape: str,
+    mesh: str,
+    target_index: int,
+    destination_index: int = None,
+    axis: Literal["x", "y", "z"] = "x",
+    direction: Literal["+", "-", None] = None,
+    tolerance: float = 0.001,
+):
+    """Mirror the deltas of a blendShape target.
+
+    Args:
+        blendshape (str): Name of the blendShape node.
+        mesh (str): Name of the base mesh.
+        target_index (int): Index of the source target.
+        destination_index (int): Index of the target receiving the mirrored deltas. The source target when None.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        direction (Literal["+", "-", None]): Copy one side onto the other, or flip the whole target when None.
+        tolerance (float): Symmetry tolerance.
+    """
+
+    mirror = symmetry_map(mesh, axis, tolerance)
+    deltas = get_target_deltas(blendshape, target_index, len(mirror))
+
+    vertices = None if direction is None else destination_vertices(mesh, mirror, axis, direction, tolerance)
+    mirrored = mirror_deltas(deltas, mirror, axis, vertices)
+
+    set_target_deltas(blendshape, target_index if destination_index is None else destination_index, mirrored)
+
+
+def mirror_selection(axis: Literal["x", "y", "z"] = "x", tolerance: float = 0.001, add: bool = False):
+    """Select the mirror vertices of the selected components."""
+
+    components = cmds.ls(selection=True, long=True)
+    vertices = cmds.ls(cmds.polyListComponentConversion(components, toVertex=True), long=True)
+    if not vertices:
+        om.MGlobal.displayError("Select mesh components")
+        return
+
+    mesh, indices = skin_weights.component_indices(vertices)
+    mirrored = symmetry_map(mesh, axis, tolerance)[indices]
+    mirrored = np.unique(mirrored[mirrored >= 0])
+
+    cmds.select(vertex_components(mesh, mirrored), add=add, replace=not add)
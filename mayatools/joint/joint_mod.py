@@ -1,16 +1,10 @@
 from ...utils.imports import *
 import maya.OpenMaya as om1
-from .. import constants_maya
 from .. import curve
 from .. import display
 from .. import offset
 from .. import tools
 
-reload(constants_maya)
-reload(curve)
-reload(display)
-reload(offset)
-reload(tools)
 from ..constants_maya import *
 
 
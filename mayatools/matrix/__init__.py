@@ -2,5 +2,6 @@ from .matrix_mod import (
     matrix_aim_constraint,
     matrix_constraint,
     aim_matrix_on_selection,
-    matrix_on_selection
+    matrix_on_selection,
+    spline_matrices
 )
\ No newline at end of file
@@ -1,13 +1,11 @@
 from ...utils.imports import *
-from .. import constants_maya
+from ... import deboor_funcs
+from ... import mayatools_api as api
+from ...mayatools_api import GraphBuilder
 from .. import attribute
 from .. import display
 from .. import tools
 
-reload(constants_maya)
-reload(attribute)
-reload(display)
-reload(tools)
 from ..constants_maya import *
 
 
@@ -127,6 +125,7 @@ def matrix_constraint(
     mo: bool = False,
     w: bool = False,
     at: bool = False,
+    opm: bool = False,
 ):
     """Apply a matrix constraint.
 
@@ -150,42 +149,52 @@ def matrix_constraint(
         mo (bool): Maintain offset.
         w (bool): Enable weight control by adding a wtAddMatrixNode.
         at (bool): Create an attribute for weight control.
+        opm (bool): Drive the offsetParentMatrix of the target instead of decomposing the matrix into its channels.
+            Falls back to the decomposeMatrix when the target is a joint, constrains single axes, or when the
+            constrained channels can't be isolated by a pickMatrix, see opm_fallback_reason.
 
     Returns:
-        None
+        Union[str, list]: Name of the decomposeMatrix, or of the node driving the offsetParentMatrix, and of the
+            wtAddMatrix when the constraint is weighted.
     """
 
-    def offset(master: str, target: str) -> str:
+    def offset(master: api.Node, target: api.Node) -> api.Node:
         """Calculate the offset matrix between a master node and a target node.
 
         Args:
-            master (str): Name of the master node.
-            target (str): Name of the target node.
+            master (api.Node): Handle of the master node.
+            target (api.Node): Handle of the target node.
 
         Returns:
-            str: Name of the created offset matrix node.
+            api.Node: Handle of the created offset matrix node.
         """
 
-        mult_mtx = cmds.createNode("multMatrix", name=f"{target}_{master}_{MULT_MTX}")
+        mult_mtx = api.Node.create("multMatrix", f"{target}_{master}_{MULT_MTX}", modifier)
+        offset_mtx = target.get(W_MTX) * master.get("worldInverseMatrix[0]")
 
-        target_world_mtx = om.MMatrix(cmds.getAttr(f"{target}.worldMatrix[0]"))
-        master_world_inverse_mtx = om.MMatrix(
-            cmds.getAttr(f"{master}.worldInverseMatrix[0]")
-        )
-        offset_mtx = target_world_mtx * master_world_inverse_mtx
-
-        cmds.setAttr(f"{mult_mtx}.{MTX_IN0}", offset_mtx, type="matrix")
-        cmds.connectAttr(f"{master}.{W_MTX}", f"{mult_mtx}.{MTX_IN1}")
-        cmds.connectAttr(f"{target}.{PI_MTX}", f"{mult_mtx}.{MTX_IN2}")
+        mult_mtx.set(MTX_IN0, offset_mtx, modifier=modifier)
+        master.connect(W_MTX, mult_mtx, MTX_IN1, modifier=modifier)
+        target.connect(PI_MTX, mult_mtx, MTX_IN2, modifier=modifier)
 
         return mult_mtx
 
-    masters = tools.ensure_list(masters)
+    masters = [api.Node(master) for master in tools.ensure_list(masters)]
+    target = api.Node(target)
 
-    num = len(masters)
-    deco_mtx = cmds.createNode("decomposeMatrix", name=f"{target}_{DECO_MTX}")
+    # every node, attribute and connection goes through this modifier, put on the undo queue once done
+    modifier = om.MDGModifier()
 
-    return_node = deco_mtx
+    values = t, r, s, tx, ty, tz, rx, ry, rz, sx, sy, sz
+
+    if opm:
+        reason = opm_fallback_reason(target, values)
+        if reason:
+            om.MGlobal.displayWarning(f"offsetParentMatrix mode not available on {target} : {reason}")
+            opm = False
+
+    num = len(masters)
+    if not opm:
+        deco_mtx = api.Node.create("decomposeMatrix", f"{target}_{DECO_MTX}", modifier)
 
     if not w and num == 1:
         master = masters[0]
@@ -194,55 +203,53 @@ def matrix_constraint(
             mult_mtx = offset(master, target)
 
         else:
-            mult_mtx = cmds.createNode(
-                "multMatrix", name=f"{target}_{master}_{MULT_MTX}"
-            )
-            cmds.connectAttr(f"{master}.worldMatrix[0]", f"{mult_mtx}.{MTX_IN0}")
-            cmds.connectAttr(
-                f"{target}.parentInverseMatrix[0]", f"{mult_mtx}.{MTX_IN1}"
-            )
+            mult_mtx = api.Node.create("multMatrix", f"{target}_{master}_{MULT_MTX}", modifier)
+            master.connect(W_MTX, mult_mtx, MTX_IN0, modifier=modifier)
+            target.connect(PI_MTX, mult_mtx, MTX_IN1, modifier=modifier)
 
-        cmds.connectAttr(f"{mult_mtx}.{MTX_SUM}", f"{deco_mtx}.{INPUT_MTX}")
+        output = mult_mtx
 
     else:
-        wt_add_mtx = cmds.createNode("wtAddMatrix", name=f"{target}_{WTADD_MTX}")
+        wt_add_mtx = api.Node.create("wtAddMatrix", f"{target}_{WTADD_MTX}", modifier)
 
         for i, master in enumerate(masters):
 
             default_value = 1 / num
             mult_mtx = offset(master, target)
-            cmds.connectAttr(
-                f"{mult_mtx}.{MTX_SUM}", f"{wt_add_mtx}.wtMatrix[{i}].matrixIn"
-            )
-            cmds.setAttr(f"{wt_add_mtx}.wtMatrix[{i}].weightIn", default_value)
+            mult_mtx.connect(MTX_SUM, wt_add_mtx, f"wtMatrix[{i}].matrixIn", modifier=modifier)
+            wt_add_mtx.set(f"wtMatrix[{i}].weightIn", default_value, modifier=modifier)
 
             if at:
                 at_nn, at_ln = f"W{i:02} {master}", f"w{i:02}_{master}"
 
                 if i == 0:
-                    attribute.sep_cb([target], add=1)
-
-                cmds.addAttr(
-                    target,
-                    longName=at_ln,
-                    niceName=at_nn,
-                    attributeType="float",
-                    defaultValue=default_value,
-                    min=0,
-                    max=1,
-                    k=True,
-                )
-
-                cmds.setAttr(f"{target}.{at_ln}", channelBox=True, keyable=False)
-                cmds.connectAttr(
-                    f"{target}.{at_ln}", f"{wt_add_mtx}.wtMatrix[{i}].weightIn"
+                    attribute.sep_cb([target.name], add=1)
+
+                api.addAttribute(
+                    target.object,
+                    at_ln,
+                    nice_name=at_nn,
+                    default_value=default_value,
+                    min_value=0,
+                    max_value=1,
+                    keyable=False,
+                    channel_box=True,
+                    modifier=modifier,
                 )
+                modifier.doIt()
+                target.connect(at_ln, wt_add_mtx, f"wtMatrix[{i}].weightIn", modifier=modifier)
 
-            return_node = [deco_mtx, wt_add_mtx]
+        output = wt_add_mtx
 
-        cmds.connectAttr(f"{wt_add_mtx}.{MTX_SUM}", f"{deco_mtx}.{INPUT_MTX}")
+    if opm:
+        driver, output_string = _connect_offset_parent_matrix(output, target, t, r, s, modifier)
+        modifier.doIt()
+        api.modifierUndo(modifier)
+        om.MGlobal.displayInfo(f"Matrix Constraint done : {target} {OP_MTX} {output_string}")
+        return driver.name if not w and num == 1 else [driver.name, wt_add_mtx.name]
 
-    values = t, r, s, tx, ty, tz, rx, ry, rz, sx, sy, sz
+    output.connect(MTX_SUM, deco_mtx, INPUT_MTX, modifier=modifier)
+    return_node = deco_mtx.name if not w and num == 1 else [deco_mtx.name, wt_add_mtx.name]
 
     dec_matrix_at = (
         OUTPUT_T,
@@ -270,13 +277,176 @@ def matrix_constraint(
     ) in zip(values, dec_matrix_at, target_at):
 
         if v:
-            cmds.connectAttr(f"{deco_mtx}.{dm_at}", f"{target}.{t_at}")
+            deco_mtx.connect(dm_at, target, t_at, modifier=modifier)
             output_string = f"{t_at}{output_string}"
 
+    modifier.doIt()
+    api.modifierUndo(modifier)
     om.MGlobal.displayInfo(f"Matrix Constraint done : {target} {output_string}")
     return return_node
 
 
+def opm_fallback_reason(target: Union[str, api.Node], values: tuple) -> str:
+    """Tell why a matrix constraint can't drive the offsetParentMatrix of a target.
+
+    The target world matrix is its local matrix, scale then rotate then translate, multiplied by the offsetParentMatrix.
+    The constrained channels are reset and picked in the offsetParentMatrix, so they must come last in this order for
+    the free channels to behave as they do with a decomposeMatrix : translate, rotate and translate, or all of them.
+
+    Args:
+        target (Union[str, api.Node]): Name or handle of the target node.
+        values (tuple): Constrained channels, in the matrix_constraint order t, r, s, tx, ty, tz, rx, ry, rz, sx, sy, sz.
+
+    Returns:
+        str: The reason, empty when the offsetParentMatrix can be driven.
+    """
+
+    target = api.Node(target)
+    t, r, s = values[:3]
+
+    if target.object.hasFn(om.MFn.kJoint):
+        return "joint orient and segment scale need the decomposed channels"
+
+    if any(values[3:]):
+        return "single axes need the decomposed channels"
+
+    if not t or (s and not r):
+        return "translate, translate and rotate, or all channels must be constrained"
+
+    if target.plug(OP_MTX).isDestination:
+        return f"{OP_MTX} is already connected"
+
+    for attr, on in ((TRANSLATE, t), (ROTATE, r), (SCALE, s)):
+        plug = target.plug(attr)
+        if on and (plug.isDestination or any(plug.child(i).isDestination for i in range(3))):
+            return f"{attr} is already connected"
+
+    return ""
+
+
+def _connect_offset_parent_matrix(
+    output: api.Node,
+    target: api.Node,
+    t: bool,
+    r: bool,
+    s: bool,
+    modifier: om.MDGModifier,
+) -> tuple:
+    """Connect a constraint output matrix to the offsetParentMatrix of a target and reset its constrained channels.
+
+    Returns:
+        tuple: Handle of the node driving the offsetParentMatrix and the constrained channels.
+    """
+
+    driver = output
+    if not (t and r and s):
+        driver = api.Node.create("pickMatrix", f"{target}_{PICK_MTX}", modifier)
+        output.connect(MTX_SUM, driver, INPUT_MTX, modifier=modifier)
+        driver.set("useRotate", r, modifier=modifier)
+        driver.set("useScale", s, modifier=modifier)
+        driver.set("useShear", s, modifier=modifier)
+        driver.connect(OUTPUT_MTX, target, OP_MTX, modifier=modifier)
+    else:
+        output.connect(MTX_SUM, target, OP_MTX, modifier=modifier)
+
+    output_string = " "
+    for attr, on, value in ((TRANSLATE, t, 0), (ROTATE, r, 0), (SCALE, s, 1)):
+        if on:
+            target.set(attr, value, value, value, modifier=modifier)
+            output_string = f"{attr}{output_string}"
+    if s:
+        target.set("shear", 0, 0, 0, modifier=modifier)
+
+    return driver, output_string
+
+
+def spline_matrices(
+    cvs: list,
+    parameters: list,
+    name: str,
+    degree: int = 3,
+    up_vector: Tuple[float] = (0, 0, 1),
+    up_matrix: str = None,
+    length: bool = True,
+) -> Tuple[list, str]:
+    """Build matrix networks sliding along a spline defined by the world matrices of its control points.
+
+    Each sample blends the cv matrices with the deboor_funcs point weights in a wtAddMatrix. Its aim target blends
+    them with the point weights plus the tangent weights, which moves the target along the tangent : the aimMatrix
+    points the Y axis down the spline and aligns the X axis with the up vector. The scale is removed by a pickMatrix.
+    The length of the spline is the sum of the distances between the end cvs and the samples. The whole network is
+    committed in one GraphBuilder pass.
+
+    Args:
+        cvs (list): World matrix plugs of the control points.
+        parameters (list): Parameters of the samples, from 0 to 1.
+        name (str): Name of the networks.
+        degree (int): Degree of the spline.
+        up_vector (Tuple[float]): Axis of the up matrix the X axis of the samples is aligned with.
+        up_matrix (str): Matrix plug holding the up vector. The blended cvs of each sample when None.
+        length (bool): Measure the length of the spline.
+
+    Returns:
+        Tuple[list, str]: Output matrix plug of each sample and the length plug of the spline, None without length.
+    """
+
+    graph = GraphBuilder()
+    basis = deboor_funcs.SplineBasis.get(len(cvs), degree)
+
+    def weighted_matrix(weights: list, node_name: str) -> str:
+        node = graph.createNode("wtAddMatrix", name=node_name)
+        for index, (matrix, weight) in enumerate(weights):
+            graph.connectAttr(matrix, f"{node}.wtMatrix[{index}].matrixIn")
+            graph.setAttr(f"{node}.wtMatrix[{index}].weightIn", weight)
+        return f"{node}.matrixSum"
+
+    points, outputs = [], []
+    for index, parameter in enumerate(parameters, 1):
+        point_weights = deboor_funcs.pointOnCurveWeights(cvs, parameter, degree, basis=basis)
+        tangent_weights = deboor_funcs.tangentOnCurveWeights(cvs, parameter, degree, basis=basis)
+        point = weighted_matrix(
+            deboor_funcs.pruneWeights(point_weights, 1e-6)[0], f"wtAddMtx_point_{name}_{index:02}"
+        )
+        target = weighted_matrix(
+            deboor_funcs.pruneWeights(point_weights + tangent_weights, 1e-6)[0], f"wtAddMtx_aim_{name}_{index:02}"
+        )
+
+        aim = graph.createNode("aimMatrix", name=f"{AIM_MTX}_{name}_{index:02}")
+        graph.connectAttr(point, f"{aim}.inputMatrix")
+        graph.connectAttr(target, f"{aim}.primaryTargetMatrix")
+        graph.connectAttr(up_matrix or point, f"{aim}.secondaryTargetMatrix")
+        graph.setAttr(f"{aim}.primaryMode", 1)  # aim
+        graph.setAttr(f"{aim}.primaryInputAxis", 0, 1, 0)
+        graph.setAttr(f"{aim}.secondaryMode", 2)  # align
+        graph.setAttr(f"{aim}.secondaryInputAxis", 1, 0, 0)
+        graph.setAttr(f"{aim}.secondaryTargetVector", *up_vector)
+
+        pick = graph.createNode("pickMatrix", name=f"{PICK_MTX}_{name}_{index:02}")
+        graph.connectAttr(f"{aim}.outputMatrix", f"{pick}.inputMatrix")
+        graph.setAttr(f"{pick}.useScale", False)
+        graph.setAttr(f"{pick}.useShear", False)
+
+        points.append(point)
+        outputs.append(f"{pick}.outputMatrix")
+
+    if length:
+        sum_node = graph.createNode("plusMinusAverage", name=f"sum_length_{name}")
+        chord_ends = [cvs[0], *points, cvs[-1]]
+        for index, (first, second) in enumerate(zip(chord_ends, chord_ends[1:])):
+            distance = graph.createNode("distanceBetween", name=f"distB_{name}_{index:02}")
+            graph.connectAttr(first, f"{distance}.inMatrix1")
+            graph.connectAttr(second, f"{distance}.inMatrix2")
+            graph.connectAttr(f"{distance}.distance", f"{sum_node}.input1D[{index}]")
+
+    names = graph.commit()
+
+    def resolve(plug: str) -> str:
+        node, _, attr = plug.partition(".")
+        return f"{names.get(node, node)}.{attr}"
+
+    return [resolve(output) for output in outputs], resolve(f"{sum_node}.output1D") if length else None
+
+
 def aim_matrix_on_selection(
     r: bool = False,
     rx: bool = False,
@@ -313,6 +483,7 @@ def matrix_on_selection(
     mo: bool = False,
     w: bool = False,
     at: bool = False,
+    opm: bool = False,
 ):
     """ """
 
@@ -323,5 +494,5 @@ def matrix_on_selection(
     else:
         masters, target = nodes[0:-1], nodes[-1]
         matrix_constraint(
-            masters, target, t, r, s, tx, ty, tz, rx, ry, rz, sx, sy, sz, mo, w, at
+            masters, target, t, r, s, tx, ty, tz, rx, ry, rz, sx, sy, sz, mo, w, at, opm
         )
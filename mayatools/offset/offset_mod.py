@@ -1,11 +1,8 @@
 from ...utils.imports import *
-from .. import constants_maya
+from ... import mayatools_api as api
 from .. import display
 from .. import tools
 
-reload(constants_maya)
-reload(display)
-reload(tools)
 from ..constants_maya import *
 
 
@@ -87,15 +84,13 @@ def offset_parent_matrix(nodes):
 
     nodes = tools.ensure_list(nodes)
 
-    for node in nodes:
+    modifier = om.MDGModifier()
 
-        local_matrix = om.MMatrix(
-            cmds.xform(node, query=True, matrix=True, worldSpace=False)
-        )
-        offset_parent_matrix = om.MMatrix(cmds.getAttr(f"{node}.{OP_MTX}"))
-        baked_matrix = local_matrix * offset_parent_matrix
+    for node in nodes:
 
-        cmds.setAttr(f"{node}.{OP_MTX}", baked_matrix, type="matrix")
+        node = api.Node(node)
+        baked_matrix = node.get("matrix") * node.get(OP_MTX)
+        node.set(OP_MTX, baked_matrix, modifier=modifier)
 
         for attribute in [TRANSLATE, ROTATE, SCALE, "jointOrient"]:
 
@@ -103,10 +98,11 @@ def offset_parent_matrix(nodes):
 
             for axis in "XYZ":
 
-                if cmds.attributeQuery(f"{attribute}{axis}", node=node, exists=True):
+                if node.hasAttribute(f"{attribute}{axis}"):
+                    node.set(f"{attribute}{axis}", value, modifier=modifier)
 
-                    attribute_name = f"{node}.{attribute}{axis}"
-                    cmds.setAttr(attribute_name, value)
+    modifier.doIt()
+    api.modifierUndo(modifier)
 
 
 def op_matrix_to_transforms(nodes):
@@ -1,5 +1,6 @@
 from .ribbon_mod import (
     ribbon,
+    matrix_ribbon_rivets,
     bone_ribbon,
     preserve_joint,
     preserve_joint_02,
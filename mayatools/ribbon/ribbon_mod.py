@@ -1,9 +1,10 @@
 from ...utils.imports import *
+from ...utils.profiler import benchmark_builds, profile
+from ...mayatools_api import GraphBuilder
 from ..constants_maya import *
 from ..curve import control, shape_vis, scale_shape
 
 from .. import (
-    constants_maya,
     attribute,
     curve,
     joint,
@@ -15,25 +16,15 @@ from .. import (
     display,
 )
 
-reload(constants_maya)
-reload(attribute)
-reload(curve)
-reload(joint)
-reload(mathfuncs)
-reload(matrix)
-reload(offset)
-reload(rivet)
-reload(tools)
-reload(display)
-from ..constants_maya import *
-
 
+@profile
 def ribbon(
     sub: int = 5,
     name: str = "ribbon",
     sinus: bool = False,
     color: str = "yellow",
     base_translate: float = 0.0,
+    backend: Literal["deformer", "matrix"] = "deformer",
 ):
     """Create a ribbon with controls and deformers.
 
@@ -42,10 +33,13 @@ def ribbon(
         name (str): The base name for the ribbon and its components. Defaults to "ribbon".
         sinus (bool): Flag indicating whether to apply a sine deformer. Defaults to False.
         color (str): The color of the ribbon controls. Defaults to "red".
+        backend (Literal["deformer", "matrix"]): "deformer" rivets the joints on a surface deformed by a blendShape,
+            a wire and a twist deformer. "matrix" builds the same controls without surface nor deformer, the joints
+            are driven by matrix_ribbon_rivets.
 
     Returns:
         tuple: A tuple containing the global controller, two end controls of the ribbon (ctrl_a, ctrl_b),
-        and the group containing all the ribbon components (grp_ribbon).
+        the surface, None with the matrix backend, and the group of the rivets.
     """
 
     # naming
@@ -54,23 +48,27 @@ def ribbon(
     om.MGlobal.displayInfo(f"Ribbon Subdivisions : {sub}")
 
     # ribbon surface
-    surface = cmds.nurbsPlane(
-        name=name,
-        axis=[0, 1, 0],
-        lengthRatio=sub,
-        patchesV=sub,
-        width=2,
-        constructionHistory=False,
-    )[0]
-    surface_shape = cmds.listRelatives(surface, shapes=True)[0]
-    cmds.setAttr(f"{surface}.ry", -90)
-    cmds.makeIdentity(surface, apply=True, r=True)
-
-    cmds.select(clear=True)
-    cmds.setAttr(f"{surface}.tx", base_translate)
-
-    XMIN, XMAX = mathfuncs.xmin(surface), mathfuncs.xmax(surface)
-    XCENTER = cmds.objectCenter(surface_shape)[0]
+    if backend == "deformer":
+        surface = cmds.nurbsPlane(
+            name=name,
+            axis=[0, 1, 0],
+            lengthRatio=sub,
+            patchesV=sub,
+            width=2,
+            constructionHistory=False,
+        )[0]
+        surface_shape = cmds.listRelatives(surface, shapes=True)[0]
+        cmds.setAttr(f"{surface}.ry", -90)
+        cmds.makeIdentity(surface, apply=True, r=True)
+
+        cmds.select(clear=True)
+        cmds.setAttr(f"{surface}.tx", base_translate)
+
+        XMIN, XMAX = mathfuncs.xmin(surface), mathfuncs.xmax(surface)
+        XCENTER = cmds.objectCenter(surface_shape)[0]
+    else:
+        surface = None
+        XMIN, XMAX, XCENTER = base_translate - sub, base_translate + sub, base_translate
 
     # create groups
     show_grp = cmds.group(empty=True, name=f"{SHOW}_{name}")
@@ -108,24 +106,32 @@ def ribbon(
     cmds.parent(ctrl_b, ctrl_global)
     cmds.parent(ctrl_mid, ctrl_mid_move)
     cmds.parent(ctrl_mid_move, ctrl_global)
-    cmds.parent(surface, ctrl_global)
+    if surface:
+        cmds.parent(surface, ctrl_global)
 
     offset.offset_parent_matrix([ctrl_a, ctrl_b, ctrl_mid_move])
     attribute.cb_attributes(
         ctrl_mid, ats=["rx", "ry", "rz", "sx", "sy", "sz"], lock=True, hide=True
     )
 
+    # utility networks are collected and committed in one pass once all their nodes exist
+    graph = GraphBuilder()
+
     # constrain ctrl_mid
-    pma_node = cmds.createNode("plusMinusAverage", name=f"{ctrl_mid}_pma")
-    cmds.setAttr(f"{pma_node}.operation", 3)
-    cmds.connectAttr(f"{ctrl_a}.{TRANSLATE}", f"{pma_node}.input3D[0]")
-    cmds.connectAttr(f"{ctrl_b}.{TRANSLATE}", f"{pma_node}.input3D[1]")
-    cmds.connectAttr(f"{pma_node}.output3Dx", f"{ctrl_mid}_{MOVE}.tx", force=True)
-    cmds.connectAttr(f"{pma_node}.output3Dy", f"{ctrl_mid}_{MOVE}.ty", force=True)
-    cmds.connectAttr(f"{pma_node}.output3Dz", f"{ctrl_mid}_{MOVE}.tz", force=True)
+    pma_node = graph.createNode("plusMinusAverage", name=f"{ctrl_mid}_pma")
+    graph.setAttr(f"{pma_node}.operation", 3)
+    graph.connectAttr(f"{ctrl_a}.{TRANSLATE}", f"{pma_node}.input3D[0]")
+    graph.connectAttr(f"{ctrl_b}.{TRANSLATE}", f"{pma_node}.input3D[1]")
+    graph.connectAttr(f"{pma_node}.output3Dx", f"{ctrl_mid}_{MOVE}.tx", force=True)
+    graph.connectAttr(f"{pma_node}.output3Dy", f"{ctrl_mid}_{MOVE}.ty", force=True)
+    graph.connectAttr(f"{pma_node}.output3Dz", f"{ctrl_mid}_{MOVE}.tz", force=True)
 
     # create rivets & joints
-    grp_rivets = rivet.rivet_nurbs(surface, "v", rivet_num=sub, size=0.4, jnt=True)
+    if backend == "matrix":
+        graph.commit()
+        grp_rivets = matrix_ribbon_rivets(ctrl_global, ctrl_a, ctrl_mid, ctrl_b, name, sub)
+    else:
+        grp_rivets = rivet.rivet_nurbs(surface, "v", rivet_num=sub, size=0.4, jnt=True)
     cmds.parent(grp_rivets, show_grp)
 
     rivets = cmds.listRelatives(grp_rivets, children=True, shapes=False)
@@ -134,87 +140,166 @@ def ribbon(
         # cmds.connectAttr(f"{ctrl_global}.{SCALE}", f"{rivet}.{SCALE}")
         matrix.matrix_constraint(ctrl_global, riv, mo=False, s=True)
 
-    # Deformers
-    # blendshape
-    copy = cmds.duplicate(surface)
-    bshp = cmds.rename(copy, f"{BSHP}_{name}")
-    cmds.parent(bshp, hide_grp)
-
-    bshp_node = cmds.blendShape(bshp, surface, n=f"{BSHP}_{name}")[0]
-    cmds.setAttr(f"{bshp_node}.{bshp}", 1)
-
-    # curve & wire deformer
-    curve_pos = [(XMIN, 0, 0), (XCENTER, 0, 0), (XMAX, 0, 0)]
-    curve_master = cmds.curve(n=f"crv_{name}", d=2, p=curve_pos)
-    cmds.wire(bshp, w=curve_master, dds=(0, 20))
-    curve_basewire = f"{curve_master}BaseWire"
-    cmds.parent(curve_master, hide_grp)
-    cmds.parent(curve_basewire, hide_grp)
-
-    curve_shape = cmds.listRelatives(curve_master, shapes=True)[0]
-
-    # control points
-    ctrl_pnt_a = cmds.group(n=f"controlPoint_A_{name}", em=1, w=1)
-    ctrl_pnt_b = cmds.group(n=f"controlPoint_B_{name}", em=1, w=1)
-    ctrl_pnt_mid = cmds.group(n=f"controlPoint_Mid_{name}", em=1, w=1)
-    ctrl_pnt_mid_move = cmds.group(n=f"controlPoint_Mid_{name}_{MOVE}", em=1, w=1)
-
-    cmds.setAttr(f"{ctrl_pnt_a}.tx", XMIN)
-    cmds.setAttr(f"{ctrl_pnt_b}.tx", XMAX)
-    cmds.setAttr(f"{ctrl_pnt_mid}.tx", XCENTER)
-    cmds.setAttr(f"{ctrl_pnt_mid_move}.tx", XCENTER)
-    offset.offset_parent_matrix([ctrl_pnt_a, ctrl_pnt_b, ctrl_pnt_mid_move])
-
-    cmds.parent(ctrl_pnt_mid, ctrl_pnt_mid_move)
-    cmds.parent(ctrl_pnt_a, hide_grp)
-    cmds.parent(ctrl_pnt_b, hide_grp)
-    cmds.parent(ctrl_pnt_mid_move, hide_grp)
-
-    cmds.matchTransform(ctrl_pnt_a, ctrl_a, pos=1)
-    cmds.matchTransform(ctrl_pnt_b, ctrl_b, pos=1)
-    offset.offset_parent_matrix([ctrl_pnt_a, ctrl_pnt_b])
-
-    # create decompose matrix nodes
-    deco_mtx_a = cmds.createNode("decomposeMatrix", n=f"{ctrl_pnt_a}_{DECO_MTX}")
-    deco_mtx_mid = cmds.createNode("decomposeMatrix", n=f"{ctrl_pnt_mid}_{DECO_MTX}")
-    deco_mtx_b = cmds.createNode("decomposeMatrix", n=f"{ctrl_pnt_b}_{DECO_MTX}")
-
-    # connections controls & control points
-    cmds.connectAttr(f"{ctrl_a}.t", f"{ctrl_pnt_a}.t")
-    cmds.connectAttr(f"{ctrl_b}.t", f"{ctrl_pnt_b}.t")
-    cmds.connectAttr(f"{ctrl_mid}.t", f"{ctrl_pnt_mid}.t")
-    cmds.connectAttr(f"{ctrl_mid_move}.t", f"{ctrl_pnt_mid_move}.t")
-
-    cmds.connectAttr(f"{ctrl_pnt_a}.{W_MTX}", f"{deco_mtx_a}.{INPUT_MTX}")
-    cmds.connectAttr(f"{ctrl_pnt_mid}.{W_MTX}", f"{deco_mtx_mid}.{INPUT_MTX}")
-    cmds.connectAttr(f"{ctrl_pnt_b}.{W_MTX}", f"{deco_mtx_b}.{INPUT_MTX}")
-
-    cmds.connectAttr(f"{deco_mtx_a}.{OUTPUT_T}", f"{curve_shape}.controlPoints[0]")
-    cmds.connectAttr(f"{deco_mtx_mid}.{OUTPUT_T}", f"{curve_shape}.controlPoints[1]")
-    cmds.connectAttr(f"{deco_mtx_b}.{OUTPUT_T}", f"{curve_shape}.controlPoints[2]")
-
-    # twist deformer
-    twist_deformer, twist_def_handle = cmds.nonLinear(
-        bshp, type="twist", name=f"twist_{name}"
-    )
-    cmds.rotate(0, 0, "90deg", twist_def_handle)
-    cmds.parent(twist_def_handle, hide_grp)
+    if backend == "deformer":
+        # Deformers
+        # blendshape
+        copy = cmds.duplicate(surface)
+        bshp = cmds.rename(copy, f"{BSHP}_{name}")
+        cmds.parent(bshp, hide_grp)
+
+        bshp_node = cmds.blendShape(bshp, surface, n=f"{BSHP}_{name}")[0]
+        cmds.setAttr(f"{bshp_node}.{bshp}", 1)
+
+        # curve & wire deformer
+        curve_pos = [(XMIN, 0, 0), (XCENTER, 0, 0), (XMAX, 0, 0)]
+        curve_master = cmds.curve(n=f"crv_{name}", d=2, p=curve_pos)
+        cmds.wire(bshp, w=curve_master, dds=(0, 20))
+        curve_basewire = f"{curve_master}BaseWire"
+        cmds.parent(curve_master, hide_grp)
+        cmds.parent(curve_basewire, hide_grp)
+
+        curve_shape = cmds.listRelatives(curve_master, shapes=True)[0]
+
+        # control points
+        ctrl_pnt_a = cmds.group(n=f"controlPoint_A_{name}", em=1, w=1)
+        ctrl_pnt_b = cmds.group(n=f"controlPoint_B_{name}", em=1, w=1)
+        ctrl_pnt_mid = cmds.group(n=f"controlPoint_Mid_{name}", em=1, w=1)
+        ctrl_pnt_mid_move = cmds.group(n=f"controlPoint_Mid_{name}_{MOVE}", em=1, w=1)
+
+        cmds.setAttr(f"{ctrl_pnt_a}.tx", XMIN)
+        cmds.setAttr(f"{ctrl_pnt_b}.tx", XMAX)
+        cmds.setAttr(f"{ctrl_pnt_mid}.tx", XCENTER)
+        cmds.setAttr(f"{ctrl_pnt_mid_move}.tx", XCENTER)
+        offset.offset_parent_matrix([ctrl_pnt_a, ctrl_pnt_b, ctrl_pnt_mid_move])
+
+        cmds.parent(ctrl_pnt_mid, ctrl_pnt_mid_move)
+        cmds.parent(ctrl_pnt_a, hide_grp)
+        cmds.parent(ctrl_pnt_b, hide_grp)
+        cmds.parent(ctrl_pnt_mid_move, hide_grp)
+
+        cmds.matchTransform(ctrl_pnt_a, ctrl_a, pos=1)
+        cmds.matchTransform(ctrl_pnt_b, ctrl_b, pos=1)
+        offset.offset_parent_matrix([ctrl_pnt_a, ctrl_pnt_b])
+
+        # create decompose matrix nodes
+        deco_mtx_a = graph.createNode("decomposeMatrix", name=f"{ctrl_pnt_a}_{DECO_MTX}")
+        deco_mtx_mid = graph.createNode("decomposeMatrix", name=f"{ctrl_pnt_mid}_{DECO_MTX}")
+        deco_mtx_b = graph.createNode("decomposeMatrix", name=f"{ctrl_pnt_b}_{DECO_MTX}")
+
+        # connections controls & control points
+        graph.connectAttr(f"{ctrl_a}.t", f"{ctrl_pnt_a}.t")
+        graph.connectAttr(f"{ctrl_b}.t", f"{ctrl_pnt_b}.t")
+        graph.connectAttr(f"{ctrl_mid}.t", f"{ctrl_pnt_mid}.t")
+        graph.connectAttr(f"{ctrl_mid_move}.t", f"{ctrl_pnt_mid_move}.t")
+
+        graph.connectAttr(f"{ctrl_pnt_a}.{W_MTX}", f"{deco_mtx_a}.{INPUT_MTX}")
+        graph.connectAttr(f"{ctrl_pnt_mid}.{W_MTX}", f"{deco_mtx_mid}.{INPUT_MTX}")
+        graph.connectAttr(f"{ctrl_pnt_b}.{W_MTX}", f"{deco_mtx_b}.{INPUT_MTX}")
+
+        graph.connectAttr(f"{deco_mtx_a}.{OUTPUT_T}", f"{curve_shape}.controlPoints[0]")
+        graph.connectAttr(f"{deco_mtx_mid}.{OUTPUT_T}", f"{curve_shape}.controlPoints[1]")
+        graph.connectAttr(f"{deco_mtx_b}.{OUTPUT_T}", f"{curve_shape}.controlPoints[2]")
+
+        graph.commit()
+
+        # twist deformer
+        twist_deformer, twist_def_handle = cmds.nonLinear(
+            bshp, type="twist", name=f"twist_{name}"
+        )
+        cmds.rotate(0, 0, "90deg", twist_def_handle)
+        cmds.parent(twist_def_handle, hide_grp)
 
-    cmds.connectAttr(f"{ctrl_a}.rx", f"{twist_deformer}.endAngle")
-    cmds.connectAttr(f"{ctrl_b}.rx", f"{twist_deformer}.startAngle")
+        cmds.connectAttr(f"{ctrl_a}.rx", f"{twist_deformer}.endAngle")
+        cmds.connectAttr(f"{ctrl_b}.rx", f"{twist_deformer}.startAngle")
 
-    # sine deformer
-    if sinus:
-        pass
+        # sine deformer
+        if sinus:
+            pass
 
     tools.ensure_group(ctrl_global, CTRLS)
 
     cmds.select(cl=1)
-    om.MGlobal.displayInfo(f"Ribbon {surface} done.")
+    om.MGlobal.displayInfo(f"Ribbon {name} done.")
 
     return ctrl_global, ctrl_a, ctrl_b, surface, grp_rivets
 
 
+def matrix_ribbon_rivets(ctrl_global: str, ctrl_a: str, ctrl_mid: str, ctrl_b: str, name: str, sub: int) -> str:
+    """Create the rivets and joints of a ribbon driven by matrix nodes only.
+
+    The bend follows the quadratic curve of the controls, as the wire deformer does : spline_matrices blends the
+    world matrices of the controls with closed form weights and aims each rivet down the curve, the X axis aligned
+    with the Y axis of the global control. The twist of the end controls is distributed with a quatSlerp per rivet,
+    the shortest way between the two rotations.
+
+    Args:
+        ctrl_global (str): Global control of the ribbon.
+        ctrl_a (str): Start control.
+        ctrl_mid (str): Middle control.
+        ctrl_b (str): End control.
+        name (str): Name of the ribbon.
+        sub (int): Number of rivets.
+
+    Returns:
+        str: Group of the rivets.
+    """
+
+    rivets_grp = cmds.group(n=f"Grp_rivets_{name}", em=1)
+    parameters = [(i - 0.5) / sub for i in range(1, sub + 1)]
+    outputs, _ = matrix.spline_matrices(
+        [f"{ctrl}.{W_MTX}" for ctrl in (ctrl_a, ctrl_mid, ctrl_b)],
+        parameters,
+        name=name,
+        degree=2,
+        up_vector=(0, 1, 0),
+        up_matrix=f"{ctrl_global}.{W_MTX}",
+        length=False,
+    )
+
+    graph = GraphBuilder()
+
+    # twist around the Y axis of the rivets, running from ctrl_a to ctrl_b like the X axis of the controls
+    quats = []
+    for ctrl in (ctrl_a, ctrl_b):
+        quat_node = graph.createNode("eulerToQuat", name=f"eulerToQuat_{ctrl}")
+        graph.connectAttr(f"{ctrl}.rx", f"{quat_node}.inputRotateY")
+        quats.append(f"{quat_node}.outputQuat")
+
+    for i, (parameter, output) in enumerate(zip(parameters, outputs), 1):
+        rivet_node = f"rivet_{name}_{i:02}"
+        cmds.spaceLocator(n=rivet_node)
+        shape = cmds.listRelatives(rivet_node, shapes=True)[0]
+        cmds.setAttr(f"{shape}.v", 0)
+        cmds.parent(rivet_node, rivets_grp)
+        display.color_node(rivet_node, "orange")
+        display.loc_size(rivet_node, 0.4)
+
+        cmds.select(rivet_node)
+        bind_jnt = cmds.joint(n=f"bind_{rivet_node}")
+        tools.ensure_set(bind_jnt)
+        display.color_node(bind_jnt, "white")
+
+        slerp_node = graph.createNode("quatSlerp", name=f"quatSlerp_{rivet_node}")
+        graph.connectAttr(quats[0], f"{slerp_node}.input1Quat")
+        graph.connectAttr(quats[1], f"{slerp_node}.input2Quat")
+        graph.setAttr(f"{slerp_node}.inputT", parameter)
+
+        twist_node = graph.createNode("composeMatrix", name=f"compMtx_twist_{rivet_node}")
+        graph.setAttr(f"{twist_node}.useEulerRotation", False)
+        graph.connectAttr(f"{slerp_node}.outputQuat", f"{twist_node}.inputQuat")
+
+        mult_node = graph.createNode("multMatrix", name=f"{MULT_MTX}_{rivet_node}")
+        graph.connectAttr(f"{twist_node}.outputMatrix", f"{mult_node}.matrixIn[0]")
+        graph.connectAttr(output, f"{mult_node}.matrixIn[1]")
+        graph.connectAttr(f"{mult_node}.{MTX_SUM}", f"{rivet_node}.{OP_MTX}")
+
+    graph.commit()
+    cmds.select(cl=1)
+
+    return rivets_grp
+
+
+@profile
 def bone_ribbon(
     start: str,
     end: str,
@@ -222,12 +307,14 @@ def bone_ribbon(
     color: str = "yellow",
     sub: int = 5,
     base_translate: float = 0.0,
+    backend: Literal["deformer", "matrix"] = "deformer",
 ):
     """Create a ribbon between two specified joints in 3D space.
 
     Args:
         start (str): The name of the starting joint of the ribbon.
         end (str): The name of the end joint of the ribbon.
+        backend (Literal["deformer", "matrix"]): Deform a surface or drive the joints with matrix nodes, see ribbon.
 
     Returns:
         tuple: A tuple containing the two controllers (ctrl_a, ctrl_b) of the created ribbon.
@@ -243,7 +330,7 @@ def bone_ribbon(
     ribbon_name = f"ribbon_{limb_name}"
 
     ctrl_global, ctrl_a, ctrl_b, surface, grp_rivets = ribbon(
-        sub=sub, name=ribbon_name, color=color, base_translate=base_translate
+        sub=sub, name=ribbon_name, color=color, base_translate=base_translate, backend=backend
     )
 
     # set ribbon scale
@@ -427,6 +514,7 @@ def preserve_control(
     return preserve_ctrl
 
 
+@profile
 def limb_ribbon(
     ik_start: str,
     ik_mid: str,
@@ -435,15 +523,21 @@ def limb_ribbon(
     preserve_match_rotation: bool = False,
     color: str = "yellow",
     sub: int = 5,
+    backend: Literal["deformer", "matrix"] = "deformer",
 ):
-    """ """
+    """Create the ribbons of a limb joined by a preserve control.
+
+    Args:
+        backend (Literal["deformer", "matrix"]): Deform the ribbon surfaces or drive the joints with matrix nodes,
+            see ribbon. limb_ribbon_assemble keeps the deformers, its slide needs the attached surfaces.
+    """
 
     # create ribbons
     ctrl_start_a, ctrl_end_a, scale_factor, _, _ = bone_ribbon(
-        ik_start, ik_mid, orient=orient, color=color, sub=sub
+        ik_start, ik_mid, orient=orient, color=color, sub=sub, backend=backend
     )
     ctrl_start_b, ctrl_end_b, _, _, _ = bone_ribbon(
-        ik_mid, ik_end, orient=orient, color=color, sub=sub
+        ik_mid, ik_end, orient=orient, color=color, sub=sub, backend=backend
     )
     matrix.matrix_constraint(ik_start, ctrl_start_a, t=1, mo=1)
     matrix.matrix_constraint(ik_end, ctrl_end_b, t=1, mo=1)
@@ -860,3 +954,39 @@ def assemble_ribbon(
         cmds.connectAttr(f"{switch_node}.{at_switch}", f"{sine_handle}.{at_sine}")
 
     return ribbon_assemble
+
+
+def _benchmark_limb_ribbons(limbs: int = 4, sub: int = 5, frames: int = 100) -> dict:
+    """Compare the node count and playback speed of the deformer and matrix limb ribbons on animated limbs.
+
+    Opens a new scene for each backend and builds limb_ribbon on several three joint chains, see benchmark_builds.
+
+    Returns:
+        dict: Number of created nodes and played frames per second for each backend.
+    """
+
+    chains = []
+
+    def build(backend: str):
+        chains.clear()
+        for limb in range(limbs):
+            side = "L" if limb % 2 == 0 else "R"
+            x = 2.0 if side == "L" else -2.0
+            height = 10.0 * (limb // 2)
+            cmds.select(clear=True)
+            chain = [
+                cmds.joint(name=f"ik_{part}{limb}_{side}", position=(x * (j + 1), height, -j * 0.2))
+                for j, part in enumerate(("start", "mid", "end"))
+            ]
+            cmds.joint(chain[0], edit=True, orientJoint="xyz", secondaryAxisOrient="yup", children=True)
+            limb_ribbon(*chain, sub=sub, backend=backend)
+            chains.append(chain)
+
+    def animate(frames: int):
+        for start, mid, _ in chains:
+            cmds.setKeyframe(start, attribute="rotateZ", time=1, value=0)
+            cmds.setKeyframe(start, attribute="rotateZ", time=frames, value=40)
+            cmds.setKeyframe(mid, attribute="rotateY", time=1, value=0)
+            cmds.setKeyframe(mid, attribute="rotateY", time=frames, value=-60)
+
+    return benchmark_builds(("deformer", "matrix"), build, animate=animate, frames=frames)
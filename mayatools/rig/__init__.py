@@ -27,4 +27,13 @@ from .blendshape import (
 from .tools import (
     rivet_geo,
     create_blendshapes
+)
+from .graph_optimize import (
+    graph_snapshot,
+    evaluation_time,
+    find_duplicates,
+    find_identity_picks,
+    find_round_trips,
+    find_unused,
+    optimize_graph
 )
\ No newline at end of file
@@ -1,13 +1,7 @@
 from ...utils.imports import *
 
-from .. import constants_maya, curve, display, joint, offset, tools
-
-reload(constants_maya)
-reload(curve)
-reload(display)
-reload(joint)
-reload(offset)
-reload(tools)
+from .. import curve, display, joint, offset, tools
+
 from ..constants_maya import *
 
 
@@ -83,7 +77,9 @@ def cartoon_eyelid(eye_geo: str, edge: list, dir: str, world_up_object: str):
 
     # Locators
     cv_num = curve.get_curve_vertex_count(curve_)
-    locators = curve.loc_on_curve(curve_, cv_num, name=f"{LOC}_{EYELID}_{dir}_{SIDE}")
+    locators = curve.loc_on_curve(
+        curve_, cv_num, name=f"{LOC}_{EYELID}_{dir}_{SIDE}", weights=True
+    )
     cmds.parent(locators, grp_loc)
 
     # find eye center
@@ -1,10 +1,6 @@
 from ...utils.imports import *
-from .. import constants_maya, curve, tools, rivet
+from .. import curve, tools, rivet
 
-reload(constants_maya)
-reload(curve)
-reload(tools)
-reload(rivet)
 from ..constants_maya import SHOW
 
 
@@ -0,0 +1,315 @@
+import time
+
+from ...utils.imports import *
+
+# node types the optimizer is allowed to merge, bypass and delete
+OPTIMIZED_TYPES = ("multMatrix", "pickMatrix", "decomposeMatrix", "composeMatrix", "vectorProduct")
+
+# local attributes that change the output of a node, compared when looking for duplicates
+SETTINGS = {
+    "multMatrix": (),
+    "pickMatrix": ("useTranslate", "useRotate", "useScale", "useShear"),
+    "decomposeMatrix": ("inputRotateOrder",),
+    "composeMatrix": (
+        "inputTranslate",
+        "inputRotate",
+        "inputScale",
+        "inputShear",
+        "inputQuat",
+        "useEulerRotation",
+        "inputRotateOrder",
+    ),
+    "vectorProduct": ("operation", "input1", "input2", "matrix", "normalizeOutput"),
+}
+
+def graph_snapshot() -> dict:
+    """Count the nodes of the scene and the nodes of each optimized type."""
+
+    snapshot = {"nodes": len(cmds.ls())}
+    for node_type in OPTIMIZED_TYPES:
+        snapshot[node_type] = len(cmds.ls(type=node_type))
+    return snapshot
+
+
+def evaluation_time(frames: int = 24) -> float:
+    """Average time in seconds to evaluate the world matrices of every transform over a range of frames."""
+
+    plugs = [f"{node}.worldMatrix[0]" for node in cmds.ls(type="transform")]
+    if not plugs:
+        return 0.0
+
+    current = cmds.currentTime(query=True)
+    start = time.perf_counter()
+    for frame in range(1, frames + 1):
+        cmds.currentTime(frame, update=False)
+        cmds.dgeval(plugs)
+    duration = (time.perf_counter() - start) / frames
+    cmds.currentTime(current, update=False)
+
+    return duration
+
+
+def _inputs(node: str) -> dict:
+    """Source plug of each connected input attribute of a node, keyed by attribute path."""
+
+    connections = cmds.listConnections(node, source=True, destination=False, plugs=True, connections=True) or []
+    return {destination.split(".", 1)[1]: source for destination, source in zip(connections[::2], connections[1::2])}
+
+
+def _outputs(node: str) -> list:
+    """Connected (source plug, destination plug) pairs leaving a node."""
+
+    connections = cmds.listConnections(node, source=False, destination=True, plugs=True, connections=True) or []
+    return list(zip(connections[::2], connections[1::2]))
+
+
+def _reroute(outputs: list, source: str):
+    """Connect every destination of a list of output pairs from the same attribute on another node."""
+
+    for output, destination in outputs:
+        cmds.connectAttr(f"{source}.{output.split('.', 1)[1]}", destination, force=True)
+
+
+def _is_connected(inputs: dict, attr: str) -> bool:
+    """Check if an attribute, one of its children or one of its elements is connected."""
+
+    children = {f"{attr}{axis}" for axis in "XYZxyz"}
+    return any(path == attr or path in children or path.startswith((f"{attr}[", f"{attr}.")) for path in inputs)
+
+
+def _rounded(value, digits: int = 6):
+    if isinstance(value, (list, tuple)):
+        return tuple(_rounded(item, digits) for item in value)
+    return round(value, digits) if isinstance(value, float) else value
+
+
+def _signature(node: str, node_type: str) -> tuple:
+    """Describe what a node computes : its input connections and its unconnected settings."""
+
+    inputs = _inputs(node)
+    connected = tuple(sorted(inputs.items()))
+
+    values = []
+    for attr in SETTINGS[node_type]:
+        if not _is_connected(inputs, attr):
+            values.append((attr, _rounded(cmds.getAttr(f"{node}.{attr}"))))
+
+    if node_type == "multMatrix":
+        for index in cmds.getAttr(f"{node}.matrixIn", multiIndices=True) or []:
+            if f"matrixIn[{index}]" not in inputs:
+                values.append((index, _rounded(cmds.getAttr(f"{node}.matrixIn[{index}]"))))
+
+    return connected, tuple(values)
+
+
+def _scoped(nodes: list, node_type) -> list:
+    """Nodes of a type, or of a tuple of types, among nodes. All the nodes of the scene when nodes is None, none when
+    nodes is empty, cmds.ls would list the whole scene for an empty list."""
+
+    if nodes is None:
+        return cmds.ls(type=node_type)
+    return cmds.ls(nodes, type=node_type) if nodes else []
+
+
+def find_duplicates(nodes: list = None) -> list:
+    """Find the optimized nodes computing the same thing as another node of their type.
+
+    Args:
+        nodes (list): Nodes to consider. All the nodes of the optimized types when None.
+
+    Returns:
+        list: (kept node, duplicate node) pairs.
+    """
+
+    pairs = []
+    for node_type in OPTIMIZED_TYPES:
+        seen = {}
+        for node in _scoped(nodes, node_type):
+            signature = _signature(node, node_type)
+            if not signature[0]:
+                continue
+            if signature in seen:
+                pairs.append((seen[signature], node))
+            else:
+                seen[signature] = node
+    return pairs
+
+
+def find_identity_picks(nodes: list = None) -> list:
+    """Find the pickMatrix nodes keeping every component of a connected input matrix."""
+
+    identities = []
+    for node in _scoped(nodes, "pickMatrix"):
+        flags = [cmds.getAttr(f"{node}.{attr}") for attr in SETTINGS["pickMatrix"]]
+        if all(flags) and "inputMatrix" in _inputs(node):
+            identities.append(node)
+    return identities
+
+
+def _channel_source(inputs: dict, channel: str, source_channel: str) -> str:
+    """Get the node driving a whole compound channel from the matching compound channel, with compound or child
+    connections."""
+
+    if channel in inputs:
+        node, _, attr = inputs[channel].partition(".")
+        return node if attr == source_channel else None
+
+    nodes = set()
+    for axis in "XYZ":
+        source = inputs.get(f"{channel}{axis}")
+        if not source or source.partition(".")[2] != f"{source_channel}{axis}":
+            return None
+        nodes.add(source.partition(".")[0])
+    return nodes.pop() if len(nodes) == 1 else None
+
+
+def find_round_trips(nodes: list = None, tolerance: float = 1e-6) -> list:
+    """Find the composeMatrix nodes rebuilding the input matrix of a decomposeMatrix.
+
+    Translate, rotate or quaternion, and scale must come from the same decomposeMatrix with matching rotate orders.
+    The shear must come from it too, or be left unconnected and be zero on both nodes.
+
+    Returns:
+        list: (decomposeMatrix, composeMatrix) pairs.
+    """
+
+    round_trips = []
+    for compose in _scoped(nodes, "composeMatrix"):
+        inputs = _inputs(compose)
+
+        if cmds.getAttr(f"{compose}.useEulerRotation"):
+            rotate_source = _channel_source(inputs, "inputRotate", "outputRotate")
+        else:
+            node, _, attr = inputs.get("inputQuat", "").partition(".")
+            rotate_source = node if attr == "outputQuat" else None
+
+        sources = {
+            rotate_source,
+            _channel_source(inputs, "inputTranslate", "outputTranslate"),
+            _channel_source(inputs, "inputScale", "outputScale"),
+        }
+        if len(sources) != 1 or None in sources:
+            continue
+        decompose = sources.pop()
+
+        if cmds.nodeType(decompose) != "decomposeMatrix" or "inputMatrix" not in _inputs(decompose):
+            continue
+        if cmds.getAttr(f"{compose}.inputRotateOrder") != cmds.getAttr(f"{decompose}.inputRotateOrder"):
+            continue
+
+        if _channel_source(inputs, "inputShear", "outputShear") != decompose:
+            if _is_connected(inputs, "inputShear"):
+                continue
+            # shear left unconnected, only a zero shear on both sides makes the round trip exact
+            shears = cmds.getAttr(f"{compose}.inputShear")[0] + cmds.getAttr(f"{decompose}.outputShear")[0]
+            if any(abs(value) > tolerance for value in shears):
+                continue
+
+        round_trips.append((decompose, compose))
+
+    return round_trips
+
+
+def find_unused(nodes: list = None) -> list:
+    """Find the optimized nodes without any output connection, such as vectorProduct nodes left unread. Values read
+    by expressions or scripts through getAttr are not connections, such nodes must be excluded from the nodes."""
+
+    candidates = _scoped(nodes, OPTIMIZED_TYPES)
+    return [node for node in candidates if not _outputs(node)]
+
+
+def optimize_graph(nodes: list = None, dry_run: bool = False, frames: int = 24) -> dict:
+    """Collapse the redundant matrix and utility nodes of a built rig.
+
+    The passes are repeated until nothing changes, as each one can expose work for the others :
+        - duplicate nodes fed by the same inputs with the same settings are merged into one
+        - pickMatrix nodes keeping every component are bypassed
+        - decomposeMatrix to composeMatrix round trips are bypassed
+        - nodes without any output connection are deleted
+
+    Only the OPTIMIZED_TYPES nodes are touched. The whole optimization is a single undo chunk.
+
+    Args:
+        nodes (list): Nodes to optimize. All the nodes of the optimized types when None.
+        dry_run (bool): Only report what would be optimized.
+        frames (int): Number of frames evaluated to time the rig, no timing when 0.
+
+    Returns:
+        dict: Scene snapshots and evaluation times before and after, and the number of nodes removed by each pass.
+    """
+
+    report = {
+        "before": graph_snapshot(),
+        "removed": dict.fromkeys(("duplicates", "identity_picks", "round_trips", "unused"), 0),
+    }
+    if frames:
+        report["before"]["evaluation_time"] = evaluation_time(frames)
+
+    if dry_run:
+        report["removed"] = {
+            "duplicates": len(find_duplicates(nodes)),
+            "identity_picks": len(find_identity_picks(nodes)),
+            "round_trips": len(find_round_trips(nodes)),
+            "unused": len(find_unused(nodes)),
+        }
+        om.MGlobal.displayInfo(f"Graph optimization (dry run) : {report['removed']}")
+        return report
+
+    cmds.undoInfo(openChunk=True, chunkName="optimize_graph")
+    try:
+        changed = True
+        while changed:
+            changed = False
+
+            for kept, duplicate in find_duplicates(nodes):
+                if cmds.objExists(kept) and cmds.objExists(duplicate):
+                    _reroute(_outputs(duplicate), kept)
+                    cmds.delete(duplicate)
+                    report["removed"]["duplicates"] += 1
+                    changed = True
+
+            for pick in find_identity_picks(nodes):
+                source = _inputs(pick)["inputMatrix"]
+                for _, destination in _outputs(pick):
+                    cmds.connectAttr(source, destination, force=True)
+                cmds.delete(pick)
+                report["removed"]["identity_picks"] += 1
+                changed = True
+
+            for decompose, compose in find_round_trips(nodes):
+                if cmds.objExists(decompose) and cmds.objExists(compose):
+                    source = _inputs(decompose)["inputMatrix"]
+                    for _, destination in _outputs(compose):
+                        cmds.connectAttr(source, destination, force=True)
+                    cmds.delete(compose)
+                    report["removed"]["round_trips"] += 1
+                    changed = True
+
+            unused = find_unused(nodes)
+            if unused:
+                cmds.delete(unused)
+                report["removed"]["unused"] += len(unused)
+                changed = True
+
+            # a scope emptied by the passes is done, it must not fall back to the whole scene
+            if nodes is not None:
+                nodes = [node for node in nodes if cmds.objExists(node)]
+                if not nodes:
+                    break
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+    report["after"] = graph_snapshot()
+    if frames:
+        report["after"]["evaluation_time"] = evaluation_time(frames)
+
+    before, after = report["before"], report["after"]
+    timing = (
+        f", {before['evaluation_time'] * 1000:.2f} ms -> {after['evaluation_time'] * 1000:.2f} ms per frame"
+        if frames
+        else ""
+    )
+    om.MGlobal.displayInfo(
+        f"Graph optimized : {before['nodes']} -> {after['nodes']} nodes{timing}, removed {report['removed']}"
+    )
+    return report
@@ -1,27 +1,15 @@
 from ...utils.imports import *
 from .. import (
-    constants_maya,
     attribute,
     curve,
     display,
-    joint,
+    expression,
     mathfuncs,
     matrix,
     offset,
     tools,
-    rivet,
 )
 
-reload(constants_maya)
-reload(attribute)
-reload(curve)
-reload(display)
-reload(joint)
-reload(mathfuncs)
-reload(matrix)
-reload(offset)
-reload(tools)
-reload(rivet)
 from ..constants_maya import *
 
 
@@ -211,6 +199,7 @@ def stretch_limb(
     global_move: str,
     jnts: list,
     switch_attribute: str = "",
+    native: bool = True,
 ):
     """Apply stretch functionality to a limb.
 
@@ -219,6 +208,8 @@ def stretch_limb(
         loc_start_parent (str): Name of the parent locator for the start position.
         global_move (str): Name of the global move transform node.
         jnts (List[str]): List of names of joints in the limb.
+        switch_attribute (str): Attribute enabling the stretch when it is 1, such as the ik fk switch.
+        native (bool): Compile the stretch expression into floatMath and condition nodes.
 
     Note:
         - The `ctrl` and the last joint in `jnts` must have the same pivot.
@@ -282,7 +273,7 @@ def stretch_limb(
         $stretch = 1;
     }}
 
-    if ({ctrl}.{at_stretch} == 1 && {switch_attribute} == 1){{
+    if ({ctrl}.{at_stretch} == 1{f" && {switch_attribute} == 1" if switch_attribute else ""}){{
         $stretch = $stretch;
     }}
     
@@ -295,7 +286,10 @@ def stretch_limb(
     {jnt_end}.sx = $stretch;
     """
 
-    cmds.expression(string=exp_string, name=f"Exp_Stretch_{start_name}")
+    if native:
+        expression.compile_expression(exp_string, name=f"Stretch_{start_name}")
+    else:
+        cmds.expression(string=exp_string, name=f"Exp_Stretch_{start_name}")
 
     cmds.select(clear=True)
     om.MGlobal.displayInfo(f"Stretch done on : {jnt_start} {jnt_mid} {jnt_end}.")
@@ -1,6 +1,5 @@
 from ...utils.imports import *
 from .. import (
-    constants_maya,
     attribute,
     curve,
     display,
@@ -12,16 +11,6 @@ from .. import (
     rivet,
 )
 
-reload(constants_maya)
-reload(attribute)
-reload(curve)
-reload(display)
-reload(joint)
-reload(mathfuncs)
-reload(matrix)
-reload(offset)
-reload(tools)
-reload(rivet)
 from ..constants_maya import *
 
 
@@ -1,8 +1,17 @@
 from .rivet_mod import (
     face_to_edges,
+    face_centers,
+    free_names,
+    rivet_locator,
     rivet_mesh_setup,
+    rivet_mesh_batch,
     rivet_mesh,
     rivet_mesh_user,
     connect_rivet,
+    node_type_exists,
+    connect_pin,
+    orig_shape,
+    uv_overlaps,
+    connect_proximity_pin,
     rivet_nurbs
 )
\ No newline at end of file
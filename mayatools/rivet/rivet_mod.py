@@ -1,10 +1,11 @@
+import numpy as np
+
 from ...utils.imports import *
-from .. import constants_maya, attribute, display, tools
+from ...utils.profiler import benchmark_builds
+from ... import mayatools_api as api
+from ...mayatools_api import GraphBuilder
+from .. import attribute, display, tools
 
-reload(constants_maya)
-reload(attribute)
-reload(display)
-reload(tools)
 from ..constants_maya import *
 
 
@@ -18,52 +19,60 @@ def face_to_edges(face: str) -> Tuple[str]:
         Tuple[str]: A tuple containing the names of two non-shared edges.
     """
 
-    edges = cmds.ls(
-        cmds.polyListComponentConversion(face, ff=True, te=True), flatten=True
-    )
+    mesh, face_index = face.split(".")[0], int(re.search(r"\[(\d+)\]", face).group(1))
+    edges = api.getTopology(mesh).oppositeEdges(face_index)
+    if edges:
+        return tuple(f"{mesh}.e[{edge}]" for edge in edges)
 
-    edge_01 = set(
-        cmds.ls(
-            cmds.polyListComponentConversion(edges[0], fe=True, tv=True), flatten=True
-        )
-    )
 
-    for i in range(1, len(edges)):
+def free_names(name: str, count: int) -> list:
+    """Get the first free names numbered from name, such as rivet_01, rivet_02, with a single scene query.
 
-        edge_02 = set(
-            cmds.ls(
-                cmds.polyListComponentConversion(
-                    edges[i], fromEdge=True, toVertex=True
-                ),
-                flatten=True,
-            )
-        )
+    Args:
+        name (str): Base name.
+        count (int): Number of names.
 
-        if not edge_01 & edge_02:
+    Returns:
+        list: The free names.
+    """
 
-            return edges[0], edges[i]
+    used = {node.split("|")[-1] for node in cmds.ls(f"{name}_*")}
 
+    names, i = [], 1
+    while len(names) < count:
+        candidate = f"{name}_{i:02}"
+        if candidate not in used:
+            names.append(candidate)
+        i += 1
 
-def rivet_mesh_setup(
-    name: str, edge_a: str, edge_b: str, size: float = 1.0, col: str = "orange"
-) -> str:
+    return names
 
-    rivet = f"{name}_01"
-    for i in range(2, 100):
-        if cmds.objExists(rivet):
-            rivet = f"{name}_{i:02}"
+
+def rivet_locator(name: str, size: float = 1.0, col: str = "orange") -> str:
+    """Create a mesh rivet locator with the first free name."""
+
+    rivet = free_names(name, 1)[0]
 
     cmds.spaceLocator(n=rivet)
     rivet_shape = cmds.listRelatives(rivet, s=1)[0]
 
-    mesh = edge_a.split(".")[0]
-    shape = cmds.listRelatives(mesh, s=1)[0]
-
     cmds.setAttr(f"{rivet_shape}.localScaleX", size)
     cmds.setAttr(f"{rivet_shape}.localScaleY", size)
     cmds.setAttr(f"{rivet_shape}.localScaleZ", size)
+    cmds.setAttr(f"{rivet_shape}.ihi", 0)
 
     display.color_node(rivet, col)
+    return rivet
+
+
+def rivet_mesh_setup(
+    name: str, edge_a: str, edge_b: str, size: float = 1.0, col: str = "orange"
+) -> str:
+
+    rivet = rivet_locator(name, size, col)
+
+    mesh = edge_a.split(".")[0]
+    shape = cmds.listRelatives(mesh, s=1)[0]
 
     edge_a_num = int(re.sub(r"[^\d]+", "", edge_a))
     edge_b_num = int(re.sub(r"[^\d]+", "", edge_b))
@@ -149,33 +158,249 @@ def rivet_mesh_setup(
     cmds.setAttr(f"{vec_prod}.ihi", 0)
     cmds.setAttr(f"{matrix}.ihi", 0)
     cmds.setAttr(f"{pick_mtx}.ihi", 0)
-    cmds.setAttr(f"{rivet_shape}.ihi", 0)
 
     om.MGlobal.displayInfo(f"{rivet} done.")
     return rivet
 
 
+def face_centers(faces: Union[str, list[str]]) -> Tuple[str, list, list]:
+    """Get the center uv and world position of the faces of one mesh.
+
+    The center uv is the average of the face uvs. The uvs of a face all belong to one shell, so the average stays
+    inside the face across seams, but it only identifies the face when no other shell overlaps it in uv space.
+
+    Returns:
+        Tuple[str, list, list]: Mesh shape path, center (u, v) of each face, None when the mesh has no uvs, and center
+            world position of each face.
+    """
+
+    dag_path, indices = api.componentIndices(faces)
+    has_uvs = om.MFnMesh(dag_path).numUVs() > 0
+    face_it = om.MItMeshPolygon(dag_path)
+
+    uvs, positions = [], []
+    for index in indices:
+        face_it.setIndex(int(index))
+        positions.append(face_it.center(om.MSpace.kWorld))
+        if has_uvs:
+            us, vs = face_it.getUVs()
+            uvs.append((sum(us) / len(us), sum(vs) / len(vs)))
+
+    return dag_path.fullPathName(), uvs if has_uvs else None, positions
+
+
+def _rivet_mesh_network(
+    graph: GraphBuilder, name: str, shape: str, edge_a: int, edge_b: int, size: float = 1.0
+) -> str:
+    """Collect the locator and curveFromMeshEdge, loft and pointOnSurfaceInfo network of a mesh rivet.
+
+    Returns:
+        str: Token of the rivet transform in the graph.
+    """
+
+    rivet = graph.createNode("transform", name)
+    rivet_shape = graph.createNode("locator", f"{name}Shape", parent=rivet)
+    graph.setAttr(f"{rivet_shape}.localScale", size, size, size)
+    graph.setAttr(f"{rivet_shape}.ihi", 0)
+
+    for attr in ("pos_u", "pos_v"):
+        graph.addAttr(
+            rivet,
+            longName=attr,
+            niceName=attr.replace("_", " ").title(),
+            minValue=0.0,
+            maxValue=1.0,
+            defaultValue=0.5,
+            keyable=False,
+            channelBox=True,
+        )
+
+    # nodes
+    curve_01 = graph.createNode("curveFromMeshEdge", f"{name}_{shape.split('|')[-1]}_01")
+    curve_02 = graph.createNode("curveFromMeshEdge", f"{name}_{shape.split('|')[-1]}_02")
+    loft = graph.createNode("loft", f"{name}_loft")
+    posi = graph.createNode("pointOnSurfaceInfo", f"{name}_posInfo")
+    vec_prod = graph.createNode("vectorProduct", f"{name}_vectProd")
+    matrix = graph.createNode("fourByFourMatrix", f"{name}_4by4Mtx")
+    pick_mtx = graph.createNode("pickMatrix", f"{name}_pickMtx")
+
+    # curves & loft
+    for curve, edge, index in ((curve_01, edge_a, 0), (curve_02, edge_b, 1)):
+        graph.setAttr(f"{curve}.edgeIndex[0]", edge)
+        graph.connectAttr(f"{shape}.worldMesh[0]", f"{curve}.inputMesh")
+        graph.connectAttr(f"{curve}.outputCurve", f"{loft}.inputCurve[{index}]")
+
+    graph.setAttr(f"{loft}.uniform", 1)
+    graph.setAttr(f"{loft}.reverseSurfaceNormals", 1)
+
+    # point on surface info & cross product
+    graph.setAttr(f"{posi}.turnOnPercentage", 1)
+    graph.connectAttr(f"{loft}.outputSurface", f"{posi}.inputSurface")
+    graph.connectAttr(f"{rivet}.pos_u", f"{posi}.parameterU")
+    graph.connectAttr(f"{rivet}.pos_v", f"{posi}.parameterV")
+
+    graph.setAttr(f"{vec_prod}.operation", 2)
+    graph.connectAttr(f"{posi}.normal", f"{vec_prod}.input1")
+    graph.connectAttr(f"{posi}.tangentV", f"{vec_prod}.input2")
+
+    # matrix
+    for row, (source, suffixes) in enumerate(
+        (
+            (f"{posi}.normal", "XYZ"),
+            (f"{posi}.tangentV", "xyz"),
+            (f"{vec_prod}.output", "XYZ"),
+            (f"{posi}.position", "XYZ"),
+        )
+    ):
+        for column, suffix in enumerate(suffixes):
+            graph.connectAttr(f"{source}{suffix}", f"{matrix}.in{row}{column}")
+
+    # pick matrix
+    graph.setAttr(f"{pick_mtx}.useScale", 0)
+    graph.setAttr(f"{pick_mtx}.useShear", 0)
+    graph.connectAttr(f"{matrix}.output", f"{pick_mtx}.{INPUT_MTX}")
+    graph.connectAttr(f"{pick_mtx}.{OUTPUT_MTX}", f"{rivet}.{OP_MTX}")
+
+    # historical interest
+    for node in (curve_01, curve_02, loft, posi, vec_prod, matrix, pick_mtx):
+        graph.setAttr(f"{node}.ihi", 0)
+
+    return rivet
+
+
+def rivet_mesh_batch(
+    faces: Union[str, list[str]],
+    name: str = "rivet",
+    size: float = 1.0,
+    col: str = "orange",
+) -> list:
+    """Create loft network rivets on many mesh faces at once.
+
+    The opposite edges of every face come from one pass on the cached topology of its mesh, the rivet names from one
+    scene query, and all the locators and networks are created in a single GraphBuilder commit.
+
+    Args:
+        faces (Union[str, list[str]]): Names of the faces, such as mesh.f[0:999], of one or several meshes.
+        name (str): Base name of the rivets.
+        size (float): Size of the rivets.
+        col (str): Color of the rivets.
+
+    Returns:
+        list: Names of the rivets.
+    """
+
+    # (shape, edge_a, edge_b) of every rivet, the names of all the meshes are allocated at once
+    edges = []
+    for dag_path, face_indices in api.componentIndicesByMesh(faces):
+        shape = dag_path.fullPathName()
+        edge_pairs = api.getTopology(dag_path).oppositeEdgePairs(face_indices)
+
+        triangles = edge_pairs[:, 1] < 0
+        if triangles.any():
+            om.MGlobal.displayWarning(
+                f"{int(triangles.sum())} triangles skipped on {shape}, they have no opposite edges."
+            )
+            edge_pairs = edge_pairs[~triangles]
+
+        edges.extend((shape, edge_a, edge_b) for edge_a, edge_b in edge_pairs.tolist())
+
+    graph = GraphBuilder()
+    rivets = [
+        _rivet_mesh_network(graph, rivet, shape, edge_a, edge_b, size)
+        for rivet, (shape, edge_a, edge_b) in zip(free_names(name, len(edges)), edges)
+    ]
+    names = graph.commit()
+
+    rivets = [names[rivet] for rivet in rivets]
+    display.color_node(rivets, col)
+
+    om.MGlobal.displayInfo(f"{len(rivets)} rivets done on {len({shape for shape, _, _ in edges})} meshes.")
+    return rivets
+
+
 def rivet_mesh(
     faces: Union[str, list[str]],
     name: str = "rivet",
     size: float = 1.0,
     col: str = "orange",
+    backend: Literal["uvPin", "proximityPin", "network"] = "network",
 ):
+    """Create rivets on mesh faces.
+
+    Args:
+        faces (Union[str, list[str]]): Names of the faces, of one or several meshes.
+        name (str): Base name of the rivets.
+        size (float): Size of the rivets.
+        col (str): Color of the rivets.
+        backend (Literal["uvPin", "proximityPin", "network"]): Drive the rivets of each mesh from one uvPin node at
+            the face center uvs, from one proximityPin node at the face centers, or give each rivet its own
+            curveFromMeshEdge and loft network. uvPin falls back to proximityPin when the mesh has no uvs or when the
+            faces overlap other faces in uv space, proximityPin falls back to the network when the mesh has no Orig
+            shape, and both fall back to the network when the pin nodes are not available.
+    """
 
     faces = tools.ensure_list(faces)
 
-    for face in faces:
-        edge_01, edge_02 = face_to_edges(face)
-        rivet_mesh_setup(name, edge_01, edge_02, size=size, col=col)
+    if backend != "network" and not node_type_exists(backend):
+        om.MGlobal.displayWarning(f"{backend} is not available, rivets fall back to the loft network.")
+        backend = "network"
+
+    if backend == "network":
+        rivet_mesh_batch(faces, name, size, col)
+        return
 
+    for dag_path, indices in api.componentIndicesByMesh(faces):
+        shape = dag_path.fullPathName()
+        _rivet_mesh_pin([f"{shape}.f[{index}]" for index in indices], name, size, col, backend)
 
-def rivet_mesh_user(name: str = "rivet", size: float = 1.0, col: str = "orange"):
+
+def _rivet_mesh_pin(faces: list, name: str, size: float, col: str, backend: Literal["uvPin", "proximityPin"]):
+    """Create the rivets of the faces of one mesh, driven by a single pin node."""
+
+    shape, uvs, positions = face_centers(faces)
+    if backend == "uvPin" and uvs is None:
+        om.MGlobal.displayWarning(f"{shape} has no uvs, rivets use a proximityPin.")
+        backend = "proximityPin"
+    elif backend == "uvPin" and uv_overlaps(faces):
+        om.MGlobal.displayWarning(f"Faces of {shape} overlap in uv space, rivets use a proximityPin.")
+        backend = "proximityPin"
+
+    if backend == "proximityPin" and not orig_shape(shape):
+        om.MGlobal.displayWarning(f"{shape} has no Orig shape, rivets fall back to the loft network.")
+        rivet_mesh_batch(faces, name, size, col)
+        return
+
+    rivets = []
+    for rivet in free_names(name, len(positions)):
+        cmds.spaceLocator(n=rivet)
+        rivets.append(rivet)
+    display.loc_size(rivets, size)
+    display.color_node(rivets, col)
+
+    if backend == "uvPin":
+        connect_pin(shape, rivets, uvs, "uv", name=f"{rivets[0]}_uvPin")
+    else:
+        matrices = [
+            om.MTransformationMatrix().setTranslation(om.MVector(position), om.MSpace.kWorld).asMatrix()
+            for position in positions
+        ]
+        connect_proximity_pin(shape, rivets, matrices, name=f"{rivets[0]}_proximityPin")
+
+    om.MGlobal.displayInfo(f"{len(rivets)} rivets done on {shape}.")
+
+
+def rivet_mesh_user(
+    name: str = "rivet",
+    size: float = 1.0,
+    col: str = "orange",
+    backend: Literal["uvPin", "proximityPin", "network"] = "network",
+):
 
     selection = cmds.ls(selection=True)
     faces = cmds.filterExpand(selection, selectionMask=34)
 
     if faces:
-        rivet_mesh(faces, name=name, size=size, col=col)
+        rivet_mesh(faces, name=name, size=size, col=col, backend=backend)
 
 
 def connect_rivet(
@@ -191,78 +416,90 @@ def connect_rivet(
     TAN = uv.capitalize()
 
     attribute.sep_cb(node)
-    if uv in ["u", "v"]:
-        cmds.addAttr(
-            node, at="float", ln=f"parameter_{uv}", min=0, max=1, dv=parameter, k=1
-        )
-        cmds.setAttr(f"{node}.parameter_{uv}", cb=1, k=0)
-
-    else:
-        cmds.addAttr(
-            node, at="float", ln=f"parameter_u", min=0, max=1, dv=parameter, k=1
-        )
-        cmds.setAttr(f"{node}.parameter_u", cb=1, k=0)
-        cmds.addAttr(
-            node, at="float", ln=f"parameter_v", min=0, max=1, dv=parameter, k=1
-        )
-        cmds.setAttr(f"{node}.parameter_v", cb=1, k=0)
+    rivet = api.Node(node)
+
+    # every attribute, node and connection goes through this modifier, put on the undo queue once done
+    modifier = om.MDGModifier()
+    rivet.addAttributes(
+        [
+            dict(
+                long_name=f"parameter_{axis}",
+                default_value=parameter,
+                min_value=0,
+                max_value=1,
+                keyable=False,
+                channel_box=True,
+            )
+            for axis in ((uv,) if uv in ("u", "v") else ("u", "v"))
+        ],
+        modifier,
+    )
 
     # nodes
-    posi = cmds.createNode("pointOnSurfaceInfo", n=f"{node}_posInfo")
-    vec_prod = cmds.createNode("vectorProduct", n=f"{node}_vectProd")
-    matrix = cmds.createNode("fourByFourMatrix", n=f"{node}_4by4Mtx")
-    pick_mtx = cmds.createNode("pickMatrix", n=f"{node}_pickMtx")
+    posi = api.Node.create("pointOnSurfaceInfo", f"{node}_posInfo", modifier)
+    vec_prod = api.Node.create("vectorProduct", f"{node}_vectProd", modifier)
+    matrix = api.Node.create("fourByFourMatrix", f"{node}_4by4Mtx", modifier)
+    pick_mtx = api.Node.create("pickMatrix", f"{node}_pickMtx", modifier)
 
     # set and connect attributes
     # point on surface info
-    cmds.setAttr(f"{posi}.turnOnPercentage", 1)
+    posi.set("turnOnPercentage", 1, modifier=modifier)
 
-    cmds.connectAttr(f"{surface_shape}.worldSpace[0]", f"{posi}.inputSurface")
+    api.Node(surface_shape).connect("worldSpace[0]", posi, "inputSurface", modifier=modifier)
 
     # cross product
-    cmds.setAttr(f"{vec_prod}.operation", 2)
+    vec_prod.set("operation", 2, modifier=modifier)
 
-    cmds.connectAttr(f"{posi}.normal", f"{vec_prod}.input1")
-    cmds.connectAttr(f"{posi}.tangent{TAN}", f"{vec_prod}.input2")
+    posi.connect("normal", vec_prod, "input1", modifier=modifier)
+    posi.connect(f"tangent{TAN}", vec_prod, "input2", modifier=modifier)
 
     # matrix
-    cmds.connectAttr(f"{posi}.normalX", f"{matrix}.in00")
-    cmds.connectAttr(f"{posi}.normalY", f"{matrix}.in01")
-    cmds.connectAttr(f"{posi}.normalZ", f"{matrix}.in02")
-
-    cmds.connectAttr(f"{posi}.tangent{TAN}x", f"{matrix}.in10")
-    cmds.connectAttr(f"{posi}.tangent{TAN}y", f"{matrix}.in11")
-    cmds.connectAttr(f"{posi}.tangent{TAN}z", f"{matrix}.in12")
-
-    cmds.connectAttr(f"{vec_prod}.outputX", f"{matrix}.in20")
-    cmds.connectAttr(f"{vec_prod}.outputY", f"{matrix}.in21")
-    cmds.connectAttr(f"{vec_prod}.outputZ", f"{matrix}.in22")
-
-    cmds.connectAttr(f"{posi}.positionX", f"{matrix}.in30")
-    cmds.connectAttr(f"{posi}.positionY", f"{matrix}.in31")
-    cmds.connectAttr(f"{posi}.positionZ", f"{matrix}.in32")
+    for row, (source, attributes) in enumerate(
+        (
+            (posi, ("normalX", "normalY", "normalZ")),
+            (posi, (f"tangent{TAN}x", f"tangent{TAN}y", f"tangent{TAN}z")),
+            (vec_prod, ("outputX", "outputY", "outputZ")),
+            (posi, ("positionX", "positionY", "positionZ")),
+        )
+    ):
+        for column, source_attribute in enumerate(attributes):
+            source.connect(source_attribute, matrix, f"in{row}{column}", modifier=modifier)
 
     # pick matrix
-    cmds.setAttr(f"{pick_mtx}.useScale", 0)
-    cmds.setAttr(f"{pick_mtx}.useShear", 0)
+    pick_mtx.set("useScale", 0, modifier=modifier)
+    pick_mtx.set("useShear", 0, modifier=modifier)
 
-    cmds.connectAttr(f"{matrix}.output", f"{pick_mtx}.{INPUT_MTX}")
+    matrix.connect("output", pick_mtx, INPUT_MTX, modifier=modifier)
 
     # node
-    cmds.connectAttr(f"{pick_mtx}.{OUTPUT_MTX}", f"{node}.{OP_MTX}")
+    pick_mtx.connect(OUTPUT_MTX, rivet, OP_MTX, modifier=modifier)
 
     # set node position
     if uv == "u":
-        cmds.connectAttr(f"{node}.parameter_u", f"{posi}.parameterU")
-        cmds.setAttr(f"{posi}.parameterV", 0.5)
+        rivet.connect("parameter_u", posi, "parameterU", modifier=modifier)
+        posi.set("parameterV", 0.5, modifier=modifier)
 
     elif uv == "v":
-        cmds.connectAttr(f"{node}.parameter_v", f"{posi}.parameterV")
-        cmds.setAttr(f"{posi}.parameterU", 0.5)
+        rivet.connect("parameter_v", posi, "parameterV", modifier=modifier)
+        posi.set("parameterU", 0.5, modifier=modifier)
 
     else:
-        cmds.connectAttr(f"{node}.parameter_u", f"{posi}.parameterU")
-        cmds.connectAttr(f"{node}.parameter_v", f"{posi}.parameterV")
+        rivet.connect("parameter_u", posi, "parameterU", modifier=modifier)
+        rivet.connect("parameter_v", posi, "parameterV", modifier=modifier)
+
+    # historical interest
+    for rivet_node in (posi, vec_prod, matrix, pick_mtx):
+        rivet_node.set("ihi", 0, modifier=modifier)
+
+    modifier.doIt()
+    api.modifierUndo(modifier)
+    _rivet_extras(node, jnt, delete_shape)
+
+    return posi.name, vec_prod.name, matrix.name, pick_mtx.name
+
+
+def _rivet_extras(node: str, jnt: bool = False, delete_shape: bool = False):
+    """Create the bind joint of a rivet and delete its shape."""
 
     # create joints
     if jnt:
@@ -275,13 +512,167 @@ def connect_rivet(
         loc_shape = cmds.listRelatives(node, shapes=True)[0]
         cmds.delete(loc_shape)
 
-    # historical interest
-    cmds.setAttr(f"{posi}.ihi", 0)
-    cmds.setAttr(f"{vec_prod}.ihi", 0)
-    cmds.setAttr(f"{matrix}.ihi", 0)
-    cmds.setAttr(f"{pick_mtx}.ihi", 0)
 
-    return posi, vec_prod, matrix, pick_mtx
+def node_type_exists(node_type: str) -> bool:
+    """Check if a node type is available in this Maya version, uvPin and proximityPin coming with Maya 2020."""
+
+    return node_type in cmds.allNodeTypes()
+
+
+def connect_pin(
+    geometry_shape: str,
+    nodes: list,
+    coordinates: list,
+    uv: Literal["u", "v", "uv"] = "v",
+    jnt: bool = False,
+    delete_shape: bool = False,
+    name: str = None,
+) -> str:
+    """Drive several nodes from a single uvPin node on a NURBS surface or a mesh.
+
+    Each node gets the parameter attributes of connect_rivet, driving its coordinate on the pin, and receives its
+    pin output matrix in its offsetParentMatrix. The pin axes reproduce the pointOnSurfaceInfo network : X along the
+    normal and Y along the tangent of the uv direction.
+
+    Args:
+        geometry_shape (str): Name of the NURBS surface or mesh shape.
+        nodes (list): Names of the nodes to drive.
+        coordinates (list): (u, v) coordinate of each node, normalized parameters on surfaces, uvs on meshes.
+        uv (Literal["u", "v", "uv"]): Coordinates exposed as parameter attributes, the others stay fixed.
+        jnt (bool): Create a bind joint under each node.
+        delete_shape (bool): Delete the shape of each node.
+        name (str): Name of the uvPin node.
+
+    Returns:
+        str: Name of the uvPin node.
+    """
+
+    shape = api.Node(geometry_shape)
+    is_mesh = shape.object.hasFn(om.MFn.kMesh)
+
+    # every attribute, node and connection goes through this modifier, put on the undo queue once done
+    modifier = om.MDGModifier()
+    pin = api.Node.create("uvPin", name or f"{geometry_shape}_uvPin", modifier)
+
+    shape.connect("worldMesh[0]" if is_mesh else "worldSpace[0]", pin, "deformedGeometry", modifier=modifier)
+    if not is_mesh:
+        pin.set("normalizedIsoParms", 1, modifier=modifier)
+
+    # normal on X, tangent U on Y for u rivets, on -Z for v rivets so the tangent V lands on Y
+    pin.set("normalAxis", 0, modifier=modifier)
+    pin.set("tangentAxis", 1 if uv == "u" else 5, modifier=modifier)
+
+    for i, (node, (u, v)) in enumerate(zip(nodes, coordinates)):
+        attribute.sep_cb(node)
+        rivet = api.Node(node)
+        # normalized parameters on surfaces, mesh uvs are not bound to 0-1, such as udim tiles
+        rivet.addAttributes(
+            [
+                dict(
+                    long_name=f"parameter_{axis}",
+                    default_value=value,
+                    min_value=None if is_mesh else 0,
+                    max_value=None if is_mesh else 1,
+                    keyable=False,
+                    channel_box=True,
+                )
+                for axis, value in (("u", u), ("v", v))
+                if axis in uv
+            ],
+            modifier,
+        )
+
+        for axis, value in (("u", u), ("v", v)):
+            coordinate = f"coordinate[{i}].coordinate{axis.upper()}"
+            if axis in uv:
+                rivet.connect(f"parameter_{axis}", pin, coordinate, modifier=modifier)
+            else:
+                pin.set(coordinate, value, modifier=modifier)
+
+        pin.connect(f"outputMatrix[{i}]", rivet, OP_MTX, modifier=modifier)
+
+    pin.set("ihi", 0, modifier=modifier)
+    modifier.doIt()
+    api.modifierUndo(modifier)
+
+    for node in nodes:
+        _rivet_extras(node, jnt, delete_shape)
+
+    return pin.name
+
+
+def orig_shape(mesh_shape: str) -> str:
+    """Get the Orig shape of a deformed mesh, the intermediate shape under its transform, None without deformer."""
+
+    transform = cmds.listRelatives(mesh_shape, parent=True, fullPath=True)[0]
+    for shape in cmds.listRelatives(transform, shapes=True, fullPath=True) or []:
+        if cmds.getAttr(f"{shape}.intermediateObject"):
+            return shape
+
+
+def uv_overlaps(faces: Union[str, list[str]]) -> bool:
+    """Check if mesh faces overlap other faces of their mesh in uv space, where a uv no longer identifies a face."""
+
+    dag_path, indices = api.componentIndices(faces)
+    overlapping = cmds.polyUVOverlap(f"{dag_path.fullPathName()}.f[*]", overlappingComponents=True)
+    if not overlapping:
+        return False
+
+    _, overlapping_indices = api.componentIndices(overlapping)
+    return bool(np.intersect1d(indices, overlapping_indices).size)
+
+
+def connect_proximity_pin(
+    mesh_shape: str,
+    nodes: list,
+    matrices: list,
+    jnt: bool = False,
+    delete_shape: bool = False,
+    name: str = None,
+) -> str:
+    """Drive several nodes from a single proximityPin node on a deformed mesh.
+
+    Each node follows the closest point of the original mesh to its rest matrix. Both geometries are read in world
+    space, like the rest matrices : the Orig shape as original geometry, the mesh as deformed geometry.
+
+    Args:
+        mesh_shape (str): Name of the deformed mesh shape.
+        nodes (list): Names of the nodes to drive.
+        matrices (list): Rest world matrix of each node.
+        jnt (bool): Create a bind joint under each node.
+        delete_shape (bool): Delete the shape of each node.
+        name (str): Name of the proximityPin node.
+
+    Returns:
+        str: Name of the proximityPin node.
+
+    Raises:
+        ValueError: The mesh has no Orig shape, the pins would slide on the deformed mesh.
+    """
+
+    original = orig_shape(mesh_shape)
+    if not original:
+        raise ValueError(f"No Orig shape on {mesh_shape}, the pins would slide on the deformed mesh.")
+
+    # every node and connection goes through this modifier, put on the undo queue once done
+    modifier = om.MDGModifier()
+    pin = api.Node.create("proximityPin", name or f"{mesh_shape}_proximityPin", modifier)
+
+    api.Node(original).connect("worldMesh[0]", pin, "originalGeometry", modifier=modifier)
+    api.Node(mesh_shape).connect("worldMesh[0]", pin, "deformedGeometry", modifier=modifier)
+
+    for i, (node, matrix) in enumerate(zip(nodes, matrices)):
+        pin.set(f"inputMatrix[{i}]", matrix, modifier=modifier)
+        pin.connect(f"outputMatrix[{i}]", api.Node(node), OP_MTX, modifier=modifier)
+
+    pin.set("ihi", 0, modifier=modifier)
+    modifier.doIt()
+    api.modifierUndo(modifier)
+
+    for node in nodes:
+        _rivet_extras(node, jnt, delete_shape)
+
+    return pin.name
 
 
 def rivet_nurbs(
@@ -292,6 +683,7 @@ def rivet_nurbs(
     size: float = 1.0,
     col: str = "orange",
     delete_shape: bool = False,
+    backend: Literal["uvPin", "network"] = "network",
 ) -> str:
     """Create vectorial rivets on a NURBS surface.
 
@@ -304,11 +696,17 @@ def rivet_nurbs(
         jnt (bool): Specifies whether to create joints at the rivet positions.
         size (float): Size of the rivets.
         col (str): Color of the rivets.
+        backend (Literal["uvPin", "network"]): Drive all the rivets from one uvPin node, or give each rivet its own
+            pointOnSurfaceInfo network. Falls back to the network when uvPin is not available.
 
     Returns:
         None
     """
 
+    if backend == "uvPin" and not node_type_exists("uvPin"):
+        om.MGlobal.displayWarning("uvPin is not available, rivets fall back to the pointOnSurfaceInfo network.")
+        backend = "network"
+
     # identify nurbs surface
     if cmds.nodeType(nurbs_surface) == "transform":
         surface = nurbs_surface
@@ -324,6 +722,7 @@ def rivet_nurbs(
     increment = round(1 / rivet_num, 3)
     offset = round(increment * 0.5, 3)
 
+    rivets, coordinates = [], []
     for i in range(1, rivet_num + 1):
         # create rivet
         rivet = f"rivet_{surface}_{i:02}"
@@ -336,9 +735,39 @@ def rivet_nurbs(
         display.loc_size(rivet, size)
 
         parameter = round(increment * i - offset, 3)
-        connect_rivet(rivet, surface_shape, parameter, uv, jnt, delete_shape)
+        if backend == "network":
+            connect_rivet(rivet, surface_shape, parameter, uv, jnt, delete_shape)
+        else:
+            rivets.append(rivet)
+            coordinates.append((parameter, 0.5) if uv == "u" else (0.5, parameter))
+
+    if rivets:
+        connect_pin(surface_shape, rivets, coordinates, uv, jnt, delete_shape, name=f"{surface}_uvPin")
 
     cmds.select(cl=1)
     om.MGlobal.displayInfo(f"Rivets done on {surface}.")
 
     return rivets_grp
+
+
+def _benchmark_rivet_backends(rivet_num: int = 50, frames: int = 100) -> dict:
+    """Compare the node count and playback speed of the rivet backends on an animated surface.
+
+    Opens a new scene for each backend, see benchmark_builds.
+
+    Returns:
+        dict: Number of created nodes and played frames per second for each backend.
+    """
+
+    def setup(frames: int):
+        cmds.nurbsPlane(name="benchmark_surface", axis=(0, 1, 0), width=10, lengthRatio=0.1, u=8, v=1)
+        sine, _ = cmds.nonLinear("benchmark_surface", type="sine", amplitude=0.5)
+        cmds.setKeyframe(sine, attribute="offset", time=1, value=0)
+        cmds.setKeyframe(sine, attribute="offset", time=frames, value=10)
+
+    return benchmark_builds(
+        ("network", "uvPin"),
+        lambda backend: rivet_nurbs("benchmark_surface", "u", rivet_num, backend=backend),
+        setup=setup,
+        frames=frames,
+    )
@@ -1,5 +1,10 @@
 from .skin_mod import (
     find_skin_cluster,
+    get_mesh_dag_path,
+    get_points,
+    index_ranges,
+    vertex_components,
+    get_vertices_side_indices,
     get_vertices_side,
     exclude_skin_side,
     exclude_skin_sides,
@@ -7,5 +12,49 @@ from .skin_mod import (
     copy_skin,
     remove_orig_shapes,
     get_mesh_children,
+    strip_namespace,
+    mesh_key,
+    topology_fingerprint,
+    match_meshes,
     replace_geos
+)
+from .skin_weights import (
+    get_skin_fn,
+    get_skin_shape,
+    get_influence_names,
+    vertex_component,
+    component_indices,
+    get_weights,
+    set_weights,
+    to_csr,
+    from_csr,
+    influence_mask,
+    normalize_weights,
+    zero_weights,
+    stranded_rows,
+    prune_weights
+)
+from .skin_transfer import (
+    PointGrid,
+    get_triangles,
+    closest_point_barycentric,
+    closest_triangle_weights,
+    influence_columns,
+    copy_weights,
+    transfer_weights
+)
+from .skin_file import (
+    write_skin_file,
+    read_skin_file,
+    export_skin,
+    import_skin,
+    import_skins
+)
+from .skin_relax import (
+    vertex_adjacency,
+    neighbour_average,
+    smooth_weights,
+    get_locked_influences,
+    relax_skin,
+    relax_selection
 )
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Skin weight file layout :
+
+    MAGIC (4 bytes) | header size (uint32, little endian) | JSON header | padding | arrays
+
+The header stores the influence names and, for each CSR array (indptr, indices, data), its dtype, shape and byte
+offset. Arrays are aligned on ALIGNMENT bytes so they can be memory mapped without copy.
+"""
+
+import json
+
+import numpy as np
+
+from ...utils.imports import *
+from . import skin_weights
+from .skin_mod import find_skin_cluster, get_mesh_dag_path
+
+MAGIC = b"SKNW"
+VERSION = 1
+ALIGNMENT = 16
+EXTENSION = ".sknw"
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_skin_file(
+    path: str,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    influences: list,
+    **metadata,
+) -> str:
+    """Write CSR skin weights to a skin weight file.
+
+    Influence indices are stored as uint16 when possible and weights as float32.
+
+    Args:
+        path (str): File path.
+        indptr (np.ndarray): Row pointers, one row per vertex.
+        indices (np.ndarray): Influence indices.
+        data (np.ndarray): Weight values.
+        influences (list): Influence names.
+        metadata: Extra JSON serializable values stored in the header, such as the mesh name.
+
+    Returns:
+        str: The file path.
+    """
+
+    index_dtype = np.uint16 if len(influences) <= np.iinfo(np.uint16).max else np.uint32
+    arrays = {
+        "indptr": np.ascontiguousarray(indptr, dtype="<u4" if indptr[-1] <= np.iinfo(np.uint32).max else "<u8"),
+        "indices": np.ascontiguousarray(indices, dtype=np.dtype(index_dtype).newbyteorder("<")),
+        "data": np.ascontiguousarray(data, dtype="<f4"),
+    }
+
+    header = {
+        "version": VERSION,
+        "vertex_count": len(indptr) - 1,
+        "influences": list(influences),
+        "metadata": metadata,
+        "arrays": {},
+    }
+
+    relative_offsets = {}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        relative_offsets[name] = offset
+        offset = _align(offset + array.nbytes)
+
+    # offsets depend on the header size, which depends on the offsets : grow the start until the header fits before it
+    start = 0
+    while True:
+        for name, description in header["arrays"].items():
+            description["offset"] = relative_offsets[name] + start
+        header_bytes = json.dumps(header).encode("utf-8")
+        header_end = _align(len(MAGIC) + 4 + len(header_bytes))
+        if header_end <= start:
+            break
+        start = header_end
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.uint32(len(header_bytes)).astype("<u4").tobytes())
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            padding = header["arrays"][name]["offset"] - file.tell()
+            if padding < 0:
+                raise RuntimeError(f"{name} would be written {-padding} bytes past its offset in {path}")
+            file.write(b"\0" * padding)
+            file.write(array.tobytes())
+
+    return path
+
+
+def read_skin_file(path: str, mmap: bool = True) -> Tuple[dict, np.ndarray, np.ndarray, np.ndarray]:
+    """Read a skin weight file.
+
+    Args:
+        path (str): File path.
+        mmap (bool): Memory map the arrays instead of loading them.
+
+    Returns:
+        Tuple[dict, np.ndarray, np.ndarray, np.ndarray]: Header, row pointers, influence indices and weight values.
+    """
+
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a skin weight file")
+        header_size = int(np.frombuffer(file.read(4), dtype="<u4")[0])
+        header = json.loads(file.read(header_size).decode("utf-8"))
+
+        if header["version"] > VERSION:
+            raise ValueError(f"{path} has an unsupported version : {header['version']}")
+
+        arrays = []
+        for name in ("indptr", "indices", "data"):
+            description = header["arrays"][name]
+            dtype, shape, offset = np.dtype(description["dtype"]), tuple(description["shape"]), description["offset"]
+
+            if not shape[0]:
+                arrays.append(np.zeros(shape, dtype=dtype))
+            elif mmap:
+                arrays.append(np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape))
+            else:
+                file.seek(offset)
+                arrays.append(np.fromfile(file, dtype=dtype, count=shape[0]))
+
+    return (header, *arrays)
+
+
+def export_skin(mesh: str, path: str = None, epsilon: float = 1e-5) -> str:
+    """Export the skinCluster weights of a mesh to a skin weight file.
+
+    Args:
+        mesh (str): Name of the skinned mesh.
+        path (str): File path. Defaults to the mesh name with the .sknw extension in the scene folder.
+        epsilon (float): Weights smaller or equal to epsilon are not stored.
+
+    Returns:
+        str: The file path, None when the mesh has no skinCluster.
+    """
+
+    skin_cluster = find_skin_cluster(mesh)
+    if not skin_cluster:
+        om.MGlobal.displayError(f"No skinCluster found on {mesh}")
+        return
+
+    if path is None:
+        scene_folder = os.path.dirname(cmds.file(query=True, sceneName=True)) or os.getcwd()
+        path = os.path.join(scene_folder, f"{mesh.split('|')[-1].replace(':', '_')}{EXTENSION}")
+
+    weights, influences = skin_weights.get_weights(skin_cluster)
+    skin_weights.prune_weights(weights, epsilon=epsilon)
+    indptr, indices, data = skin_weights.to_csr(weights)
+
+    write_skin_file(
+        path,
+        indptr,
+        indices,
+        data,
+        influences,
+        mesh=mesh,
+        skin_cluster=skin_cluster,
+        max_influences=cmds.skinCluster(skin_cluster, query=True, maximumInfluences=True),
+        skinning_method=cmds.skinCluster(skin_cluster, query=True, skinMethod=True),
+    )
+
+    om.MGlobal.displayInfo(f"Skin exported : {mesh} -> {path} ({len(data)} weights)")
+    return path
+
+
+def _find_influence(name: str) -> str:
+    """Find a scene joint from an influence name, ignoring namespaces when there is no exact match."""
+
+    matches = cmds.ls(name, type="joint") or cmds.ls(f"*:{name.split(':')[-1]}", type="joint")
+    if not matches:
+        matches = cmds.ls(name.split(":")[-1], type="joint")
+    return matches[0] if matches else None
+
+
+def import_skin(mesh: str, path: str) -> str:
+    """Import a skin weight file on a mesh, creating or completing its skinCluster.
+
+    The weights are written in a single call. Influences are matched by name, ignoring namespaces when needed.
+
+    Args:
+        mesh (str): Name of the mesh.
+        path (str): File path.
+
+    Returns:
+        str: Name of the skinCluster.
+    """
+
+    header, indptr, indices, data = read_skin_file(path)
+
+    vertex_count = om.MFnMesh(get_mesh_dag_path(mesh)).numVertices
+    if vertex_count != header["vertex_count"]:
+        om.MGlobal.displayError(
+            f"Vertex count mismatch : {mesh} has {vertex_count} vertices, {path} has {header['vertex_count']}"
+        )
+        return
+
+    file_influences = [_find_influence(name) for name in header["influences"]]
+    missing = [name for name, joint in zip(header["influences"], file_influences) if not joint]
+    if missing:
+        om.MGlobal.displayError(f"Missing influences in the scene : {missing}")
+        return
+
+    metadata = header["metadata"]
+    skin_cluster = find_skin_cluster(mesh)
+
+    if not skin_cluster:
+        skin_cluster = cmds.skinCluster(
+            file_influences,
+            mesh,
+            toSelectedBones=True,
+            maximumInfluences=metadata.get("max_influences", 4),
+            skinMethod=metadata.get("skinning_method", 0),
+            name=metadata.get("skin_cluster", f"{mesh.split('|')[-1]}_skinCluster").split(":")[-1],
+        )[0]
+
+    else:
+        scene_influences = set(cmds.ls(cmds.skinCluster(skin_cluster, query=True, influence=True), long=True))
+        for joint in file_influences:
+            if cmds.ls(joint, long=True)[0] not in scene_influences:
+                cmds.skinCluster(skin_cluster, edit=True, addInfluence=joint, weight=0.0, lockWeights=False)
+
+    influences = cmds.ls(skin_weights.get_influence_names(skin_weights.get_skin_fn(skin_cluster)), long=True)
+    columns = np.array([influences.index(cmds.ls(joint, long=True)[0]) for joint in file_influences], dtype=int)
+
+    weights = skin_weights.from_csr(indptr, columns[indices], data, len(influences))
+    skin_weights.normalize_weights(weights)
+    skin_weights.set_weights(skin_cluster, weights)
+
+    om.MGlobal.displayInfo(f"Skin imported : {path} -> {mesh}")
+    return skin_cluster
+
+
+def import_skins(files: dict) -> dict:
+    """Import several skin weight files.
+
+    Args:
+        files (dict): Skin weight file path for each mesh name.
+
+    Returns:
+        dict: skinCluster name for each mesh name.
+    """
+
+    return {mesh: import_skin(mesh, path) for mesh, path in files.items()}
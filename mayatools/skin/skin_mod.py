@@ -1,4 +1,8 @@
+import numpy as np
+
 from ...utils.imports import *
+from ... import mayatools_api as api
+from . import skin_transfer, skin_weights
 from ..constants_maya import *
 
 
@@ -18,70 +22,159 @@ def find_skin_cluster(mesh):
     return None
 
 
-def get_vertices_side(mesh: str, side: str):
+def get_mesh_dag_path(mesh: str) -> om.MDagPath:
+    """Get the dag path of a mesh shape, from the shape or its transform.
+
+    Intermediate shapes such as Orig shapes are skipped.
+    """
+
+    return api.meshPath(mesh)
+
+
+def get_points(mesh: str, space: int = om.MSpace.kWorld) -> np.ndarray:
+    """Get the positions of all the vertices of a mesh in a single read.
+
+    Args:
+        mesh (str): Name of the mesh or its transform.
+        space (int): om.MSpace constant.
+
+    Returns:
+        np.ndarray: Array of shape (vertex count, 3).
     """
-    Renvoie la liste des sommets du côté spécifié du maillage.
-    :param mesh: Nom du maillage.
-    :param side: Côté souhaité ('L' pour gauche, 'R' pour droite).
-    :return: Liste des sommets du côté spécifié.
+
+    points = om.MFnMesh(get_mesh_dag_path(mesh)).getPoints(space)
+    return np.array(points, dtype=float).reshape(-1, 4)[:, :3]
+
+
+def index_ranges(indices: np.ndarray) -> list:
+    """Compact sorted indices into inclusive (start, end) ranges.
+
+    Example:
+        [0, 1, 2, 5, 7, 8] -> [(0, 2), (5, 5), (7, 8)]
     """
 
-    vertices = cmds.ls(f"{mesh}.vtx[*]", flatten=True)
+    indices = np.asarray(indices, dtype=int)
+    if not indices.size:
+        return []
+
+    breaks = np.flatnonzero(np.diff(indices) != 1)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def vertex_components(mesh: str, indices: np.ndarray) -> list:
+    """Get compact vertex component names such as mesh.vtx[0:120] from vertex indices."""
 
-    # Utiliser une liste de compréhension pour exclure les sommets indésirables
-    vertices = [
-        vtx
-        for vtx in vertices
-        if cmds.xform(vtx, query=True, translation=True, worldSpace=True)[0]
-        not in [0.0, -0.0]
+    return [
+        f"{mesh}.vtx[{start}]" if start == end else f"{mesh}.vtx[{start}:{end}]"
+        for start, end in index_ranges(indices)
     ]
 
-    # Filtrer les sommets en fonction du côté
+
+def get_vertices_side_indices(
+    mesh: str,
+    side: str,
+    axis: Literal["x", "y", "z"] = "x",
+    tolerance: float = 0.0005,
+) -> np.ndarray:
+    """Get the indices of the vertices on one side of a mesh.
+
+    Args:
+        mesh (str): Name of the mesh.
+        side (str): "L" for the negative side of the mirror axis, "R" for the positive side.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        tolerance (float): Vertices closer than this to the mirror plane belong to no side.
+
+    Returns:
+        np.ndarray: Sorted vertex indices.
+    """
+
+    coordinates = get_points(mesh)[:, "xyz".index(axis.lower())]
+
     if side == "L":
-        vertices = [
-            vtx
-            for vtx in vertices
-            if round(
-                cmds.xform(vtx, query=True, translation=True, worldSpace=True)[0], 3
-            )
-            < 0.0
-        ]
+        mask = coordinates < -tolerance
     elif side == "R":
-        vertices = [
-            vtx
-            for vtx in vertices
-            if round(
-                cmds.xform(vtx, query=True, translation=True, worldSpace=True)[0], 3
-            )
-            > 0.0
-        ]
+        mask = coordinates > tolerance
+    else:
+        mask = np.abs(coordinates) > tolerance
+
+    return np.flatnonzero(mask)
+
+
+def get_vertices_side(
+    mesh: str,
+    side: str,
+    axis: Literal["x", "y", "z"] = "x",
+    tolerance: float = 0.0005,
+) -> list:
+    """Get the vertices on one side of a mesh as compact component ranges.
 
-    return vertices
+    Args:
+        mesh (str): Name of the mesh.
+        side (str): "L" for the negative side of the mirror axis, "R" for the positive side.
+        axis (Literal["x", "y", "z"]): Mirror axis.
+        tolerance (float): Vertices closer than this to the mirror plane belong to no side.
+
+    Returns:
+        list: Vertex components such as mesh.vtx[0:120].
+    """
+
+    indices = get_vertices_side_indices(mesh, side, axis, tolerance)
+    return vertex_components(mesh, indices)
 
 
 def exclude_skin_side(side: str, vertices: list):
-    """ """
+    """Zero the weights of the joints matching *side* on vertex components, in a single weight write.
 
-    excluded_joints = cmds.ls(f"*{side}*", type="joint")
-    mesh = vertices[0].split(".")[0]
-    mesh_shape = cmds.listRelatives(mesh, shapes=True)[0]
-    skin_cluster = find_skin_cluster(mesh_shape)
+    Args:
+        side (str): Side letter matched in the influence names, such as "L".
+        vertices (list): Vertex components such as mesh.vtx[0:120].
+    """
 
-    for jnt in excluded_joints:
-        try:
-            cmds.skinPercent(skin_cluster, *vertices, transformValue=[jnt, 0.0])
-            print("zero")
-        except:
-            print("fail")
+    mesh, indices = skin_weights.component_indices(vertices)
+    skin_cluster = find_skin_cluster(mesh)
+    if not skin_cluster:
+        om.MGlobal.displayError(f"No skinCluster found on {mesh}")
+        return
 
+    weights, influences = skin_weights.get_weights(skin_cluster, indices)
+    mask = skin_weights.influence_mask(influences, f"*{side}*")
+    _warn_stranded(mesh, side, indices[skin_weights.stranded_rows(weights, mask)])
+    skin_weights.zero_weights(weights, mask)
+    skin_weights.set_weights(skin_cluster, weights, indices)
 
-def exclude_skin_sides(mesh: str):
-    """ """
 
-    vertices_left = get_vertices_side(mesh, "L")
-    vertices_right = get_vertices_side(mesh, "R")
-    exclude_skin_side("L", vertices_left)
-    exclude_skin_side("R", vertices_right)
+def exclude_skin_sides(mesh: str, axis: Literal["x", "y", "z"] = "x", tolerance: float = 0.0005):
+    """Zero the weights of the L joints on the L side of a mesh and of the R joints on the R side.
+
+    Weights are read and written back once for the whole mesh.
+    """
+
+    skin_cluster = find_skin_cluster(get_mesh_dag_path(mesh).partialPathName())
+    if not skin_cluster:
+        om.MGlobal.displayError(f"No skinCluster found on {mesh}")
+        return
+
+    weights, influences = skin_weights.get_weights(skin_cluster)
+
+    for side in ("L", "R"):
+        vertices = get_vertices_side_indices(mesh, side, axis, tolerance)
+        mask = skin_weights.influence_mask(influences, f"*{side}*")
+        _warn_stranded(mesh, side, skin_weights.stranded_rows(weights, mask, vertices))
+        skin_weights.zero_weights(weights, mask, vertices)
+
+    skin_weights.set_weights(skin_cluster, weights)
+
+
+def _warn_stranded(mesh: str, side: str, vertices: np.ndarray):
+    """Warn about the vertices weighted only to the excluded influences, which keep their weights."""
+
+    if len(vertices):
+        om.MGlobal.displayWarning(
+            f"{len(vertices)} vertices only weighted to *{side}* influences kept their weights : "
+            f"{' '.join(vertex_components(mesh, vertices))}"
+        )
 
 
 def get_influences(mesh: str) -> tuple:
@@ -99,8 +192,14 @@ def get_influences(mesh: str) -> tuple:
     return skin_cluster, influences
 
 
-def copy_skin(source_mesh: str, destination_mesh: str):
-    """ """
+def copy_skin(source_mesh: str, destination_mesh: str, by_index: bool = False):
+    """Bind a mesh to the influences of another one and copy its weights.
+
+    Args:
+        source_mesh (str): Name of the skinned mesh shape.
+        destination_mesh (str): Name of the mesh shape to bind.
+        by_index (bool): Copy the weights by vertex index, for meshes of identical topology. Closest point otherwise.
+    """
 
     if cmds.nodeType(source_mesh) != "mesh":
         om.MGlobal.displayError(f"{source_mesh} is not a mesh.")
@@ -124,19 +223,22 @@ def copy_skin(source_mesh: str, destination_mesh: str):
         om.MGlobal.displayError(f"{destination_mesh} is not a mesh.")
         return
 
-    cmds.skinCluster(influences, destination_mesh, maximumInfluences=max_influences)
-
-    cmds.select(source_mesh, destination_mesh, replace=True)
-    copy_skin_mel = "copySkinWeights -noMirror -surfaceAssociation closestPoint -influenceAssociation oneToOne -influenceAssociation oneToOne -influenceAssociation oneToOne -normalize;select -cl;"
-    mel.eval(copy_skin_mel)
+    destination_skin_cluster = cmds.skinCluster(influences, destination_mesh, maximumInfluences=max_influences)[0]
+    if by_index:
+        skin_transfer.copy_weights(source_skin_cluster, destination_skin_cluster)
+    else:
+        skin_transfer.transfer_weights(source_skin_cluster, destination_skin_cluster, max_influences)
 
 
 def remove_orig_shapes(geo_list: list) -> list:
-    """ """
+    """Remove the intermediate shapes, such as Orig shapes, from a list of mesh shapes."""
 
     return_geos = []
+    selection = om.MSelectionList()
     for geo in geo_list:
-        if not "Orig" in geo:
+        selection.clear()
+        selection.add(geo)
+        if not om.MFnDagNode(selection.getDagPath(0)).isIntermediateObject:
             return_geos.append(geo)
 
     return return_geos
@@ -145,7 +247,7 @@ def remove_orig_shapes(geo_list: list) -> list:
 def get_mesh_children(group: str) -> list:
     """ """
 
-    mesh = cmds.listRelatives(group, allDescendents=True, type="mesh")
+    mesh = cmds.listRelatives(group, allDescendents=True, type="mesh", fullPath=True)
     if not mesh:
         om.MGlobal.displayError(f"No mesh under node : {group}")
         return
@@ -153,27 +255,95 @@ def get_mesh_children(group: str) -> list:
     return mesh
 
 
-def replace_geos(source_group: str, destination_group: str):
-    """ """
+def strip_namespace(name: str) -> str:
+    """Get the short name of a node without its namespaces."""
 
-    all_source_geos = get_mesh_children(source_group)
-    all_destination_geos = get_mesh_children(destination_group)
+    return name.split("|")[-1].split(":")[-1]
 
-    source_geos = remove_orig_shapes(all_source_geos)
-    destination_geos = remove_orig_shapes(all_destination_geos)
 
-    """for source_mesh, destination_mesh in zip(source_geos, destination_geos):
-        copy_skin(source_mesh = source_mesh, destination_mesh = destination_mesh)"""
+def mesh_key(mesh: str) -> str:
+    """Get the matching key of a mesh shape : the name of its transform without namespaces.
+
+    Shape names are not used since referenced deformed shapes get renamed with a Deformed suffix.
+    """
+
+    dag_path = get_mesh_dag_path(mesh)
+    dag_path.pop()
+    return strip_namespace(dag_path.partialPathName())
+
 
-    for source_mesh in source_geos:
+def topology_fingerprint(mesh: str) -> tuple:
+    """Get the vertex count, face count and a hash of the face-vertex connectivity of a mesh."""
 
-        match = source_mesh.split(":")[-1]
+    return api.getTopology(mesh).fingerprint
 
-        for destination_mesh in destination_geos:
-            if match in destination_mesh:
-                om.MGlobal.displayInfo(f"SOURCE MESH : {source_mesh}")
-                om.MGlobal.displayInfo(f"DESINTATION MESH : {destination_mesh}")
-                copy_skin(source_mesh=source_mesh, destination_mesh=destination_mesh)
 
+def match_meshes(source_meshes: list, destination_meshes: list, topology: bool = True) -> list:
+    """Match source and destination meshes one to one, through a dictionary keyed on namespace-stripped names.
+
+    Args:
+        source_meshes (list): Names of the source mesh shapes.
+        destination_meshes (list): Names of the destination mesh shapes.
+        topology (bool): Compare topology fingerprints, to prefer identical meshes among same name candidates.
+
+    Returns:
+        list: (source mesh, destination mesh, same topology) tuples.
+    """
+
+    index = {}
+    for destination_mesh in destination_meshes:
+        index.setdefault(mesh_key(destination_mesh), []).append(destination_mesh)
+
+    fingerprints = {}
+
+    def fingerprint(mesh: str) -> tuple:
+        if mesh not in fingerprints:
+            fingerprints[mesh] = topology_fingerprint(mesh)
+        return fingerprints[mesh]
+
+    matches = []
+    for source_mesh in source_meshes:
+        candidates = index.get(mesh_key(source_mesh))
+        if not candidates:
+            om.MGlobal.displayWarning(f"No destination mesh found for : {source_mesh}")
+            continue
+
+        same_topology = False
+        position = 0
+        if topology:
+            for position, candidate in enumerate(candidates):
+                if fingerprint(candidate) == fingerprint(source_mesh):
+                    same_topology = True
+                    break
             else:
-                continue
+                position = 0
+
+        matches.append((source_mesh, candidates.pop(position), same_topology))
+
+    return matches
+
+
+def replace_geos(source_group: str, destination_group: str, topology: bool = True):
+    """Skin the meshes of a group like the matching meshes of another group.
+
+    Meshes are matched by namespace-stripped names. Meshes of identical topology get their weights copied by
+    vertex index, the others by closest point.
+
+    Args:
+        source_group (str): Group of the skinned meshes.
+        destination_group (str): Group of the meshes to skin.
+        topology (bool): Compare topologies to copy weights by index when possible.
+    """
+
+    all_source_geos = get_mesh_children(source_group)
+    all_destination_geos = get_mesh_children(destination_group)
+    if not all_source_geos or not all_destination_geos:
+        return
+
+    source_geos = remove_orig_shapes(all_source_geos)
+    destination_geos = remove_orig_shapes(all_destination_geos)
+
+    for source_mesh, destination_mesh, same_topology in match_meshes(source_geos, destination_geos, topology):
+        om.MGlobal.displayInfo(f"SOURCE MESH : {source_mesh}")
+        om.MGlobal.displayInfo(f"DESTINATION MESH : {destination_mesh}")
+        copy_skin(source_mesh=source_mesh, destination_mesh=destination_mesh, by_index=same_topology)
@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+
+from ...utils.imports import *
+from ... import mayatools_api as api
+from . import skin_weights
+from .skin_mod import find_skin_cluster
+
+
+def vertex_adjacency(mesh: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the vertex adjacency of a mesh as compressed sparse rows, from the topology cache.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Row pointers and neighbour vertex indices, sorted per row.
+    """
+
+    return api.getTopology(mesh).vertexAdjacency()
+
+
+def _rows(indptr: np.ndarray, indices: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract the rows of some vertices from compressed sparse rows."""
+
+    starts, counts = indptr[vertices], indptr[vertices + 1] - indptr[vertices]
+    sub_indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+    np.cumsum(counts, out=sub_indptr[1:])
+    positions = np.arange(sub_indptr[-1]) - np.repeat(sub_indptr[:-1], counts) + np.repeat(starts, counts)
+    return sub_indptr, indices[positions]
+
+
+def neighbour_average(
+    weights: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    vertices: np.ndarray,
+    chunk_size: int = 20000,
+) -> np.ndarray:
+    """Average the weights of the neighbours of some vertices.
+
+    Vertices without neighbours keep their own weights.
+
+    Returns:
+        np.ndarray: Averaged weights of shape (len(vertices), influence count).
+    """
+
+    average = weights[vertices].copy()
+
+    for start in range(0, len(vertices), chunk_size):
+        chunk = vertices[start : start + chunk_size]
+        sub_indptr, sub_indices = _rows(indptr, indices, chunk)
+        counts = np.diff(sub_indptr)
+        connected = counts > 0
+        if not sub_indices.size:
+            continue
+
+        sums = np.add.reduceat(weights[sub_indices], sub_indptr[:-1][connected], axis=0)
+        average[start : start + chunk_size][connected] = sums / counts[connected, None]
+
+    return average
+
+
+def smooth_weights(
+    weights: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    vertices: np.ndarray = None,
+    iterations: int = 1,
+    strength: float = 0.5,
+    locked: np.ndarray = None,
+    normalize: bool = True,
+) -> np.ndarray:
+    """Relax weights towards the average of their neighbours, in place.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        indptr (np.ndarray): Row pointers of the vertex adjacency.
+        indices (np.ndarray): Neighbour vertex indices of the vertex adjacency.
+        vertices (np.ndarray): Indices of the vertices to smooth. All vertices when None.
+        iterations (int): Number of smoothing passes.
+        strength (float): Blend towards the neighbour average at each pass, from 0 to 1.
+        locked (np.ndarray): Boolean mask of locked influences, whose weights are left untouched.
+        normalize (bool): Normalize the smoothed rows around the locked weights.
+
+    Returns:
+        np.ndarray: The smoothed weights.
+    """
+
+    vertices = np.arange(weights.shape[0]) if vertices is None else np.asarray(vertices, dtype=np.int64)
+    free = np.ones(weights.shape[1], dtype=bool) if locked is None else ~np.asarray(locked, dtype=bool)
+    free_columns = np.flatnonzero(free)
+
+    for _ in range(iterations):
+        average = neighbour_average(weights[:, free_columns], indptr, indices, vertices)
+        block = weights[vertices]
+        block[:, free_columns] += strength * (average - block[:, free_columns])
+        if normalize:
+            skin_weights.normalize_weights(block, locked)
+        weights[vertices] = block
+
+    return weights
+
+
+def get_locked_influences(influences: list) -> np.ndarray:
+    """Get a boolean mask of the influences with locked weights."""
+
+    return np.array([bool(cmds.getAttr(f"{influence}.lockInfluenceWeights")) for influence in influences], dtype=bool)
+
+
+def relax_skin(
+    geometry: Union[str, list],
+    iterations: int = 3,
+    strength: float = 0.5,
+    max_influences: int = None,
+    epsilon: float = 0.0,
+    respect_locks: bool = True,
+) -> dict:
+    """Relax the skin weights of a mesh or of a subset of its vertices, with a single weight read and write.
+
+    Args:
+        geometry (Union[str, list]): Name of the mesh, or vertex components such as mesh.vtx[0:120].
+        iterations (int): Number of smoothing passes.
+        strength (float): Blend towards the neighbour average at each pass, from 0 to 1.
+        max_influences (int): Prune the relaxed weights to this number of influences per vertex.
+        epsilon (float): Weights smaller or equal to epsilon are dropped.
+        respect_locks (bool): Leave the weights of locked influences untouched.
+
+    Returns:
+        dict: Timing in seconds of each stage.
+    """
+
+    timings = {}
+    start = time.perf_counter()
+
+    geometry = [geometry] if isinstance(geometry, str) else list(geometry)
+    if "." in geometry[0]:
+        mesh, vertices = skin_weights.component_indices(geometry)
+    else:
+        mesh, vertices = geometry[0], None
+
+    skin_cluster = find_skin_cluster(mesh)
+    if not skin_cluster:
+        om.MGlobal.displayError(f"No skinCluster found on {mesh}")
+        return
+
+    weights, influences = skin_weights.get_weights(skin_cluster)
+    locked = get_locked_influences(influences) if respect_locks else None
+    indptr, indices = vertex_adjacency(mesh)
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    smooth_weights(weights, indptr, indices, vertices, iterations, strength, locked)
+    rows = slice(None) if vertices is None else vertices
+    weights[rows] = skin_weights.prune_weights(weights[rows], max_influences, epsilon, normalize=False)
+    skin_weights.normalize_weights(weights, locked)
+    timings["relax"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.set_weights(skin_cluster, weights if vertices is None else weights[vertices], vertices)
+    timings["write"] = time.perf_counter() - start
+
+    om.MGlobal.displayInfo(
+        f"Skin relaxed : {mesh} {len(weights) if vertices is None else len(vertices)} vertices, "
+        + ", ".join(f"{stage} {duration:.3f}s" for stage, duration in timings.items())
+    )
+    return timings
+
+
+def relax_selection(iterations: int = 3, strength: float = 0.5, max_influences: int = None) -> dict:
+    """Relax the skin weights of the selected meshes or components."""
+
+    selection = cmds.ls(selection=True, long=True)
+    if not selection:
+        om.MGlobal.displayError("Select a skinned mesh or components")
+        return
+
+    components = [item for item in selection if "." in item]
+    if components:
+        vertices = cmds.ls(cmds.polyListComponentConversion(components, toVertex=True), long=True)
+        return relax_skin(vertices, iterations, strength, max_influences)
+
+    return {mesh: relax_skin(mesh, iterations, strength, max_influences) for mesh in selection}
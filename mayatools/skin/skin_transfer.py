@@ -0,0 +1,403 @@
+import time
+
+import numpy as np
+
+from ...utils.imports import *
+from . import skin_weights
+
+
+def _group_argmin(groups: np.ndarray, values: np.ndarray, group_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the position of the smallest value of each group, groups being sorted.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The non empty groups and the position of their smallest value.
+    """
+
+    counts = np.bincount(groups, minlength=group_count)
+    found = np.flatnonzero(counts)
+    if not found.size:
+        return found, found
+
+    minimums = np.minimum.reduceat(values, (np.cumsum(counts) - counts)[found])
+    candidates = np.flatnonzero(values == np.repeat(minimums, counts[found]))
+    first = np.ones(len(candidates), dtype=bool)
+    first[1:] = groups[candidates[1:]] != groups[candidates[:-1]]
+    return found, candidates[first]
+
+
+class PointGrid:
+    """Uniform grid hash over points, answering exact nearest point queries in vectorized batches.
+
+    Points are sorted by cell key, so the points of a cell are a contiguous slice found with searchsorted. Queries
+    search growing shells of cells around their own cell until the nearest point found is closer than the searched
+    radius. Queries far outside the grid are answered by brute force.
+    """
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        cell_size: float = None,
+        points_per_cell: float = 2.0,
+        max_table_size: int = 2**23,
+    ):
+
+        self.points = np.asarray(points, dtype=float)
+        self.origin = self.points.min(axis=0)
+        self.extent = self.points.max(axis=0) - self.origin
+
+        if cell_size is None:
+            # start from the volume and rescale with the measured occupancy, meshes being surfaces
+            volume = np.prod(np.maximum(self.extent, self.extent.max() * 1e-3 + 1e-12))
+            cell_size = (volume / len(self.points)) ** (1 / 3)
+            occupied = len(np.unique(self._keys(self._cells(self.points, cell_size), self._dims(cell_size))))
+            cell_size *= np.sqrt(points_per_cell * occupied / len(self.points))
+        self.cell_size = float(cell_size)
+
+        self.dims = self._dims(self.cell_size)
+        keys = self._keys(self._cells(self.points, self.cell_size), self.dims)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+        # direct cell -> points table when it fits, binary search in the sorted keys otherwise
+        self.cell_starts = None
+        cell_count = int(np.prod(self.dims))
+        if cell_count <= max_table_size:
+            self.cell_starts = np.zeros(cell_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=cell_count), out=self.cell_starts[1:])
+
+    def _dims(self, cell_size: float) -> np.ndarray:
+        return (self.extent // cell_size).astype(np.int64) + 1
+
+    def _cells(self, points: np.ndarray, cell_size: float) -> np.ndarray:
+        return np.floor((points - self.origin) / cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells: np.ndarray, dims: np.ndarray) -> np.ndarray:
+        return (cells[..., 0] * dims[1] + cells[..., 1]) * dims[2] + cells[..., 2]
+
+    @staticmethod
+    def _shell(ring: int) -> np.ndarray:
+        span = np.arange(-ring, ring + 1)
+        offsets = np.stack(np.meshgrid(span, span, span, indexing="ij"), axis=-1).reshape(-1, 3)
+        return offsets[np.abs(offsets).max(axis=1) == ring]
+
+    def _search(self, queries: np.ndarray, cells: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        neighbours = cells[:, None, :] + offsets[None]
+        query_ids, offset_ids = np.nonzero(np.all((neighbours >= 0) & (neighbours < self.dims), axis=2))
+
+        keys = self._keys(neighbours[query_ids, offset_ids], self.dims)
+        if self.cell_starts is None:
+            starts = np.searchsorted(self.sorted_keys, keys, side="left")
+            counts = np.searchsorted(self.sorted_keys, keys, side="right") - starts
+        else:
+            starts = self.cell_starts[keys]
+            counts = self.cell_starts[keys + 1] - starts
+
+        pair_queries = np.repeat(query_ids, counts)
+        positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+        pair_points = self.order[positions]
+        vectors = queries[pair_queries] - self.points[pair_points]
+        distances = np.einsum("ij,ij->i", vectors, vectors)
+
+        found, closest = _group_argmin(pair_queries, distances, len(queries))
+        nearest = np.full(len(queries), -1, dtype=np.int64)
+        nearest_distances = np.full(len(queries), np.inf)
+        nearest[found] = pair_points[closest]
+        nearest_distances[found] = np.sqrt(distances[closest])
+
+        return nearest, nearest_distances
+
+    def _brute_force(self, queries: np.ndarray, chunk_size: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+
+        nearest = np.empty(len(queries), dtype=np.int64)
+        distances = np.empty(len(queries))
+        squared_norms = np.einsum("ij,ij->i", self.points, self.points)
+
+        for start in range(0, len(queries), chunk_size):
+            chunk = queries[start : start + chunk_size]
+            squared = squared_norms[None] - 2 * chunk @ self.points.T
+            nearest[start : start + chunk_size] = np.argmin(squared, axis=1)
+            vectors = chunk - self.points[nearest[start : start + chunk_size]]
+            distances[start : start + chunk_size] = np.linalg.norm(vectors, axis=1)
+
+        return nearest, distances
+
+    def nearest(self, queries: np.ndarray, chunk_size: int = 20000) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the nearest point of each query.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Nearest point indices and distances.
+        """
+
+        queries = np.asarray(queries, dtype=float)
+        nearest = np.empty(len(queries), dtype=np.int64)
+        distances = np.empty(len(queries))
+
+        outside = np.linalg.norm(
+            np.maximum(self.origin - queries, 0) + np.maximum(queries - self.origin - self.extent, 0), axis=1
+        )
+        far = outside > 2 * self.cell_size
+        if far.any():
+            nearest[far], distances[far] = self._brute_force(queries[far])
+
+        max_ring = int(self.dims.max()) + 2
+        near = np.flatnonzero(~far)
+
+        for chunk_start in range(0, len(near), chunk_size):
+            pending = near[chunk_start : chunk_start + chunk_size]
+            cells = self._cells(queries[pending], self.cell_size)
+            best = np.full(len(pending), -1, dtype=np.int64)
+            best_distances = np.full(len(pending), np.inf)
+            ring = 0
+
+            while pending.size:
+                found, found_distances = self._search(queries[pending], cells, self._shell(ring))
+                closer = found_distances < best_distances
+                best[closer], best_distances[closer] = found[closer], found_distances[closer]
+
+                # the cells up to this ring cover a ball of radius ring * cell_size around the query
+                done = (best_distances <= ring * self.cell_size) | (ring >= max_ring)
+                nearest[pending[done]], distances[pending[done]] = best[done], best_distances[done]
+                pending, cells = pending[~done], cells[~done]
+                best, best_distances = best[~done], best_distances[~done]
+                ring += 1
+
+        return nearest, distances
+
+
+def get_triangles(mesh_fn: om.MFnMesh) -> np.ndarray:
+    """Get the triangles of a mesh as an array of vertex indices of shape (triangle count, 3)."""
+
+    _, vertices = mesh_fn.getTriangles()
+    return np.array(vertices, dtype=np.int64).reshape(-1, 3)
+
+
+def closest_point_barycentric(points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Get the barycentric coordinates of the closest points on triangles abc, vectorized.
+
+    Args:
+        points (np.ndarray): Query points of shape (n, 3).
+        a, b, c (np.ndarray): Triangle corners of shape (n, 3).
+
+    Returns:
+        np.ndarray: Barycentric coordinates of shape (n, 3), clamped to the triangles.
+    """
+
+    def dot(x, y):
+        return np.einsum("ij,ij->i", x, y)
+
+    ab, ac = b - a, c - a
+    ap, bp, cp = points - a, points - b, points - c
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = va + vb + vc
+        v = np.where(total != 0, vb / total, 0.0)
+        w = np.where(total != 0, vc / total, 0.0)
+        coordinates = np.stack((1 - v - w, v, w), axis=1)
+
+        # voronoi regions of the edges and corners, from the last tested to the first so the first one wins
+        t = np.nan_to_num((d4 - d3) / ((d4 - d3) + (d5 - d6)))
+        region = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        coordinates[region] = np.stack((np.zeros_like(t), 1 - t, t), axis=1)[region]
+
+        t = np.nan_to_num(d2 / (d2 - d6))
+        region = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        coordinates[region] = np.stack((1 - t, np.zeros_like(t), t), axis=1)[region]
+
+        coordinates[(d6 >= 0) & (d5 <= d6)] = (0.0, 0.0, 1.0)
+
+        t = np.nan_to_num(d1 / (d1 - d3))
+        region = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        coordinates[region] = np.stack((1 - t, t, np.zeros_like(t)), axis=1)[region]
+
+        coordinates[(d3 >= 0) & (d4 <= d3)] = (0.0, 1.0, 0.0)
+        coordinates[(d1 <= 0) & (d2 <= 0)] = (1.0, 0.0, 0.0)
+
+    return coordinates
+
+
+def closest_triangle_weights(
+    points: np.ndarray,
+    triangles: np.ndarray,
+    queries: np.ndarray,
+    grid: PointGrid = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the closest triangle of each query point and the barycentric coordinates of the closest point on it.
+
+    Candidate triangles are the triangles around the nearest vertex of each query.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Triangle vertex indices and barycentric coordinates, both of shape (n, 3).
+    """
+
+    grid = grid or PointGrid(points)
+    nearest, _ = grid.nearest(queries)
+
+    # vertex -> triangles adjacency as compressed rows
+    corners = triangles.ravel()
+    triangle_ids = np.argsort(corners, kind="stable") // 3
+    indptr = np.zeros(len(points) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(corners, minlength=len(points)), out=indptr[1:])
+
+    starts, counts = indptr[nearest], indptr[nearest + 1] - indptr[nearest]
+    pair_queries = np.repeat(np.arange(len(queries)), counts)
+    positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+    pair_triangles = triangles[triangle_ids[positions]]
+
+    pair_points = queries[pair_queries]
+    a, b, c = (points[pair_triangles[:, i]] for i in range(3))
+    coordinates = closest_point_barycentric(pair_points, a, b, c)
+    closest = coordinates[:, :1] * a + coordinates[:, 1:2] * b + coordinates[:, 2:] * c
+    distances = np.einsum("ij,ij->i", pair_points - closest, pair_points - closest)
+
+    # isolated vertices keep their own weights
+    result_triangles = np.repeat(nearest[:, None], 3, axis=1)
+    result_coordinates = np.zeros((len(queries), 3))
+    result_coordinates[:, 0] = 1.0
+
+    found, closest = _group_argmin(pair_queries, distances, len(queries))
+    result_triangles[found] = pair_triangles[closest]
+    result_coordinates[found] = coordinates[closest]
+
+    return result_triangles, result_coordinates
+
+
+def influence_columns(source_influences: list, destination_influences: list) -> Tuple[np.ndarray, list]:
+    """Match influences by short name.
+
+    Returns:
+        Tuple[np.ndarray, list]: Mask of the source influences found in the destination and their destination columns.
+    """
+
+    short_names = [name.split("|")[-1] for name in destination_influences]
+    columns = np.array([name.split("|")[-1] in short_names for name in source_influences], dtype=bool)
+    destination_columns = [short_names.index(name.split("|")[-1]) for name in np.array(source_influences)[columns]]
+    return columns, destination_columns
+
+
+def copy_weights(source_skin_cluster: str, destination_skin_cluster: str) -> dict:
+    """Copy skin weights by vertex index between meshes of identical topology, with a single read and write.
+
+    Influences are matched by name.
+
+    Returns:
+        dict: Timing in seconds of each stage.
+    """
+
+    timings = {}
+    start = time.perf_counter()
+    source_weights, source_influences = skin_weights.get_weights(source_skin_cluster)
+    destination_influences = skin_weights.get_influence_names(skin_weights.get_skin_fn(destination_skin_cluster))
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns, destination_columns = influence_columns(source_influences, destination_influences)
+    weights = np.zeros((len(source_weights), len(destination_influences)))
+    weights[:, destination_columns] = source_weights[:, columns]
+    skin_weights.normalize_weights(weights)
+    timings["remap"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.set_weights(destination_skin_cluster, weights)
+    timings["write"] = time.perf_counter() - start
+
+    om.MGlobal.displayInfo(
+        f"Skin copy {source_skin_cluster} -> {destination_skin_cluster} : "
+        f"{len(weights)} vertices, "
+        + ", ".join(f"{stage} {duration:.3f}s" for stage, duration in timings.items())
+    )
+    return timings
+
+
+def transfer_weights(
+    source_skin_cluster: str,
+    destination_skin_cluster: str,
+    max_influences: int = None,
+) -> dict:
+    """Transfer skin weights by closest point on surface with barycentric interpolation.
+
+    Source points, triangles and weights are read once, every destination vertex is solved in vectorized batches and
+    the result is written back with a single weight write. Influences are matched by name.
+
+    Args:
+        source_skin_cluster (str): Name of the source skinCluster.
+        destination_skin_cluster (str): Name of the destination skinCluster.
+        max_influences (int): Prune the transferred weights to this number of influences per vertex.
+
+    Returns:
+        dict: Timing in seconds of each stage.
+    """
+
+    timings = {}
+    start = time.perf_counter()
+
+    source_fn = om.MFnMesh(skin_weights.get_skin_shape(skin_weights.get_skin_fn(source_skin_cluster)))
+    destination_fn = om.MFnMesh(skin_weights.get_skin_shape(skin_weights.get_skin_fn(destination_skin_cluster)))
+    source_points = np.array(source_fn.getPoints(om.MSpace.kWorld), dtype=float).reshape(-1, 4)[:, :3]
+    destination_points = np.array(destination_fn.getPoints(om.MSpace.kWorld), dtype=float).reshape(-1, 4)[:, :3]
+    triangles = get_triangles(source_fn)
+    source_weights, source_influences = skin_weights.get_weights(source_skin_cluster)
+    destination_influences = skin_weights.get_influence_names(skin_weights.get_skin_fn(destination_skin_cluster))
+    timings["read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grid = PointGrid(source_points)
+    timings["grid"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vertices, coordinates = closest_triangle_weights(source_points, triangles, destination_points, grid)
+    timings["closest"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns, destination_columns = influence_columns(source_influences, destination_influences)
+
+    weights = np.zeros((len(destination_points), len(destination_influences)))
+    for i in range(3):
+        weights[:, destination_columns] += coordinates[:, i, None] * source_weights[vertices[:, i]][:, columns]
+    skin_weights.prune_weights(weights, max_influences)
+    timings["interpolate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    skin_weights.set_weights(destination_skin_cluster, weights)
+    timings["write"] = time.perf_counter() - start
+
+    om.MGlobal.displayInfo(
+        f"Skin transfer {source_skin_cluster} -> {destination_skin_cluster} : "
+        f"{len(destination_points)} vertices, "
+        + ", ".join(f"{stage} {duration:.3f}s" for stage, duration in timings.items())
+    )
+    return timings
+
+
+def _benchmark_closest_point(resolution: int = 320, query_count: int = 100000) -> dict:
+    """Time the closest point search on a sphere of resolution ** 2 vertices, without any scene."""
+
+    u, v = np.meshgrid(
+        np.linspace(0, 2 * np.pi, resolution, endpoint=False), np.linspace(0.01, np.pi - 0.01, resolution), indexing="ij"
+    )
+    points = np.stack((np.cos(u) * np.sin(v), np.sin(u) * np.sin(v), np.cos(v)), axis=-1).reshape(-1, 3)
+
+    ids = np.arange(resolution**2).reshape(resolution, resolution)
+    a, b = ids[:, :-1], np.roll(ids, -1, axis=0)[:, :-1]
+    c, d = ids[:, 1:], np.roll(ids, -1, axis=0)[:, 1:]
+    triangles = np.concatenate((np.stack((a, b, c), -1).reshape(-1, 3), np.stack((b, d, c), -1).reshape(-1, 3)))
+
+    queries = np.random.default_rng(0).normal(size=(query_count, 3))
+    queries /= np.linalg.norm(queries, axis=1)[:, None]
+
+    timings = {}
+    start = time.perf_counter()
+    grid = PointGrid(points)
+    timings["grid"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closest_triangle_weights(points, triangles, queries, grid)
+    timings["closest"] = time.perf_counter() - start
+
+    print(f"{len(points)} source vertices, {query_count} queries : {timings}")
+    return timings
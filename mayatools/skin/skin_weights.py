@@ -0,0 +1,276 @@
+import fnmatch
+
+import numpy as np
+from maya.api import OpenMayaAnim as oma
+
+from ...utils.imports import *
+from ... import mayatools_api as api
+
+
+def get_skin_fn(skin_cluster: str) -> oma.MFnSkinCluster:
+    """Get the function set of a skinCluster."""
+
+    selection = om.MSelectionList()
+    selection.add(skin_cluster)
+    return oma.MFnSkinCluster(selection.getDependNode(0))
+
+
+def get_skin_shape(skin_fn: oma.MFnSkinCluster) -> om.MDagPath:
+    """Get the dag path of the shape deformed by a skinCluster."""
+
+    return om.MDagPath.getAPathTo(skin_fn.getOutputGeometry()[0])
+
+
+def get_influence_names(skin_fn: oma.MFnSkinCluster) -> list:
+    """Get the influence names of a skinCluster, in weight column order."""
+
+    return [path.partialPathName() for path in skin_fn.influenceObjects()]
+
+
+def vertex_component(indices: np.ndarray = None, count: int = None) -> om.MObject:
+    """Create a mesh vertex component from indices, or a complete component of count vertices."""
+
+    fn_component = om.MFnSingleIndexedComponent()
+    component = fn_component.create(om.MFn.kMeshVertComponent)
+
+    if indices is None:
+        fn_component.setCompleteData(count)
+    else:
+        fn_component.addElements(om.MIntArray(np.asarray(indices, dtype=int).tolist()))
+
+    return component
+
+
+def component_indices(components: list) -> Tuple[str, np.ndarray]:
+    """Get the mesh and vertex indices of vertex components such as mesh.vtx[0:120].
+
+    Returns:
+        Tuple[str, np.ndarray]: Name of the mesh shape and sorted vertex indices.
+    """
+
+    dag_path, indices = api.componentIndices(components)
+    return dag_path.partialPathName(), indices
+
+
+def get_weights(skin_cluster: str, vertices: np.ndarray = None) -> Tuple[np.ndarray, list]:
+    """Read skinCluster weights in a single call.
+
+    Args:
+        skin_cluster (str): Name of the skinCluster.
+        vertices (np.ndarray): Vertex indices to read. All vertices when None.
+
+    Returns:
+        Tuple[np.ndarray, list]: Weights of shape (vertex count, influence count) and influence names.
+    """
+
+    skin_fn = get_skin_fn(skin_cluster)
+    shape = get_skin_shape(skin_fn)
+
+    if vertices is None:
+        component = vertex_component(count=om.MFnMesh(shape).numVertices)
+    else:
+        component = vertex_component(vertices)
+
+    weights, influence_count = skin_fn.getWeights(shape, component)
+    weights = np.array(weights, dtype=float).reshape(-1, influence_count)
+
+    return weights, get_influence_names(skin_fn)
+
+
+def set_weights(
+    skin_cluster: str,
+    weights: np.ndarray,
+    vertices: np.ndarray = None,
+    influences: np.ndarray = None,
+    normalize: bool = False,
+) -> np.ndarray:
+    """Write skinCluster weights in a single call.
+
+    Args:
+        skin_cluster (str): Name of the skinCluster.
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        vertices (np.ndarray): Vertex indices of the weight rows. All vertices when None.
+        influences (np.ndarray): Influence indices of the weight columns. All influences when None.
+        normalize (bool): Let the skinCluster normalize the weights.
+
+    The write is put on the Maya undo queue.
+
+    Returns:
+        np.ndarray: The previous weights, with the same shape.
+    """
+
+    skin_fn = get_skin_fn(skin_cluster)
+    shape = get_skin_shape(skin_fn)
+    weights = np.asarray(weights, dtype=float)
+
+    if vertices is None:
+        component = vertex_component(count=weights.shape[0])
+    else:
+        component = vertex_component(vertices)
+
+    if influences is None:
+        influences = np.arange(weights.shape[1])
+        if not normalize and (weights.sum(axis=1) <= 0.0).any():
+            raise ValueError(f"{skin_cluster} : weight rows summing to 0 would leave vertices without influence")
+
+    influence_array = om.MIntArray(np.asarray(influences, dtype=int).tolist())
+    values = om.MDoubleArray(weights.ravel().tolist())
+
+    # normalizing changes the other influences too, the undo restores them all
+    if normalize:
+        undo_values, influence_count = skin_fn.getWeights(shape, component)
+        undo_influences = om.MIntArray(list(range(influence_count)))
+
+    old_weights = skin_fn.setWeights(shape, component, influence_array, values, normalize, True)
+
+    if not normalize:
+        undo_values, undo_influences = old_weights, influence_array
+
+    api.recordUndo(
+        lambda: skin_fn.setWeights(shape, component, undo_influences, undo_values, False, False),
+        lambda: skin_fn.setWeights(shape, component, influence_array, values, normalize, False),
+    )
+
+    return np.array(old_weights, dtype=float).reshape(weights.shape[0], -1)
+
+
+def to_csr(weights: np.ndarray, epsilon: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert dense weights to compressed sparse rows.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        epsilon (float): Weights smaller or equal to epsilon are dropped.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Row pointers, influence indices and weight values.
+    """
+
+    rows, columns = np.nonzero(np.abs(weights) > epsilon)
+    indptr = np.zeros(weights.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=weights.shape[0]), out=indptr[1:])
+    return indptr, columns.astype(np.int32), weights[rows, columns]
+
+
+def from_csr(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, influence_count: int) -> np.ndarray:
+    """Convert compressed sparse rows to dense weights of shape (vertex count, influence count)."""
+
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    weights = np.zeros((len(indptr) - 1, influence_count))
+    weights[rows, indices] = data
+    return weights
+
+
+def influence_mask(influences: list, pattern: str) -> np.ndarray:
+    """Get a boolean mask of the influences whose short name matches a glob pattern such as *L*."""
+
+    return np.array([fnmatch.fnmatchcase(name.split("|")[-1], pattern) for name in influences], dtype=bool)
+
+
+def normalize_weights(weights: np.ndarray, locked: np.ndarray = None) -> np.ndarray:
+    """Normalize weight rows to a sum of 1, in place.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        locked (np.ndarray): Boolean mask of influences whose weights are kept, the others share the remainder.
+
+    Returns:
+        np.ndarray: The normalized weights.
+    """
+
+    free = np.ones(weights.shape[1], dtype=bool) if locked is None else ~np.asarray(locked, dtype=bool)
+
+    target = 1.0 - weights[:, ~free].sum(axis=1)
+    totals = weights[:, free].sum(axis=1)
+    valid = totals > 0.0
+
+    scale = np.ones_like(totals)
+    scale[valid] = np.clip(target[valid], 0.0, None) / totals[valid]
+    weights[:, free] *= scale[:, None]
+
+    return weights
+
+
+def _row_indices(weights: np.ndarray, vertices: np.ndarray = None) -> np.ndarray:
+    rows = np.arange(weights.shape[0]) if vertices is None else np.asarray(vertices)
+    return np.flatnonzero(rows) if rows.dtype == bool else rows
+
+
+def stranded_rows(weights: np.ndarray, influences: np.ndarray, vertices: np.ndarray = None) -> np.ndarray:
+    """Get the rows weighted only to some influences, zeroing them would leave the vertices without any weight.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        influences (np.ndarray): Boolean mask or indices of the influences.
+        vertices (np.ndarray): Boolean mask or indices of the rows to check. All rows when None.
+
+    Returns:
+        np.ndarray: Indices of the stranded rows.
+    """
+
+    rows = _row_indices(weights, vertices)
+    block = weights[rows]
+    remaining = block.sum(axis=1) - block[:, influences].sum(axis=1)
+    return rows[remaining <= 0.0]
+
+
+def zero_weights(
+    weights: np.ndarray,
+    influences: np.ndarray,
+    vertices: np.ndarray = None,
+    normalize: bool = True,
+) -> np.ndarray:
+    """Zero the weights of some influences on some vertices, in place.
+
+    The stranded rows, weighted only to these influences, are left untouched instead of losing every weight.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        influences (np.ndarray): Boolean mask or indices of the influences to zero.
+        vertices (np.ndarray): Boolean mask or indices of the rows to edit. All rows when None.
+        normalize (bool): Redistribute the removed weight over the remaining influences of each row.
+
+    Returns:
+        np.ndarray: The edited weights.
+    """
+
+    rows = _row_indices(weights, vertices)
+
+    block = weights[rows]
+    block[:, influences] = 0.0
+    kept = block.sum(axis=1) > 0.0
+    rows, block = rows[kept], block[kept]
+    if normalize:
+        normalize_weights(block)
+    weights[rows] = block
+
+    return weights
+
+
+def prune_weights(
+    weights: np.ndarray,
+    max_influences: int = None,
+    epsilon: float = 0.0,
+    normalize: bool = True,
+) -> np.ndarray:
+    """Drop small weights and keep the strongest influences of each vertex, in place.
+
+    Args:
+        weights (np.ndarray): Weights of shape (vertex count, influence count).
+        max_influences (int): Maximum number of influences per vertex.
+        epsilon (float): Weights smaller or equal to epsilon are dropped.
+        normalize (bool): Normalize the rows after pruning.
+
+    Returns:
+        np.ndarray: The pruned weights.
+    """
+
+    weights[weights <= epsilon] = 0.0
+
+    if max_influences is not None and max_influences < weights.shape[1]:
+        dropped = np.argpartition(-weights, max_influences, axis=1)[:, max_influences:]
+        np.put_along_axis(weights, dropped, 0.0, axis=1)
+
+    if normalize:
+        normalize_weights(weights)
+
+    return weights
@@ -1,10 +1,11 @@
 from ...utils.imports import *
+from ...utils.profiler import benchmark_builds, profile
 from ..constants_maya import *
 from ..display import color_node
 from ..joint import curve_joint
 from ..offset import move_op_matrix, offset_parent_matrix, move_hook_op_matrix, offset
 from ..tools import ensure_group
-from ..matrix import matrix_constraint
+from ..matrix import matrix_constraint, spline_matrices
 from ..curve import control, octagon_control
 from ..attribute import cb_attributes, sep_cb
 from ..tools import ensure_set
@@ -80,8 +81,18 @@ def create_ctrl_options():
     return ctrl
 
 
-def spine_matrix(start: str, end: str):
-    """ """
+@profile
+def spine_matrix(start: str, end: str, mode: Literal["ribbon", "matrix"] = "ribbon"):
+    """Build the spine rig between two objects.
+
+    Args:
+        start (str): Object at the base of the spine.
+        end (str): Object at the top of the spine.
+        mode (Literal["ribbon", "matrix"]): "ribbon" rides the spine joints on a nurbs ribbon. "matrix" drives them
+            with spline_matrices, straight from the ik and tangent controls without surface nor curve nodes.
+            The controls and the options are the same, but the joints stay at fixed parameters on the spline and
+            always stretch with it : the Stretch option has no effect and is locked and hidden.
+    """
 
     # POSITIONS
     import math
@@ -95,27 +106,28 @@ def spine_matrix(start: str, end: str):
 
     # NUBRS
     width = 1.4
-    ribbon_surface = cmds.nurbsPlane(
-        pivot=mid_pos,
-        axis=[0, 0, 1],
-        lengthRatio=distance,
-        width=width,
-        degree=3,
-        u=1,
-        v=2,
-        constructionHistory=False,
-        name="ribbon_spine_lowdef",
-    )[0]
-    cmds.rebuildSurface(
-        ribbon_surface,
-        degreeU=1,
-        degreeV=3,
-        spansU=1,
-        spansV=2,
-        constructionHistory=False,
-    )
-    ribbon_surace_shape = cmds.listRelatives(ribbon_surface, shapes=True)[0]
-    ensure_group(ribbon_surface, SHOW, ctrl_main=False)
+    if mode == "ribbon":
+        ribbon_surface = cmds.nurbsPlane(
+            pivot=mid_pos,
+            axis=[0, 0, 1],
+            lengthRatio=distance,
+            width=width,
+            degree=3,
+            u=1,
+            v=2,
+            constructionHistory=False,
+            name="ribbon_spine_lowdef",
+        )[0]
+        cmds.rebuildSurface(
+            ribbon_surface,
+            degreeU=1,
+            degreeV=3,
+            spansU=1,
+            spansV=2,
+            constructionHistory=False,
+        )
+        ribbon_surace_shape = cmds.listRelatives(ribbon_surface, shapes=True)[0]
+        ensure_group(ribbon_surface, SHOW, ctrl_main=False)
 
     # Create controlers
     ctrl_ik_pelvis = cmds.circle(
@@ -257,158 +269,184 @@ def spine_matrix(start: str, end: str):
 
     matrix_constraint(ctrl_ik_chest, loc_info_squash_chest, t=True, r=True, s=True)
 
-    # CURVE ----------------------------------------------------------------------------------------------------
-    curve_squash_offset = cmds.curve(
-        name=f"{CRV}_squash_offset", degree=1, point=([0, 0, 0], [1, 1, 1]), knot=[0, 1]
-    )
-    curve_squash_offset_shape = cmds.listRelatives(curve_squash_offset, shapes=True)[0]
-    curve_squash_offset_shape = cmds.rename(
-        curve_squash_offset_shape, f"{curve_squash_offset}Shape"
-    )
-    ensure_group(curve_squash_offset, SHOW, ctrl_main=False)
+    if mode == "ribbon":
+        # CURVE ----------------------------------------------------------------------------------------------------
+        curve_squash_offset = cmds.curve(
+            name=f"{CRV}_squash_offset", degree=1, point=([0, 0, 0], [1, 1, 1]), knot=[0, 1]
+        )
+        curve_squash_offset_shape = cmds.listRelatives(curve_squash_offset, shapes=True)[0]
+        curve_squash_offset_shape = cmds.rename(
+            curve_squash_offset_shape, f"{curve_squash_offset}Shape"
+        )
+        ensure_group(curve_squash_offset, SHOW, ctrl_main=False)
 
-    # connect locs to curve
-    cmds.connectAttr(
-        f"{loc_info_squash_chest}.worldPosition[0]",
-        f"{curve_squash_offset_shape}.controlPoints[0]",
-    )
-    cmds.connectAttr(
-        f"{loc_info_squash_initial_length}.worldPosition[0]",
-        f"{curve_squash_offset_shape}.controlPoints[1]",
-    )
+        # connect locs to curve
+        cmds.connectAttr(
+            f"{loc_info_squash_chest}.worldPosition[0]",
+            f"{curve_squash_offset_shape}.controlPoints[0]",
+        )
+        cmds.connectAttr(
+            f"{loc_info_squash_initial_length}.worldPosition[0]",
+            f"{curve_squash_offset_shape}.controlPoints[1]",
+        )
 
-    # create matrix nodes ------------------------------------------------------------------------------------------------
-    compose_matrix_pos = cmds.createNode("composeMatrix", name="compMtx_pos_offset")
-    compose_matrix_neg = cmds.createNode("composeMatrix", name="compMtx_neg_offset")
-    cmds.setAttr(f"{compose_matrix_pos}.inputTranslateX", width * 0.5)
-    cmds.setAttr(f"{compose_matrix_neg}.inputTranslateX", width * -0.5)
-
-    point_dict = {
-        0: [compose_matrix_neg, ctrl_ik_pelvis_master],
-        1: [compose_matrix_neg, ctrl_tangent_pelvis_master],
-        2: [compose_matrix_neg, ctrl_ik_mid_master],
-        3: [compose_matrix_neg, ctrl_tangent_chest_master],
-        4: [compose_matrix_neg, ctrl_ik_chest_master],
-        5: [compose_matrix_pos, ctrl_ik_pelvis_master],
-        6: [compose_matrix_pos, ctrl_tangent_pelvis_master],
-        7: [compose_matrix_pos, ctrl_ik_mid_master],
-        8: [compose_matrix_pos, ctrl_tangent_chest_master],
-        9: [compose_matrix_pos, ctrl_ik_chest_master],
-    }
-
-    for i in range(0, 10):
-        at = f"controlPoints[{i}]"
-        compose_mtx_at = f"{point_dict[i][0]}.outputMatrix"
-        ctrl_at = f"{point_dict[i][1]}.worldMatrix[0]"
-
-        mutl_mtx = cmds.createNode("multMatrix", name=f"multMtx_point_{i}")
-        cmds.connectAttr(compose_mtx_at, f"{mutl_mtx}.matrixIn[0]")
-        cmds.connectAttr(ctrl_at, f"{mutl_mtx}.matrixIn[1]")
-
-        deco_mtx = cmds.createNode("decomposeMatrix", name=f"decMtx_point_{i}")
-        cmds.connectAttr(f"{mutl_mtx}.matrixSum", f"{deco_mtx}.inputMatrix")
-        cmds.connectAttr(f"{deco_mtx}.outputTranslate", f"{ribbon_surace_shape}.{at}")
-
-    # -----------------------------------------------------------------------------------------------------------------
-    # create nodes
-    rebulid_surface_node = cmds.createNode(
-        "rebuildSurface", name="rebuildSurface_spine_ribbon"
-    )
-    curve_from_surface_iso_node = cmds.createNode(
-        "curveFromSurfaceIso", name="curveFromSurfaceIso_spine_ribbon"
-    )
-    curve_info_node = cmds.createNode(
-        "curveInfo", name="curveInfo_spine_ribbon_isoparm"
-    )
+        # create matrix nodes ------------------------------------------------------------------------------------------------
+        compose_matrix_pos = cmds.createNode("composeMatrix", name="compMtx_pos_offset")
+        compose_matrix_neg = cmds.createNode("composeMatrix", name="compMtx_neg_offset")
+        cmds.setAttr(f"{compose_matrix_pos}.inputTranslateX", width * 0.5)
+        cmds.setAttr(f"{compose_matrix_neg}.inputTranslateX", width * -0.5)
+
+        point_dict = {
+            0: [compose_matrix_neg, ctrl_ik_pelvis_master],
+            1: [compose_matrix_neg, ctrl_tangent_pelvis_master],
+            2: [compose_matrix_neg, ctrl_ik_mid_master],
+            3: [compose_matrix_neg, ctrl_tangent_chest_master],
+            4: [compose_matrix_neg, ctrl_ik_chest_master],
+            5: [compose_matrix_pos, ctrl_ik_pelvis_master],
+            6: [compose_matrix_pos, ctrl_tangent_pelvis_master],
+            7: [compose_matrix_pos, ctrl_ik_mid_master],
+            8: [compose_matrix_pos, ctrl_tangent_chest_master],
+            9: [compose_matrix_pos, ctrl_ik_chest_master],
+        }
+
+        for i in range(0, 10):
+            at = f"controlPoints[{i}]"
+            compose_mtx_at = f"{point_dict[i][0]}.outputMatrix"
+            ctrl_at = f"{point_dict[i][1]}.worldMatrix[0]"
+
+            mutl_mtx = cmds.createNode("multMatrix", name=f"multMtx_point_{i}")
+            cmds.connectAttr(compose_mtx_at, f"{mutl_mtx}.matrixIn[0]")
+            cmds.connectAttr(ctrl_at, f"{mutl_mtx}.matrixIn[1]")
+
+            deco_mtx = cmds.createNode("decomposeMatrix", name=f"decMtx_point_{i}")
+            cmds.connectAttr(f"{mutl_mtx}.matrixSum", f"{deco_mtx}.inputMatrix")
+            cmds.connectAttr(f"{deco_mtx}.outputTranslate", f"{ribbon_surace_shape}.{at}")
+
+        # -----------------------------------------------------------------------------------------------------------------
+        # create nodes
+        rebulid_surface_node = cmds.createNode(
+            "rebuildSurface", name="rebuildSurface_spine_ribbon"
+        )
+        curve_from_surface_iso_node = cmds.createNode(
+            "curveFromSurfaceIso", name="curveFromSurfaceIso_spine_ribbon"
+        )
+        curve_info_node = cmds.createNode(
+            "curveInfo", name="curveInfo_spine_ribbon_isoparm"
+        )
 
-    # configure nodes
-    ats = (
-        "rebuildType",
-        "spansU",
-        "spansV",
-        "degreeU",
-        "degreeV",
-        "direction",
-        "endKnots",
-        "keepRange",
-        "keepCorners",
-    )
+        # configure nodes
+        ats = (
+            "rebuildType",
+            "spansU",
+            "spansV",
+            "degreeU",
+            "degreeV",
+            "direction",
+            "endKnots",
+            "keepRange",
+            "keepCorners",
+        )
 
-    values = (0, 1, 2, 3, 7, 1, 1, 0, 0)
+        values = (0, 1, 2, 3, 7, 1, 1, 0, 0)
 
-    for at, value in zip(ats, values):
-        cmds.setAttr(f"{rebulid_surface_node}.{at}", value)
+        for at, value in zip(ats, values):
+            cmds.setAttr(f"{rebulid_surface_node}.{at}", value)
 
-    cmds.setAttr(f"{curve_from_surface_iso_node}.isoparmValue", 0.5)
-    cmds.setAttr(f"{curve_from_surface_iso_node}.isoparmDirection", 1)  # V
+        cmds.setAttr(f"{curve_from_surface_iso_node}.isoparmValue", 0.5)
+        cmds.setAttr(f"{curve_from_surface_iso_node}.isoparmDirection", 1)  # V
 
-    # connect atributes
-    cmds.connectAttr(
-        f"{ribbon_surace_shape}.worldSpace[0]", f"{rebulid_surface_node}.inputSurface"
-    )
-    cmds.connectAttr(
-        f"{rebulid_surface_node}.outputSurface",
-        f"{curve_from_surface_iso_node}.inputSurface",
-    )
-    cmds.connectAttr(
-        f"{curve_from_surface_iso_node}.outputCurve", f"{curve_info_node}.inputCurve"
-    )
+        # connect atributes
+        cmds.connectAttr(
+            f"{ribbon_surace_shape}.worldSpace[0]", f"{rebulid_surface_node}.inputSurface"
+        )
+        cmds.connectAttr(
+            f"{rebulid_surface_node}.outputSurface",
+            f"{curve_from_surface_iso_node}.inputSurface",
+        )
+        cmds.connectAttr(
+            f"{curve_from_surface_iso_node}.outputCurve", f"{curve_info_node}.inputCurve"
+        )
 
-    # curves ------------------------------------------------------------------------------------------------------------
-    curve_isoparm = cmds.curve(
-        name=f"{CRV}_ribbon_isoparm", degree=3, point=([0, 0, 0]), knot=[0, 0, 0]
-    )
-    curve_isoparm_shape = cmds.listRelatives(curve_isoparm, shapes=True)[0]
-    curve_isoparm_shape = cmds.rename(curve_isoparm_shape, f"{curve_isoparm}Shape")
-    ensure_group(curve_isoparm, SHOW, ctrl_main=False)
+        # curves ------------------------------------------------------------------------------------------------------------
+        curve_isoparm = cmds.curve(
+            name=f"{CRV}_ribbon_isoparm", degree=3, point=([0, 0, 0]), knot=[0, 0, 0]
+        )
+        curve_isoparm_shape = cmds.listRelatives(curve_isoparm, shapes=True)[0]
+        curve_isoparm_shape = cmds.rename(curve_isoparm_shape, f"{curve_isoparm}Shape")
+        ensure_group(curve_isoparm, SHOW, ctrl_main=False)
 
-    attach_curve_node = cmds.createNode("attachCurve", name="attachCurve_spine")
-    rebuild_curve_node = cmds.createNode(
-        "rebuildCurve", name="rebuildCurve_extended_ribbon"
-    )
+        attach_curve_node = cmds.createNode("attachCurve", name="attachCurve_spine")
+        rebuild_curve_node = cmds.createNode(
+            "rebuildCurve", name="rebuildCurve_extended_ribbon"
+        )
 
-    cmds.setAttr(f"{attach_curve_node}.blendBias", 1)
-    cmds.setAttr(f"{attach_curve_node}.parameter", 1)
+        cmds.setAttr(f"{attach_curve_node}.blendBias", 1)
+        cmds.setAttr(f"{attach_curve_node}.parameter", 1)
 
-    cmds.setAttr(f"{rebuild_curve_node}.spans", 6)
-    cmds.setAttr(f"{rebuild_curve_node}.endKnots", 1)  # multiple end knots
-    cmds.setAttr(f"{rebuild_curve_node}.keepRange", 0)
-    cmds.setAttr(f"{rebuild_curve_node}.keepTangents", 0)
+        cmds.setAttr(f"{rebuild_curve_node}.spans", 6)
+        cmds.setAttr(f"{rebuild_curve_node}.endKnots", 1)  # multiple end knots
+        cmds.setAttr(f"{rebuild_curve_node}.keepRange", 0)
+        cmds.setAttr(f"{rebuild_curve_node}.keepTangents", 0)
 
-    cmds.connectAttr(
-        f"{curve_from_surface_iso_node}.outputCurve", f"{curve_isoparm_shape}.create"
-    )
-    cmds.connectAttr(
-        f"{curve_isoparm_shape}.worldSpace[0]", f"{attach_curve_node}.inputCurve1"
-    )
-    cmds.connectAttr(
-        f"{curve_squash_offset_shape}.worldSpace[0]", f"{attach_curve_node}.inputCurve2"
-    )
-    cmds.connectAttr(
-        f"{attach_curve_node}.outputCurve", f"{rebuild_curve_node}.inputCurve"
-    )
+        cmds.connectAttr(
+            f"{curve_from_surface_iso_node}.outputCurve", f"{curve_isoparm_shape}.create"
+        )
+        cmds.connectAttr(
+            f"{curve_isoparm_shape}.worldSpace[0]", f"{attach_curve_node}.inputCurve1"
+        )
+        cmds.connectAttr(
+            f"{curve_squash_offset_shape}.worldSpace[0]", f"{attach_curve_node}.inputCurve2"
+        )
+        cmds.connectAttr(
+            f"{attach_curve_node}.outputCurve", f"{rebuild_curve_node}.inputCurve"
+        )
 
-    ################################################################################################
-    curve_divide_by_initial_length_node = cmds.createNode(
-        "floatMath", name="curve_divide_by_initial_length"
-    )
-    cmds.setAttr(
-        f"{curve_divide_by_initial_length_node}.operation", 3
-    )  # operation : Divide
-    cmds.connectAttr(
-        f"{loc_info_axis_mid_spine_move}.ty",
-        f"{curve_divide_by_initial_length_node}.floatA",
-    )
-    cmds.connectAttr(
-        f"{loc_info_axis_mid_spine_move}.ty",
-        f"{curve_divide_by_initial_length_node}.floatB",
-    )
+        ################################################################################################
+        curve_divide_by_initial_length_node = cmds.createNode(
+            "floatMath", name="curve_divide_by_initial_length"
+        )
+        cmds.setAttr(
+            f"{curve_divide_by_initial_length_node}.operation", 3
+        )  # operation : Divide
+        cmds.connectAttr(
+            f"{loc_info_axis_mid_spine_move}.ty",
+            f"{curve_divide_by_initial_length_node}.floatA",
+        )
+        cmds.connectAttr(
+            f"{loc_info_axis_mid_spine_move}.ty",
+            f"{curve_divide_by_initial_length_node}.floatB",
+        )
+        deco_pelvis, deco_mid, deco_chest = "decMtx_point_5", "decMtx_point_2", "decMtx_point_4"
+        arc_length = f"{curve_info_node}.arcLength"
+
+    else:
+        # MATRIX SPLINE ---------------------------------------------------------------------------------------------
+        cv_masters = (
+            ctrl_ik_pelvis_master,
+            ctrl_tangent_pelvis_master,
+            ctrl_ik_mid_master,
+            ctrl_tangent_chest_master,
+            ctrl_ik_chest_master,
+        )
+        spline_outputs, arc_length = spline_matrices(
+            [f"{master}.{W_MTX}" for master in cv_masters],
+            [i / 6 for i in range(1, 6)],
+            name="spine",
+        )
+
+        # scale and rotation of the controls, read by the joints and the chest bind
+        decos = []
+        for master in (ctrl_ik_pelvis_master, ctrl_ik_mid_master, ctrl_ik_chest_master):
+            deco = cmds.createNode("decomposeMatrix", name=f"decMtx_{master}")
+            cmds.connectAttr(f"{master}.{W_MTX}", f"{deco}.inputMatrix")
+            decos.append(deco)
+        deco_pelvis, deco_mid, deco_chest = decos
 
     # bind joints ------------------------------------------------------------------------------------------------------
     average_node = cmds.createNode("plusMinusAverage", name="average_scale_pelvis_mid")
     cmds.setAttr(f"{average_node}.operation", 3)
-    cmds.connectAttr("decMtx_point_2.outputScale", f"{average_node}.input3D[0]")
-    cmds.connectAttr("decMtx_point_5.outputScale", f"{average_node}.input3D[1]")
+    cmds.connectAttr(f"{deco_mid}.outputScale", f"{average_node}.input3D[0]")
+    cmds.connectAttr(f"{deco_pelvis}.outputScale", f"{average_node}.input3D[1]")
 
     binds_grp = cmds.group(empty=True, name="Grp_binds_spine")
     ensure_group(binds_grp, SHOW)
@@ -435,86 +473,89 @@ def spine_matrix(start: str, end: str):
             type="matrix",
         )
 
-        # translate
-        poci_node = cmds.createNode("pointOnCurveInfo", name=f"poci_{joint}")
-        cmds.setAttr(f"{poci_node}.parameter", i / 6)
-        cmds.connectAttr(f"{rebuild_curve_node}.outputCurve", f"{poci_node}.inputCurve")
-        cmds.connectAttr(f"{poci_node}.position", f"{offset_grp}.translate")
-
-        blender_node = cmds.createNode(
-            "blendColors", name=f"blender_stretch_factor_{i:02}"
-        )
-        cmds.connectAttr(f"{ctrl_options}.Stretch", f"{blender_node}.blender")
-
-        # rotate
-        posi_node = cmds.createNode("pointOnSurfaceInfo", name=f"posi_{joint}")
-        vector_prod_node = cmds.createNode("vectorProduct", name=f"vp_{joint}")
-        fbf_matrix_node = cmds.createNode(
-            "fourByFourMatrix", name=f"fbf_matrix_{joint}"
-        )
-        deco_mtx_node = cmds.createNode("decomposeMatrix", name=f"deco_mtx_{joint}")
-
-        cmds.setAttr(f"{posi_node}.parameterU", 0.5)
-        cmds.connectAttr(
-            f"{rebulid_surface_node}.outputSurface", f"{posi_node}.inputSurface"
-        )
-
-        cmds.connectAttr(f"{posi_node}.normal", f"{vector_prod_node}.input1")
-        cmds.connectAttr(f"{posi_node}.tangentV", f"{vector_prod_node}.input2")
-        cmds.setAttr(f"{vector_prod_node}.operation", 2)
-
-        cmds.connectAttr(f"{posi_node}.normalX", f"{fbf_matrix_node}.in00")
-        cmds.connectAttr(f"{posi_node}.normalY", f"{fbf_matrix_node}.in01")
-        cmds.connectAttr(f"{posi_node}.normalZ", f"{fbf_matrix_node}.in02")
-        cmds.connectAttr(f"{posi_node}.tangentVx", f"{fbf_matrix_node}.in10")
-        cmds.connectAttr(f"{posi_node}.tangentVy", f"{fbf_matrix_node}.in11")
-        cmds.connectAttr(f"{posi_node}.tangentVz", f"{fbf_matrix_node}.in12")
-        cmds.connectAttr(f"{vector_prod_node}.outputX", f"{fbf_matrix_node}.in20")
-        cmds.connectAttr(f"{vector_prod_node}.outputY", f"{fbf_matrix_node}.in21")
-        cmds.connectAttr(f"{vector_prod_node}.outputZ", f"{fbf_matrix_node}.in22")
-        cmds.connectAttr(f"{posi_node}.positionX", f"{fbf_matrix_node}.in30")
-        cmds.connectAttr(f"{posi_node}.positionY", f"{fbf_matrix_node}.in31")
-        cmds.connectAttr(f"{posi_node}.positionZ", f"{fbf_matrix_node}.in32")
-
-        cmds.connectAttr(f"{fbf_matrix_node}.output", f"{deco_mtx_node}.inputMatrix")
-        cmds.connectAttr(f"{deco_mtx_node}.outputRotate", f"{offset_grp}.rotate")
-
-        # translate & rotate
-        exp = f"""
-        $stretch = ctrl_options.Stretch;
-        $ty = loc_info_axis_mid_spine_move.ty;
-        $arclen = curveInfo_spine_ribbon_isoparm.arcLength;
-
-        $no_stretch = {i/6} * $ty; 
-        $div_param = $no_stretch / $arclen;
-        float $out_neg_stretch_factor;
-
-        if ($div_param < {i/6}) {{
-            $out_neg_stretch_factor = $div_param;
-        }}
-
-        else {{
-            $out_neg_stretch_factor = {i/6};
-        }}
-
-        {blender_node}.color1R = {i/6};
-        {blender_node}.color2R = $out_neg_stretch_factor;
-        """
-        cmds.expression(
-            string=exp,
-            name=f"Exp_position_{joint}",
-            alwaysEvaluate=True,
-            unitConversion="all",
-        )
-
-        divide_node = cmds.createNode("floatMath", name=f"div_point_{joint}")
-        cmds.setAttr(f"{divide_node}.operation", 3)  # operation : Divide
-        cmds.connectAttr(f"{blender_node}.outputR", f"{divide_node}.floatA")
-        cmds.connectAttr(
-            f"{curve_divide_by_initial_length_node}.outFloat", f"{divide_node}.floatB"
-        )
-        cmds.connectAttr(f"{divide_node}.outFloat", f"{poci_node}.parameter")
-        cmds.connectAttr(f"{divide_node}.outFloat", f"{posi_node}.parameterV")
+        if mode == "ribbon":
+            # translate
+            poci_node = cmds.createNode("pointOnCurveInfo", name=f"poci_{joint}")
+            cmds.setAttr(f"{poci_node}.parameter", i / 6)
+            cmds.connectAttr(f"{rebuild_curve_node}.outputCurve", f"{poci_node}.inputCurve")
+            cmds.connectAttr(f"{poci_node}.position", f"{offset_grp}.translate")
+
+            blender_node = cmds.createNode(
+                "blendColors", name=f"blender_stretch_factor_{i:02}"
+            )
+            cmds.connectAttr(f"{ctrl_options}.Stretch", f"{blender_node}.blender")
+
+            # rotate
+            posi_node = cmds.createNode("pointOnSurfaceInfo", name=f"posi_{joint}")
+            vector_prod_node = cmds.createNode("vectorProduct", name=f"vp_{joint}")
+            fbf_matrix_node = cmds.createNode(
+                "fourByFourMatrix", name=f"fbf_matrix_{joint}"
+            )
+            deco_mtx_node = cmds.createNode("decomposeMatrix", name=f"deco_mtx_{joint}")
+
+            cmds.setAttr(f"{posi_node}.parameterU", 0.5)
+            cmds.connectAttr(
+                f"{rebulid_surface_node}.outputSurface", f"{posi_node}.inputSurface"
+            )
+
+            cmds.connectAttr(f"{posi_node}.normal", f"{vector_prod_node}.input1")
+            cmds.connectAttr(f"{posi_node}.tangentV", f"{vector_prod_node}.input2")
+            cmds.setAttr(f"{vector_prod_node}.operation", 2)
+
+            cmds.connectAttr(f"{posi_node}.normalX", f"{fbf_matrix_node}.in00")
+            cmds.connectAttr(f"{posi_node}.normalY", f"{fbf_matrix_node}.in01")
+            cmds.connectAttr(f"{posi_node}.normalZ", f"{fbf_matrix_node}.in02")
+            cmds.connectAttr(f"{posi_node}.tangentVx", f"{fbf_matrix_node}.in10")
+            cmds.connectAttr(f"{posi_node}.tangentVy", f"{fbf_matrix_node}.in11")
+            cmds.connectAttr(f"{posi_node}.tangentVz", f"{fbf_matrix_node}.in12")
+            cmds.connectAttr(f"{vector_prod_node}.outputX", f"{fbf_matrix_node}.in20")
+            cmds.connectAttr(f"{vector_prod_node}.outputY", f"{fbf_matrix_node}.in21")
+            cmds.connectAttr(f"{vector_prod_node}.outputZ", f"{fbf_matrix_node}.in22")
+            cmds.connectAttr(f"{posi_node}.positionX", f"{fbf_matrix_node}.in30")
+            cmds.connectAttr(f"{posi_node}.positionY", f"{fbf_matrix_node}.in31")
+            cmds.connectAttr(f"{posi_node}.positionZ", f"{fbf_matrix_node}.in32")
+
+            cmds.connectAttr(f"{fbf_matrix_node}.output", f"{deco_mtx_node}.inputMatrix")
+            cmds.connectAttr(f"{deco_mtx_node}.outputRotate", f"{offset_grp}.rotate")
+
+            # translate & rotate
+            exp = f"""
+            $stretch = ctrl_options.Stretch;
+            $ty = loc_info_axis_mid_spine_move.ty;
+            $arclen = curveInfo_spine_ribbon_isoparm.arcLength;
+
+            $no_stretch = {i/6} * $ty; 
+            $div_param = $no_stretch / $arclen;
+            float $out_neg_stretch_factor;
+
+            if ($div_param < {i/6}) {{
+                $out_neg_stretch_factor = $div_param;
+            }}
+
+            else {{
+                $out_neg_stretch_factor = {i/6};
+            }}
+
+            {blender_node}.color1R = {i/6};
+            {blender_node}.color2R = $out_neg_stretch_factor;
+            """
+            cmds.expression(
+                string=exp,
+                name=f"Exp_position_{joint}",
+                alwaysEvaluate=True,
+                unitConversion="all",
+            )
+
+            divide_node = cmds.createNode("floatMath", name=f"div_point_{joint}")
+            cmds.setAttr(f"{divide_node}.operation", 3)  # operation : Divide
+            cmds.connectAttr(f"{blender_node}.outputR", f"{divide_node}.floatA")
+            cmds.connectAttr(
+                f"{curve_divide_by_initial_length_node}.outFloat", f"{divide_node}.floatB"
+            )
+            cmds.connectAttr(f"{divide_node}.outFloat", f"{poci_node}.parameter")
+            cmds.connectAttr(f"{divide_node}.outFloat", f"{posi_node}.parameterV")
+        else:
+            cmds.connectAttr(spline_outputs[i - 1], f"{offset_grp}.offsetParentMatrix")
 
         # scale
         cmds.connectAttr(f"{average_node}.output3Dx", f"{offset_grp}.sz")
@@ -672,10 +713,10 @@ def spine_matrix(start: str, end: str):
 
     exp = f"""
     $mult_squash_min = {loc_info_axis_mid_spine_move}.ty;
-    $diff_initiallen_arclen = {loc_info_axis_mid_spine_move}.ty - {curve_info_node}.arcLength;
+    $diff_initiallen_arclen = {loc_info_axis_mid_spine_move}.ty - {arc_length};
 
     float $if_squash_max_value;
-    if ({curve_info_node}.arcLength < $mult_squash_min){{
+    if ({arc_length} < $mult_squash_min){{
         $if_squash_max_value = 1;
     }}
     else{{
@@ -848,7 +889,7 @@ def spine_matrix(start: str, end: str):
         cmds.connectAttr(f"{ctrl_options}.{vis}", f"{shape}.v")
 
     # VOLUME JOINTS
-    exp = """
+    exp = f"""
     $squash = ctrl_options.Squash;
     $stretch = ctrl_options.Stretch;
     $twist_chest = ctrl_options.Twist_Chest;
@@ -862,47 +903,47 @@ def spine_matrix(start: str, end: str):
 
     // Volume Activation -----------------------------------------
     float $out_volume_activation;
-    if ($volume_activation == 1){
-        $out_volume_activation = curveInfo_spine_ribbon_isoparm.arcLength / loc_info_axis_mid_spine_move.translateY;
-    }
+    if ($volume_activation == 1){{
+        $out_volume_activation = {arc_length} / loc_info_axis_mid_spine_move.translateY;
+    }}
 
-    else {
+    else {{
         $out_volume_activation = 1;
-    }
+    }}
 
     // Stretch Volume ---------------------------------------------
     float $out_stretch_volume;
-    if ($stretch_volume == 1){
+    if ($stretch_volume == 1){{
         $out_stretch_volume = 1;
-    }
-    else {
+    }}
+    else {{
         $out_stretch_volume = $stretch;
-    }
+    }}
 
     float $out_stretch_volume_02;
-    if ($out_stretch_volume == 1){
+    if ($out_stretch_volume == 1){{
         $out_stretch_volume_02 = 1 / $out_volume_activation;;
-    }
-    else {
+    }}
+    else {{
         $out_stretch_volume_02 = 1;
-    }
+    }}
 
     // Squash Volume ---------------------------------------------
     float $out_squash_volume;
-    if ($squash_volume == 1){
+    if ($squash_volume == 1){{
         $out_squash_volume = 1;
-    }
-    else {
+    }}
+    else {{
         $out_squash_volume = $squash;
-    }
+    }}
 
     float $out_squash_volume_02;
-    if ($out_squash_volume == 1){
+    if ($out_squash_volume == 1){{
         $out_squash_volume_02 = $out_stretch_volume_02;
-    }
-    else {
+    }}
+    else {{
         $out_squash_volume_02 = 1;
-    }
+    }}
 
     // Factor Volume -----------------------------------------------
     float $factor_volume_XZ = $out_squash_volume_02 * $volume_factor;
@@ -970,62 +1011,68 @@ def spine_matrix(start: str, end: str):
     cmds.connectAttr(f"{add_node}.output", f"{bind_pelvis_move}.ry", force=True)
 
     # constrain bind_chest_move
-    poci_node = cmds.createNode("pointOnCurveInfo", name=f"poci_{joint}")
-    cmds.setAttr(f"{poci_node}.parameter", i / 6)
-    cmds.connectAttr(f"{rebuild_curve_node}.outputCurve", f"{poci_node}.inputCurve")
-    cmds.connectAttr(f"{poci_node}.position", f"{bind_chest_move}.translate")
+    if mode == "ribbon":
+        poci_node = cmds.createNode("pointOnCurveInfo", name=f"poci_{joint}")
+        cmds.setAttr(f"{poci_node}.parameter", i / 6)
+        cmds.connectAttr(f"{rebuild_curve_node}.outputCurve", f"{poci_node}.inputCurve")
+        cmds.connectAttr(f"{poci_node}.position", f"{bind_chest_move}.translate")
 
-    blender_node = cmds.createNode("blendColors", name=f"blender_stretch_factor_{i:02}")
-    cmds.connectAttr(f"{ctrl_options}.Stretch", f"{blender_node}.blender")
+        blender_node = cmds.createNode("blendColors", name=f"blender_stretch_factor_{i:02}")
+        cmds.connectAttr(f"{ctrl_options}.Stretch", f"{blender_node}.blender")
 
-    exp = f"""
-    $stretch = ctrl_options.Stretch;
-    $ty = loc_info_axis_mid_spine_move.ty;
-    $arclen = curveInfo_spine_ribbon_isoparm.arcLength;
+        exp = f"""
+        $stretch = ctrl_options.Stretch;
+        $ty = loc_info_axis_mid_spine_move.ty;
+        $arclen = curveInfo_spine_ribbon_isoparm.arcLength;
 
-    $no_stretch = 1 * $ty; 
-    $div_param = $no_stretch / $arclen;
-    float $out_neg_stretch_factor;
+        $no_stretch = 1 * $ty; 
+        $div_param = $no_stretch / $arclen;
+        float $out_neg_stretch_factor;
 
-    if ($div_param < 1) {{
-        $out_neg_stretch_factor = $div_param;
-    }}
+        if ($div_param < 1) {{
+            $out_neg_stretch_factor = $div_param;
+        }}
 
-    else {{
-        $out_neg_stretch_factor = 1;
-    }}
+        else {{
+            $out_neg_stretch_factor = 1;
+        }}
 
-    {blender_node}.color1R = 1;
-    {blender_node}.color2R = $out_neg_stretch_factor;
-    {poci_node}.parameter = {blender_node}.outputR / ($ty/$ty);
-    """
-    cmds.expression(
-        string=exp,
-        name=f"Exp_position_{bind_chest_move}",
-        alwaysEvaluate=True,
-        unitConversion="all",
-    )
+        {blender_node}.color1R = 1;
+        {blender_node}.color2R = $out_neg_stretch_factor;
+        {poci_node}.parameter = {blender_node}.outputR / ($ty/$ty);
+        """
+        cmds.expression(
+            string=exp,
+            name=f"Exp_position_{bind_chest_move}",
+            alwaysEvaluate=True,
+            unitConversion="all",
+        )
+    else:
+        cmds.connectAttr(f"{deco_chest}.outputTranslate", f"{bind_chest_move}.translate")
 
-    cmds.connectAttr("decMtx_point_4.outputScale", f"{bind_chest_move}.s")
-    cmds.connectAttr("decMtx_point_4.outputRotateX", f"{bind_chest_move}.rx")
-    cmds.connectAttr("decMtx_point_4.outputRotateZ", f"{bind_chest_move}.rz")
+    cmds.connectAttr(f"{deco_chest}.outputScale", f"{bind_chest_move}.s")
+    cmds.connectAttr(f"{deco_chest}.outputRotateX", f"{bind_chest_move}.rx")
+    cmds.connectAttr(f"{deco_chest}.outputRotateZ", f"{bind_chest_move}.rz")
 
     add_node = cmds.createNode("addDoubleLinear", name="add_twist_chest")
     cmds.connectAttr(f"{ctrl_options}.Twist_Chest", f"{add_node}.input1")
-    cmds.connectAttr(f"decMtx_point_4.outputRotateY", f"{add_node}.input2")
+    cmds.connectAttr(f"{deco_chest}.outputRotateY", f"{add_node}.input2")
     cmds.connectAttr(f"{add_node}.output", f"{bind_chest_move}.ry", force=True)
 
-    cmds.setAttr(f"{ribbon_surface}.v", 0)
     cmds.setAttr(f"{loc_info_axis_mid_ik_pelvis}.v", 0)
     cmds.setAttr(f"{loc_info_axis_mid_spine}.v", 0)
     cmds.setAttr(f"{loc_info_pelvis}.v", 0)
     cmds.setAttr(f"{loc_info_squash_chest}.v", 0)
     cmds.setAttr(f"{loc_info_squash_initial_length}.v", 0)
-    cmds.setAttr(f"{curve_isoparm}.v", 0)
-    cmds.setAttr(f"{curve_squash_offset}.v", 0)
+    if mode == "ribbon":
+        cmds.setAttr(f"{ribbon_surface}.v", 0)
+        cmds.setAttr(f"{curve_isoparm}.v", 0)
+        cmds.setAttr(f"{curve_squash_offset}.v", 0)
 
     cmds.setAttr(f"{ctrl_options}.Stretch_Volume", cb=False, k=False)
     cmds.setAttr(f"{ctrl_options}.Squash_Volume", cb=False, k=False)
+    if mode == "matrix":
+        cmds.setAttr(f"{ctrl_options}.Stretch", 1, lock=True, cb=False, k=False)
 
     # add intermediate fk controls
     root_pivot_group = cmds.group(empty=True, name="grp_root_pivot")
@@ -1115,3 +1162,37 @@ def spine_matrix(start: str, end: str):
     cmds.expression(string=sine_exp, name="Exp_sine_spine")
 
     om.MGlobal.displayInfo("Spine Matrix done.")
+
+
+def _benchmark_spine_modes(frames: int = 100) -> dict:
+    """Compare the node count and playback speed of the ribbon and matrix spines with animated ik controls.
+
+    Opens a new scene for each mode, see benchmark_builds.
+
+    Returns:
+        dict: Number of created nodes and played frames per second for each mode.
+    """
+
+    def setup(frames: int):
+        start = cmds.spaceLocator(name="benchmark_start")[0]
+        end = cmds.spaceLocator(name="benchmark_end")[0]
+        cmds.setAttr(f"{start}.t", 0, 10, 0)
+        cmds.setAttr(f"{end}.t", 0, 16, 0)
+
+    def animate(frames: int):
+        for attribute, ctrl, value in (
+            ("translateX", "ctrl_ik_chest", 2.0),
+            ("rotateY", "ctrl_ik_chest", 45.0),
+            ("translateZ", "ctrl_ik_mid", 1.5),
+            ("translateY", "ctrl_ik_chest", 2.0),
+        ):
+            cmds.setKeyframe(ctrl, attribute=attribute, time=1, value=0)
+            cmds.setKeyframe(ctrl, attribute=attribute, time=frames, value=value)
+
+    return benchmark_builds(
+        ("ribbon", "matrix"),
+        lambda mode: spine_matrix("benchmark_start", "benchmark_end", mode=mode),
+        setup=setup,
+        animate=animate,
+        frames=frames,
+    )
@@ -1,7 +1,5 @@
 from ...utils.imports import *
-from .. import constants_maya
 
-reload(constants_maya)
 from ..constants_maya import *
 
 
@@ -11,4 +11,31 @@ from .create_node import (
     multiplyDivide,
     remapValue,
     condition
-)
\ No newline at end of file
+)
+from .attribute import (
+    getPlug,
+    setPlug,
+    connect,
+    addAttribute,
+    addAttributes
+)
+from .node import Node
+from .topology import (
+    Topology,
+    meshPath,
+    componentIndices,
+    componentIndicesByMesh,
+    getTopology,
+    invalidateTopology,
+    clearTopologyCache
+)
+from .undo import (
+    recordUndo,
+    modifierUndo
+)
+from .graph import (
+    GraphBuilder,
+    ModifierBackend,
+    CmdsBackend,
+    RecordingBackend
+)
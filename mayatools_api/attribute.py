@@ -1,2 +1,205 @@
 from maya.api import OpenMaya as om
 
+NUMERIC_TYPES = {
+    "bool": om.MFnNumericData.kBoolean,
+    "short": om.MFnNumericData.kShort,
+    "long": om.MFnNumericData.kInt,
+    "float": om.MFnNumericData.kFloat,
+    "double": om.MFnNumericData.kDouble,
+}
+
+_INT_TYPES = (
+    om.MFnNumericData.kByte,
+    om.MFnNumericData.kChar,
+    om.MFnNumericData.kShort,
+    om.MFnNumericData.kInt,
+    om.MFnNumericData.kInt64,
+)
+
+
+def getPlug(plug: om.MPlug):
+    """Get the value of a plug the way maya.cmds.getAttr would.
+
+    Compound plugs return a tuple of their children values, matrices return an MMatrix and unit attributes are
+    converted to the current ui units.
+    """
+
+    if plug.isCompound:
+        return tuple(getPlug(plug.child(i)) for i in range(plug.numChildren()))
+
+    attribute = plug.attribute()
+
+    if attribute.hasFn(om.MFn.kNumericAttribute):
+        numeric_type = om.MFnNumericAttribute(attribute).numericType()
+        if numeric_type == om.MFnNumericData.kBoolean:
+            return plug.asBool()
+        if numeric_type in _INT_TYPES:
+            return plug.asInt()
+        return plug.asDouble()
+
+    if attribute.hasFn(om.MFn.kUnitAttribute):
+        unit_type = om.MFnUnitAttribute(attribute).unitType()
+        if unit_type == om.MFnUnitAttribute.kAngle:
+            return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+        if unit_type == om.MFnUnitAttribute.kDistance:
+            return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+        return plug.asDouble()
+
+    if attribute.hasFn(om.MFn.kEnumAttribute):
+        return plug.asShort()
+
+    data = plug.asMObject()
+    if data.hasFn(om.MFn.kMatrixData):
+        return om.MFnMatrixData(data).matrix()
+    if data.hasFn(om.MFn.kStringData):
+        return plug.asString()
+
+    return plug.asDouble()
+
+
+def setPlug(plug: om.MPlug, values: tuple, modifier: om.MDGModifier = None):
+    """Set the value of a plug from maya.cmds.setAttr style values.
+
+    Values are converted from the attribute type : a single MMatrix or sequence of 16 numbers sets a matrix, several
+    values set the children of a compound and unit attributes expect ui units. The value is set immediately, or
+    queued on the modifier when one is given.
+    """
+
+    if len(values) == 1 and isinstance(values[0], (om.MMatrix, list, tuple)):
+        value = values[0]
+        if isinstance(value, om.MMatrix) or (len(value) == 16 and not plug.isCompound):
+            data = om.MFnMatrixData().create(om.MMatrix(value))
+            _assign(plug, "MObject", data, modifier)
+            return
+        values = tuple(value)
+
+    if plug.isCompound:
+        for index, value in enumerate(values):
+            setPlug(plug.child(index), (value,), modifier)
+        return
+
+    if len(values) == 16:
+        data = om.MFnMatrixData().create(om.MMatrix(values))
+        _assign(plug, "MObject", data, modifier)
+        return
+
+    value = values[0]
+    attribute = plug.attribute()
+
+    if isinstance(value, str):
+        _assign(plug, "String", value, modifier)
+
+    elif attribute.hasFn(om.MFn.kUnitAttribute):
+        unit_type = om.MFnUnitAttribute(attribute).unitType()
+        if unit_type == om.MFnUnitAttribute.kAngle:
+            _assign(plug, "MAngle", om.MAngle(value, om.MAngle.uiUnit()), modifier)
+        elif unit_type == om.MFnUnitAttribute.kDistance:
+            _assign(plug, "MDistance", om.MDistance(value, om.MDistance.uiUnit()), modifier)
+        else:
+            _assign(plug, "Double", float(value), modifier)
+
+    elif attribute.hasFn(om.MFn.kNumericAttribute):
+        numeric_type = om.MFnNumericAttribute(attribute).numericType()
+        if numeric_type == om.MFnNumericData.kBoolean:
+            _assign(plug, "Bool", bool(value), modifier)
+        elif numeric_type in _INT_TYPES:
+            _assign(plug, "Int", int(value), modifier)
+        else:
+            _assign(plug, "Double", float(value), modifier)
+
+    elif attribute.hasFn(om.MFn.kEnumAttribute):
+        _assign(plug, "Int", int(value), modifier)
+
+    else:
+        _assign(plug, "Double", float(value), modifier)
+
+
+def _assign(plug: om.MPlug, value_type: str, value, modifier: om.MDGModifier = None):
+
+    if modifier is None:
+        getattr(plug, f"set{value_type}")(value)
+    elif value_type == "MObject":
+        modifier.newPlugValue(plug, value)
+    else:
+        getattr(modifier, f"newPlugValue{value_type}")(plug, value)
+
+
+def connect(source: om.MPlug, destination: om.MPlug, force: bool = False, modifier: om.MDGModifier = None):
+    """Connect two plugs, immediately or queued on the modifier when one is given."""
+
+    do_it = modifier is None
+    modifier = modifier or om.MDGModifier()
+
+    if force and destination.isDestination:
+        modifier.disconnect(destination.source(), destination)
+    modifier.connect(source, destination)
+
+    if do_it:
+        modifier.doIt()
+
+
+def addAttribute(
+    node: om.MObject,
+    long_name: str,
+    attribute_type: str = "float",
+    default_value=0.0,
+    min_value=None,
+    max_value=None,
+    keyable: bool = True,
+    channel_box: bool = False,
+    nice_name: str = None,
+    modifier: om.MDGModifier = None,
+) -> om.MObject:
+    """Add a numeric or matrix attribute to a node, immediately or queued on the modifier when one is given.
+
+    Args:
+        node (om.MObject): The node to add the attribute to.
+        long_name (str): The attribute name, also used as short name.
+        attribute_type (str): "matrix" or one of NUMERIC_TYPES, named like the cmds.addAttr attributeType flag.
+
+    Returns:
+        om.MObject: The new attribute.
+    """
+
+    if attribute_type == "matrix":
+        fn_attribute = om.MFnMatrixAttribute()
+        attribute = fn_attribute.create(long_name, long_name)
+
+    else:
+        fn_attribute = om.MFnNumericAttribute()
+        attribute = fn_attribute.create(long_name, long_name, NUMERIC_TYPES[attribute_type], default_value)
+        if min_value is not None:
+            fn_attribute.setMin(min_value)
+        if max_value is not None:
+            fn_attribute.setMax(max_value)
+
+    fn_attribute.keyable = keyable
+    fn_attribute.channelBox = channel_box
+    if nice_name:
+        fn_attribute.niceName = nice_name
+
+    do_it = modifier is None
+    modifier = modifier or om.MDGModifier()
+    modifier.addAttribute(node, attribute)
+    if do_it:
+        modifier.doIt()
+
+    return attribute
+
+
+def addAttributes(node: om.MObject, attributes: list, modifier: om.MDGModifier = None) -> list:
+    """Add several attributes to a node in a single modifier, done right away.
+
+    Args:
+        node (om.MObject): The node to add the attributes to.
+        attributes (list): Dictionaries of addAttribute keyword arguments.
+        modifier (om.MDGModifier): Modifier to add the attributes with, a new one when None.
+
+    Returns:
+        list: The new attributes.
+    """
+
+    modifier = modifier or om.MDGModifier()
+    new_attributes = [addAttribute(node, modifier=modifier, **kwargs) for kwargs in attributes]
+    modifier.doIt()
+    return new_attributes
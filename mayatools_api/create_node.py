@@ -1,7 +1,13 @@
 from maya.api import OpenMaya as om
 
-def createNode(node_type: str, name: str = None) -> om.MObject:
+def createNode(node_type: str, name: str = None, modifier: om.MDGModifier = None, parent: om.MObject = None) -> om.MObject:
     
+    if modifier:
+        node = modifier.createNode(node_type) if parent is None else modifier.createNode(node_type, parent)
+        if name:
+            modifier.renameNode(node, name)
+        return node
+
     fn_dependency_node = om.MFnDependencyNode()
     fn_dependency_node.create(node_type)
     node = fn_dependency_node.object()
@@ -0,0 +1,261 @@
+import itertools
+
+from maya.api import OpenMaya as om
+from maya import cmds
+
+from .attribute import addAttribute, setPlug
+from .create_node import createNode
+from .undo import modifierUndo
+
+# unique id of each node requested from a builder, "#" can't be part of a Maya node name
+_TOKENS = itertools.count()
+
+
+class GraphBuilder:
+    """Collect the node creations, attribute values and connections of a rig part and commit them in one pass.
+
+    The methods mirror the maya.cmds calls they replace and plugs are "node.attribute" strings. createNode returns
+    a token such as "name#12" standing for the node until it exists, Maya may give it another name when the requested
+    one is taken. Only the tokens are replaced by the created nodes, any other name is a node of the scene. Nothing
+    happens in the scene until commit is called, the operations are then replayed on a backend : ModifierBackend
+    batches them in OpenMaya modifiers, CmdsBackend issues one maya.cmds call each and RecordingBackend only records
+    them.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.attributes = []
+        self.values = []
+        self.connections = []
+        self.backend = None
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.attributes) + len(self.values) + len(self.connections)
+
+    def createNode(self, node_type: str, name: str, parent: str = None) -> str:
+        """Queue a node creation.
+
+        Returns:
+            str: Token of the node, to use in the plugs of the builder and in the names returned by commit.
+        """
+
+        token = f"{name}#{next(_TOKENS)}"
+        self.nodes.append((node_type, name, parent, token))
+        return token
+
+    def addAttr(
+        self,
+        node: str,
+        longName: str,
+        attributeType: str = "float",
+        defaultValue: float = 0.0,
+        minValue: float = None,
+        maxValue: float = None,
+        keyable: bool = True,
+        channelBox: bool = False,
+        niceName: str = None,
+    ):
+        """Add a numeric attribute. channelBox shows a non keyable attribute in the channel box, as the
+        maya.cmds.setAttr flag does."""
+
+        self.attributes.append(
+            (node, longName, attributeType, defaultValue, minValue, maxValue, keyable, channelBox, niceName)
+        )
+
+    def setAttr(self, plug: str, *values, type: str = None):
+        self.values.append((plug, values, type))
+
+    def connectAttr(self, source: str, destination: str, force: bool = False):
+        self.connections.append((source, destination, force))
+
+    def commit(self, backend=None, undoable: bool = True) -> dict:
+        """Replay the collected operations : nodes are created first, then attributes are added, set and connected.
+
+        Args:
+            backend: The backend to commit to. Defaults to a new ModifierBackend.
+            undoable (bool): Put a ModifierBackend commit on the Maya undo queue as one step. The maya.cmds calls of
+                the CmdsBackend are always undoable.
+
+        Returns:
+            dict: The actual name of every created node, keyed by its token.
+        """
+
+        self.backend = backend or ModifierBackend()
+        names = self.backend.commit(self.nodes, self.values, self.connections, self.attributes)
+        self.nodes, self.attributes, self.values, self.connections = [], [], [], []
+        if undoable and isinstance(self.backend, ModifierBackend):
+            modifierUndo(*self.backend.modifiers)
+        return names
+
+    def undo(self):
+        """Undo the last commit directly, only supported by the ModifierBackend. Meant for commits which are not on
+        the Maya undo queue, undoing an undoable commit again with Maya would fail."""
+
+        if self.backend:
+            self.backend.undo()
+            self.backend = None
+
+
+class ModifierBackend:
+    """Commit graph operations through an MDGModifier and an MDagModifier."""
+
+    _dag_types = {}
+
+    def __init__(self):
+        self.modifiers = []
+
+    def commit(self, nodes: list, values: list, connections: list, attributes: list = ()) -> dict:
+        """Do the operations, the modifiers already done are undone when one of them fails."""
+
+        self.modifiers = []
+        try:
+            return self._commit(nodes, values, connections, attributes)
+        except Exception:
+            self.undo()
+            raise
+
+    def _commit(self, nodes: list, values: list, connections: list, attributes: list) -> dict:
+
+        dg_modifier = om.MDGModifier()
+        dag_modifier = om.MDagModifier()
+
+        objects = {}
+        for node_type, name, parent, token in nodes:
+            if parent or self.is_dag(node_type):
+                parent_object = objects.get(parent) or _object(parent) if parent else om.MObject.kNullObj
+                objects[token] = createNode(node_type, name, dag_modifier, parent_object)
+            else:
+                objects[token] = createNode(node_type, name, dg_modifier)
+
+        self._do(dg_modifier)
+        self._do(dag_modifier)
+        names = {token: om.MFnDependencyNode(node).name() for token, node in objects.items()}
+
+        # values and connections need the created nodes and attributes to resolve their plugs
+        attribute_modifier = om.MDGModifier()
+        for node, long_name, attribute_type, default, minimum, maximum, keyable, channel_box, nice_name in attributes:
+            addAttribute(
+                objects.get(node) or _object(node),
+                long_name,
+                attribute_type,
+                default,
+                minimum,
+                maximum,
+                keyable,
+                channel_box,
+                nice_name,
+                attribute_modifier,
+            )
+        self._do(attribute_modifier)
+
+        modifier = om.MDGModifier()
+        for plug, plug_values, _ in values:
+            setPlug(_plug(plug, names), plug_values, modifier)
+
+        for source, destination, force in connections:
+            destination_plug = _plug(destination, names)
+            if force and destination_plug.isDestination:
+                modifier.disconnect(destination_plug.source(), destination_plug)
+            modifier.connect(_plug(source, names), destination_plug)
+
+        self._do(modifier)
+        return names
+
+    def _do(self, modifier: om.MDGModifier):
+        # kept before doIt, a modifier failing partway has done part of its operations
+        self.modifiers.append(modifier)
+        modifier.doIt()
+
+    def undo(self):
+        for modifier in reversed(self.modifiers):
+            modifier.undoIt()
+        self.modifiers = []
+
+    @classmethod
+    def is_dag(cls, node_type: str) -> bool:
+        if node_type not in cls._dag_types:
+            inherited = cmds.nodeType(node_type, isTypeName=True, inherited=True) or []
+            cls._dag_types[node_type] = "dagNode" in inherited
+        return cls._dag_types[node_type]
+
+
+class CmdsBackend:
+    """Commit graph operations with one maya.cmds call each, matches the behaviour of unbatched builders."""
+
+    def commit(self, nodes: list, values: list, connections: list, attributes: list = ()) -> dict:
+
+        names = {}
+        for node_type, name, parent, token in nodes:
+            if parent:
+                names[token] = cmds.createNode(node_type, name=name, parent=names.get(parent, parent), skipSelect=True)
+            else:
+                names[token] = cmds.createNode(node_type, name=name, skipSelect=True)
+
+        for node, long_name, attribute_type, default, minimum, maximum, keyable, channel_box, nice_name in attributes:
+            flags = dict(longName=long_name, attributeType=attribute_type, defaultValue=default, keyable=keyable)
+            if minimum is not None:
+                flags["minValue"] = minimum
+            if maximum is not None:
+                flags["maxValue"] = maximum
+            if nice_name:
+                flags["niceName"] = nice_name
+            cmds.addAttr(names.get(node, node), **flags)
+            if channel_box and not keyable:
+                cmds.setAttr(f"{names.get(node, node)}.{long_name}", channelBox=True)
+
+        for plug, plug_values, data_type in values:
+            if data_type:
+                cmds.setAttr(_path(plug, names), *plug_values, type=data_type)
+            else:
+                cmds.setAttr(_path(plug, names), *plug_values)
+
+        for source, destination, force in connections:
+            cmds.connectAttr(_path(source, names), _path(destination, names), force=force)
+
+        return names
+
+    def undo(self):
+        raise RuntimeError("The cmds backend commits are on the Maya undo queue, undo them with cmds.undo")
+
+
+class RecordingBackend:
+    """Record graph operations without touching the scene, used to test builders and count their operations."""
+
+    def __init__(self):
+        self.calls = []
+
+    def commit(self, nodes: list, values: list, connections: list, attributes: list = ()) -> dict:
+
+        names = {token: name for _, name, _, token in nodes}
+        for node_type, name, parent, _ in nodes:
+            self.calls.append(("createNode", node_type, name, names.get(parent, parent)))
+        for node, long_name, *_ in attributes:
+            self.calls.append(("addAttr", names.get(node, node), long_name))
+        for plug, plug_values, data_type in values:
+            self.calls.append(("setAttr", _path(plug, names), plug_values, data_type))
+        for source, destination, force in connections:
+            self.calls.append(("connectAttr", _path(source, names), _path(destination, names), force))
+
+        return names
+
+    def undo(self):
+        self.calls = []
+
+
+def _path(plug: str, names: dict) -> str:
+    """Replace the token of a plug by the created node, the names without token are scene nodes."""
+
+    node, _, attribute = plug.partition(".")
+    return f"{names.get(node, node)}.{attribute}"
+
+
+def _plug(plug: str, names: dict) -> om.MPlug:
+    selection = om.MSelectionList()
+    selection.add(_path(plug, names))
+    return selection.getPlug(0)
+
+
+def _object(node: str) -> om.MObject:
+    selection = om.MSelectionList()
+    selection.add(node)
+    return selection.getDependNode(0)
@@ -0,0 +1,87 @@
+from typing import Union
+
+from maya.api import OpenMaya as om
+
+from .attribute import addAttributes, connect, getPlug, setPlug
+from .create_node import createNode
+
+
+class Node:
+    """Handle on a dependency node.
+
+    The MObject, its function set and every plug looked up through the handle are cached, so repeated accesses don't
+    resolve the node name again. The handle stays valid when the node is renamed.
+    """
+
+    def __init__(self, node: Union[str, om.MObject, "Node"]):
+
+        if isinstance(node, Node):
+            node = node.object
+
+        elif isinstance(node, str):
+            selection = om.MSelectionList()
+            selection.add(node)
+            node = selection.getDependNode(0)
+
+        self.object = node
+        self.handle = om.MObjectHandle(node)
+        self.fn = om.MFnDependencyNode(node)
+        self._plugs = {}
+
+    @classmethod
+    def create(cls, node_type: str, name: str = None, modifier: om.MDGModifier = None) -> "Node":
+        """Create a node, through the modifier when one is given so that undoing the modifier deletes it. The modifier
+        is done right away, the handle can be used at once."""
+
+        node = createNode(node_type, name, modifier)
+        if modifier:
+            modifier.doIt()
+        return cls(node)
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def name(self) -> str:
+        if self.object.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(self.object).partialPathName()
+        return self.fn.name()
+
+    def isValid(self) -> bool:
+        return self.handle.isValid()
+
+    def hasAttribute(self, attribute: str) -> bool:
+        return self.fn.hasAttribute(attribute)
+
+    def plug(self, attribute: str) -> om.MPlug:
+        """Get a plug from an attribute path such as "translateX" or "wtMatrix[0].matrixIn"."""
+
+        plug = self._plugs.get(attribute)
+        if plug is None:
+            if "." in attribute or "[" in attribute:
+                selection = om.MSelectionList()
+                selection.add(f"{self.name}.{attribute}")
+                plug = selection.getPlug(0)
+            else:
+                plug = self.fn.findPlug(attribute, False)
+            self._plugs[attribute] = plug
+        return plug
+
+    def get(self, attribute: str):
+        return getPlug(self.plug(attribute))
+
+    def set(self, attribute: str, *values, modifier: om.MDGModifier = None):
+        setPlug(self.plug(attribute), values, modifier)
+
+    def connect(
+        self,
+        attribute: str,
+        destination: "Node",
+        destination_attribute: str,
+        force: bool = False,
+        modifier: om.MDGModifier = None,
+    ):
+        connect(self.plug(attribute), destination.plug(destination_attribute), force, modifier)
+
+    def addAttributes(self, attributes: list, modifier: om.MDGModifier = None) -> list:
+        return addAttributes(self.object, attributes, modifier)
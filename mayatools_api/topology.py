@@ -0,0 +1,340 @@
+import hashlib
+from typing import Union
+
+import numpy as np
+from maya.api import OpenMaya as om
+
+_TOPOLOGIES = {}
+
+
+def _csr(rows: np.ndarray, values: np.ndarray, row_count: int) -> tuple:
+    """Group values by row as compressed sparse rows (row pointers, values)."""
+
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=indptr[1:])
+    return indptr, values[order]
+
+
+class Topology:
+    """Connectivity of a mesh as NumPy arrays.
+
+    The face-vertex lists are read once. Edges, incidences and adjacencies are built on first access and kept, so
+    every tool working on the same mesh shares them. Use getTopology to get the cached instance of a mesh.
+    """
+
+    def __init__(self, mesh_fn: om.MFnMesh):
+
+        counts, connects = mesh_fn.getVertices()
+        self.mesh_fn = mesh_fn
+        self.vertexCount = mesh_fn.numVertices
+        self.edgeCount = mesh_fn.numEdges
+        self.faceCount = mesh_fn.numPolygons
+        self.faceCounts = np.array(counts, dtype=np.int64)
+        self.faceVertices = np.array(connects, dtype=np.int64)
+        self.faceOffsets = np.zeros(self.faceCount + 1, dtype=np.int64)
+        np.cumsum(self.faceCounts, out=self.faceOffsets[1:])
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.faceCounts.astype(np.int32).tobytes())
+        digest.update(self.faceVertices.astype(np.int32).tobytes())
+        self.fingerprint = (self.vertexCount, self.faceCount, digest.hexdigest())
+
+        self._cache = {}
+
+    def counts(self) -> tuple:
+        return self.vertexCount, self.edgeCount, self.faceCount
+
+    def _cached(self, key: str, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def faceVertexNext(self) -> np.ndarray:
+        """Index of the next face-vertex of each face-vertex, wrapping around each face."""
+
+        def build():
+            following = np.arange(len(self.faceVertices)) + 1
+            ends = np.repeat(self.faceOffsets[1:], self.faceCounts)
+            wrapped = following == ends
+            following[wrapped] = np.repeat(self.faceOffsets[:-1], self.faceCounts)[wrapped]
+            return following
+
+        return self._cached("faceVertexNext", build)
+
+    def edges(self) -> np.ndarray:
+        """Vertex pairs of the edges, in Maya edge index order, of shape (edge count, 2). Built from the face edges,
+        each edge gets the pair of a face-vertex and the next one."""
+
+        def build():
+            face_edges = self.faceEdges()
+            edges = np.zeros((self.edgeCount, 2), dtype=np.int64)
+            edges[face_edges, 0] = self.faceVertices
+            edges[face_edges, 1] = self.faceVertices[self.faceVertexNext()]
+            return edges
+
+        return self._cached("edges", build)
+
+    def faceEdges(self) -> np.ndarray:
+        """Edge of each face-vertex, going to the next face-vertex, in the layout of faceVertices. Read in a single
+        pass on the faces, which list their edges in face-vertex order."""
+
+        def build():
+            face_edges = []
+            polygon_it = om.MItMeshPolygon(self.mesh_fn.object())
+            while not polygon_it.isDone():
+                face_edges.extend(polygon_it.getEdges())
+                polygon_it.next()
+            return np.array(face_edges, dtype=np.int64)
+
+        return self._cached("faceEdges", build)
+
+    def faceEdgeIds(self, face: int) -> np.ndarray:
+        return self.faceEdges()[self.faceOffsets[face] : self.faceOffsets[face + 1]]
+
+    def edgeFaces(self) -> tuple:
+        """Faces of each edge as compressed sparse rows (row pointers, face indices)."""
+
+        faces = np.repeat(np.arange(self.faceCount), self.faceCounts)
+        return self._cached("edgeFaces", lambda: _csr(self.faceEdges(), faces, self.edgeCount))
+
+    def vertexEdges(self) -> tuple:
+        """Edges of each vertex as compressed sparse rows (row pointers, edge indices)."""
+
+        def build():
+            edges = self.edges()
+            ids = np.arange(self.edgeCount)
+            return _csr(edges.ravel(), np.repeat(ids, 2), self.vertexCount)
+
+        return self._cached("vertexEdges", build)
+
+    def vertexAdjacency(self) -> tuple:
+        """Neighbour vertices of each vertex as compressed sparse rows (row pointers, vertex indices), sorted per
+        row. Built from the face-vertex lists only."""
+
+        def build():
+            following = self.faceVertices[self.faceVertexNext()]
+            starts = np.concatenate((self.faceVertices, following))
+            ends = np.concatenate((following, self.faceVertices))
+            keys = np.unique(starts * self.vertexCount + ends)
+
+            indptr = np.zeros(self.vertexCount + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // self.vertexCount, minlength=self.vertexCount), out=indptr[1:])
+            return indptr, keys % self.vertexCount
+
+        return self._cached("vertexAdjacency", build)
+
+    def oppositeEdges(self, face: int) -> tuple:
+        """Get the lowest edge of a face and the next lowest edge sharing no vertex with it."""
+
+        pair = self.oppositeEdgePairs([face])[0]
+        if pair[1] >= 0:
+            return int(pair[0]), int(pair[1])
+
+    def oppositeEdgePairs(self, faces: np.ndarray) -> np.ndarray:
+        """Get the lowest edge of each face and the next lowest edge sharing no vertex with it, in one pass.
+
+        Face edges are laid out in face-vertex order, so two edges share a vertex when their positions in the face are
+        neighbours.
+
+        Returns:
+            np.ndarray: Edge pairs of shape (face count, 2), the second edge is -1 for triangles.
+        """
+
+        faces = np.asarray(faces, dtype=np.int64)
+        counts = self.faceCounts[faces]
+        starts = np.zeros(len(faces), dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+
+        local = np.arange(counts.sum()) - np.repeat(starts, counts)
+        edges = self.faceEdges()[np.repeat(self.faceOffsets[faces], counts) + local]
+
+        lowest = np.minimum.reduceat(edges, starts)
+        is_lowest = edges == np.repeat(lowest, counts)
+        lowest_position = np.zeros(len(faces), dtype=np.int64)
+        lowest_position[np.repeat(np.arange(len(faces)), counts)[is_lowest]] = local[is_lowest]
+
+        distance = (local - np.repeat(lowest_position, counts)) % np.repeat(counts, counts)
+        separated = (distance > 1) & (distance < np.repeat(counts, counts) - 1)
+        opposite = np.minimum.reduceat(np.where(separated, edges, self.edgeCount), starts)
+        opposite[opposite == self.edgeCount] = -1
+
+        return np.stack((lowest, opposite), axis=1)
+
+    def edgeLoop(self, edge: int) -> np.ndarray:
+        """Get the edge loop of an edge, walking across valence 4 vertices."""
+
+        edges = self.edges()
+        edge_indptr, edge_faces = self.edgeFaces()
+        vertex_indptr, vertex_edges = self.vertexEdges()
+
+        def step(current: int, vertex: int):
+            candidates = vertex_edges[vertex_indptr[vertex] : vertex_indptr[vertex + 1]]
+            if len(candidates) != 4:
+                return None
+            faces = edge_faces[edge_indptr[current] : edge_indptr[current + 1]]
+            for candidate in candidates:
+                candidate_faces = edge_faces[edge_indptr[candidate] : edge_indptr[candidate + 1]]
+                if candidate != current and not np.isin(candidate_faces, faces).any():
+                    return int(candidate)
+
+        loop = [edge]
+        closed = False
+        for direction, vertex in enumerate(edges[edge]):
+            current = edge
+            while not closed:
+                following = step(current, vertex)
+                if following is None or following in loop:
+                    closed = following == edge
+                    break
+                if direction == 0:
+                    loop.append(following)
+                else:
+                    loop.insert(0, following)
+                current = following
+                vertex = edges[following][0] if edges[following][1] == vertex else edges[following][1]
+
+        return np.array(loop, dtype=np.int64)
+
+    def edgeChain(self, edge_ids: np.ndarray) -> tuple:
+        """Order the vertices of connected edges.
+
+        Returns:
+            tuple: Ordered vertex indices and whether the chain is closed.
+        """
+
+        edges = self.edges()[np.asarray(edge_ids, dtype=np.int64)]
+        vertices, inverse = np.unique(edges.ravel(), return_inverse=True)
+        local_edges = inverse.reshape(-1, 2)
+        valences = np.bincount(local_edges.ravel(), minlength=len(vertices))
+        if (valences > 2).any():
+            raise ValueError("Edges branch, they don't form a single chain")
+
+        indptr, neighbours = _csr(
+            local_edges.ravel(), np.concatenate((local_edges[:, 1:], local_edges[:, :1]), axis=1).ravel(), len(vertices)
+        )
+        ends = np.flatnonzero(valences == 1)
+        closed = not ends.size
+
+        chain = [int(ends[0]) if ends.size else 0]
+        previous = -1
+        while len(chain) < len(vertices):
+            candidates = neighbours[indptr[chain[-1]] : indptr[chain[-1] + 1]]
+            candidates = candidates[candidates != previous]
+            if not candidates.size:
+                break
+            previous = chain[-1]
+            chain.append(int(candidates[0]))
+
+        if len(chain) != len(vertices):
+            raise ValueError("Edges are not connected")
+
+        return vertices[chain], closed
+
+
+def meshPath(mesh: Union[str, om.MDagPath]) -> om.MDagPath:
+    """Get the dag path of a mesh shape from a shape, its transform or a component name.
+
+    Intermediate shapes such as Orig shapes are skipped.
+    """
+
+    if isinstance(mesh, om.MDagPath):
+        return mesh
+
+    selection = om.MSelectionList()
+    selection.add(mesh.split(".")[0])
+    dag_path = selection.getDagPath(0)
+    if dag_path.hasFn(om.MFn.kMesh):
+        return dag_path
+
+    for i in range(dag_path.childCount()):
+        child = dag_path.child(i)
+        if child.hasFn(om.MFn.kMesh) and not om.MFnDagNode(child).isIntermediateObject:
+            dag_path.push(child)
+            return dag_path
+
+    raise ValueError(f"No mesh shape found under {mesh}")
+
+
+def componentIndicesByMesh(components: Union[str, list]) -> list:
+    """Get the sorted indices of single indexed components such as mesh.e[0:12], grouped by mesh.
+
+    Returns:
+        list: (dag path of the mesh shape, component indices) of each mesh, in the order they are met.
+    """
+
+    selection = om.MSelectionList()
+    for component in [components] if isinstance(components, str) else components:
+        selection.add(component)
+
+    meshes = {}
+    for i in range(selection.length()):
+        dag_path, component = selection.getComponent(i)
+        _, indices = meshes.setdefault(dag_path.fullPathName(), (dag_path, []))
+        indices.extend(om.MFnSingleIndexedComponent(component).getElements())
+
+    return [(dag_path, np.unique(np.array(indices, dtype=np.int64))) for dag_path, indices in meshes.values()]
+
+
+def componentIndices(components: Union[str, list]) -> tuple:
+    """Get the mesh dag path and sorted indices of single indexed components of one mesh, such as mesh.e[0:12].
+
+    Returns:
+        tuple: Dag path of the mesh shape and component indices.
+
+    Raises:
+        ValueError: The components belong to several meshes, see componentIndicesByMesh.
+    """
+
+    meshes = componentIndicesByMesh(components)
+    if len(meshes) != 1:
+        names = ", ".join(dag_path.partialPathName() for dag_path, _ in meshes)
+        raise ValueError(f"Components of a single mesh expected, got {len(meshes)} meshes : {names}")
+    return meshes[0]
+
+
+def getTopology(mesh: Union[str, om.MDagPath]) -> Topology:
+    """Get the cached topology of a mesh.
+
+    The cache is keyed on the mesh node. An entry is dropped by a topology changed callback on the mesh, and checked
+    against the vertex, edge and face counts when accessed.
+    """
+
+    dag_path = meshPath(mesh)
+    node = dag_path.node()
+    key = om.MObjectHandle(node).hashCode()
+    mesh_fn = om.MFnMesh(dag_path)
+
+    entry = _TOPOLOGIES.get(key)
+    if entry:
+        handle, topology, _ = entry
+        if handle.isValid() and handle.object() == node and topology.counts() == (
+            mesh_fn.numVertices,
+            mesh_fn.numEdges,
+            mesh_fn.numPolygons,
+        ):
+            topology.mesh_fn = mesh_fn
+            return topology
+        invalidateTopology(key)
+
+    topology = Topology(mesh_fn)
+    callback = om.MPolyMessage.addPolyTopologyChangedCallback(node, _onTopologyChanged, key)
+    _TOPOLOGIES[key] = (om.MObjectHandle(node), topology, callback)
+    return topology
+
+
+def _onTopologyChanged(node, key, *args):
+    invalidateTopology(key)
+
+
+def invalidateTopology(key: int):
+    """Drop a cache entry and its callback."""
+
+    entry = _TOPOLOGIES.pop(key, None)
+    if entry:
+        om.MMessage.removeCallback(entry[2])
+
+
+def clearTopologyCache():
+    for key in list(_TOPOLOGIES):
+        invalidateTopology(key)
@@ -0,0 +1,75 @@
+import sys
+
+from maya.api import OpenMaya as om
+from maya import cmds
+
+# This module is also loaded as a plugin by Maya, which runs it under another module name. The command finds the
+# pending operations in the package module through the name it is called with.
+COMMAND = "sunApiUndo"
+
+_pending = []
+
+
+def maya_useNewAPI():
+    pass
+
+
+class UndoCommand(om.MPxCommand):
+    """Put an operation already done through OpenMaya on the undo queue, with the functions undoing and redoing it."""
+
+    def __init__(self):
+        super().__init__()
+        self.undo = None
+        self.redo = None
+
+    def doIt(self, args: om.MArgList):
+        self.undo, self.redo = sys.modules[args.asString(0)]._pending.pop()
+
+    def undoIt(self):
+        self.undo()
+
+    def redoIt(self):
+        self.redo()
+
+    def isUndoable(self) -> bool:
+        return True
+
+
+def initializePlugin(plugin: om.MObject):
+    om.MFnPlugin(plugin).registerCommand(COMMAND, UndoCommand)
+
+
+def uninitializePlugin(plugin: om.MObject):
+    om.MFnPlugin(plugin).deregisterCommand(COMMAND)
+
+
+def recordUndo(undo, redo):
+    """Put an operation already done in the scene on the Maya undo queue.
+
+    Args:
+        undo: Function undoing the operation, such as the undoIt of its modifiers.
+        redo: Function doing the operation again.
+    """
+
+    if not hasattr(cmds, COMMAND):
+        cmds.loadPlugin(__file__, quiet=True)
+
+    _pending.append((undo, redo))
+    try:
+        getattr(cmds, COMMAND)(__name__)
+    finally:
+        _pending.clear()
+
+
+def modifierUndo(*modifiers: om.MDGModifier):
+    """Put the operations of modifiers already done on the Maya undo queue, they are undone in reverse order."""
+
+    def undo():
+        for modifier in reversed(modifiers):
+            modifier.undoIt()
+
+    def redo():
+        for modifier in modifiers:
+            modifier.doIt()
+
+    recordUndo(undo, redo)
@@ -7,7 +7,6 @@ from shiboken2 import wrapInstance
 from functools import partial
 from ..utils.imports import *
 from ..mayatools import renderman
-reload(renderman)
 
 class RmanMaterialWindowUI(QMainWindow):
 
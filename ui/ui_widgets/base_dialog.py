@@ -1,12 +1,3 @@
-def reload_modules():
-    from importlib import reload
-    
-    from ..utils import constants, ui_tools
-    modules = constants, ui_tools
-    for module in modules:
-        reload(module)      
-reload_modules()
-
 from ...utils.constants import ICON_PATH, USERNAME, STYLE_PATH
 from ..utils.ui_tools import string_to_list
 
@@ -0,0 +1,345 @@
+import inspect
+import json
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable
+
+import maya.cmds as cmds
+
+
+class _Scope:
+    """A timed call of a profiled function, with the cmds calls made directly in it."""
+
+    __slots__ = ("name", "start", "duration", "recursive", "children_time", "commands", "command_time")
+
+    def __init__(self, name: str, start: float, recursive: bool):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.recursive = recursive
+        self.children_time = 0.0
+        self.commands = Counter()
+        self.command_time = Counter()
+
+
+class BuildProfiler:
+    """Time nested builder functions and count the maya.cmds calls they make.
+
+    While the profiler runs, every maya.cmds command is replaced by a counting wrapper. Modules reach cmds through
+    the module attribute, so the calls of every builder are seen without editing them. The functions decorated with
+    profile, and the functions of the instrumented modules, open nested scopes. Everything is restored on exit, the
+    results of the builders don't change.
+
+    Usage :
+        with BuildProfiler("autorig", modules=[arm, leg, spine]) as profiler:
+            autorig_body.run_autorig_body()
+        profiler.export_trace("autorig_trace.json")
+        print(profiler.summary())
+
+    The trace opens in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    active = None
+
+    def __init__(self, name: str = "build", modules: list = (), trace_path: str = "", summary_path: str = ""):
+        """
+        Args:
+            name (str): Name of the root scope.
+            modules (list): Modules whose functions are timed, in addition to the functions decorated with profile.
+            trace_path (str): Chrome trace written on exit.
+            summary_path (str): Text summary written on exit.
+        """
+
+        self.name = name
+        self.modules = list(modules)
+        self.trace_path = trace_path
+        self.summary_path = summary_path
+
+        self.scopes = []
+        self._stack = []
+        self._commands = {}
+        self._functions = []
+        self._origin = 0.0
+
+    def __enter__(self):
+
+        if BuildProfiler.active:
+            raise RuntimeError(f"The build profiler {BuildProfiler.active.name} is already running")
+        BuildProfiler.active = self
+
+        self._wrap_commands()
+        self._instrument()
+        self._origin = time.perf_counter()
+        self._push(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self._pop()
+        for module, attr, function in self._functions:
+            setattr(module, attr, function)
+        for command_name, command in self._commands.items():
+            setattr(cmds, command_name, command)
+        self._functions, self._commands = [], {}
+        BuildProfiler.active = None
+
+        if self.trace_path:
+            self.export_trace(self.trace_path)
+        if self.summary_path:
+            with open(self.summary_path, "w") as summary_file:
+                summary_file.write(self.summary())
+
+    def _push(self, name: str):
+        scope = _Scope(name, time.perf_counter(), any(parent.name == name for parent in self._stack))
+        self._stack.append(scope)
+        self.scopes.append(scope)
+
+    def _pop(self):
+        scope = self._stack.pop()
+        scope.duration = time.perf_counter() - scope.start
+        if self._stack:
+            self._stack[-1].children_time += scope.duration
+
+    def scope(self, name: str) -> "_ScopeContext":
+        """Time a block of code as a nested scope."""
+
+        return _ScopeContext(self, name)
+
+    def _wrap_commands(self):
+        """Replace the maya.cmds commands by wrappers counting their calls in the current scope."""
+
+        for command_name, command in list(vars(cmds).items()):
+            if command_name.startswith("_") or not callable(command) or isinstance(command, type):
+                continue
+            self._commands[command_name] = command
+            setattr(cmds, command_name, self._counted(command_name, command))
+
+    def _counted(self, command_name: str, command: Callable) -> Callable:
+        stack = self._stack
+
+        def counted(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return command(*args, **kwargs)
+            finally:
+                scope = stack[-1]
+                scope.commands[command_name] += 1
+                scope.command_time[command_name] += time.perf_counter() - start
+
+        return counted
+
+    def _instrument(self):
+        """Wrap the functions defined in the instrumented modules, the decorated ones are already timed."""
+
+        for module in self.modules:
+            for attr, function in list(vars(module).items()):
+                if (
+                    inspect.isfunction(function)
+                    and function.__module__ == module.__name__
+                    and not getattr(function, "_profiled", False)
+                ):
+                    self._functions.append((module, attr, function))
+                    setattr(module, attr, profile(function))
+
+    def totals(self) -> dict:
+        """Aggregate the scopes by name.
+
+        Returns:
+            dict: Calls, total time, self time and cmds calls made directly in each scope name, in seconds.
+        """
+
+        totals = {}
+        for scope in self.scopes:
+            entry = totals.setdefault(scope.name, {"calls": 0, "total": 0.0, "self": 0.0, "cmds": 0})
+            entry["calls"] += 1
+            entry["self"] += scope.duration - scope.children_time
+            entry["cmds"] += sum(scope.commands.values())
+
+            # recursive calls would count their time twice
+            if not scope.recursive:
+                entry["total"] += scope.duration
+        return totals
+
+    def command_totals(self) -> dict:
+        """Calls and time in seconds of each cmds command over the whole build."""
+
+        calls, durations = Counter(), Counter()
+        for scope in self.scopes:
+            calls.update(scope.commands)
+            durations.update(scope.command_time)
+        return {command_name: (count, durations[command_name]) for command_name, count in calls.items()}
+
+    def summary(self, limit: int = 40) -> str:
+        """Flat text summary of the slowest scopes and the most called cmds commands."""
+
+        root = self.scopes[0].duration if self.scopes else 0.0
+        lines = [f"Build profile : {self.name} {root:.3f}s", ""]
+
+        lines.append(f"{'function':<50}{'calls':>8}{'total s':>10}{'self s':>10}{'cmds':>8}")
+        totals = sorted(self.totals().items(), key=lambda item: item[1]["total"], reverse=True)
+        for name, entry in totals[:limit]:
+            lines.append(
+                f"{name:<50}{entry['calls']:>8}{entry['total']:>10.3f}{entry['self']:>10.3f}{entry['cmds']:>8}"
+            )
+
+        lines += ["", f"{'command':<50}{'calls':>8}{'total s':>10}"]
+        commands = sorted(self.command_totals().items(), key=lambda item: item[1][0], reverse=True)
+        for command_name, (count, duration) in commands[:limit]:
+            lines.append(f"{command_name:<50}{count:>8}{duration:>10.3f}")
+
+        return "\n".join(lines)
+
+    def trace_events(self) -> list:
+        """Chrome trace complete events of the scopes, in microseconds from the start of the build."""
+
+        events = [{"name": "process_name", "ph": "M", "pid": 0, "tid": 0, "args": {"name": self.name}}]
+        for scope in self.scopes:
+            events.append(
+                {
+                    "name": scope.name,
+                    "cat": "build",
+                    "ph": "X",
+                    "ts": round((scope.start - self._origin) * 1e6, 3),
+                    "dur": round(scope.duration * 1e6, 3),
+                    "pid": 0,
+                    "tid": 0,
+                    "args": dict(scope.commands.most_common()),
+                }
+            )
+        return events
+
+    def export_trace(self, path: str) -> str:
+        """Write the Chrome trace event JSON of the build."""
+
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, trace_file)
+        return path
+
+
+class _ScopeContext:
+
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler: BuildProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+
+    def __exit__(self, *exc_info):
+        self.profiler._pop()
+
+
+def profile(func: Callable = None, name: str = ""):
+    """Time a builder function as a nested scope when a BuildProfiler runs, call it directly otherwise.
+
+    Usable as @profile or @profile(name="...").
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = BuildProfiler.active
+            if profiler is None:
+                return func(*args, **kwargs)
+            profiler._push(label)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._pop()
+
+        wrapper._profiled = True
+        return wrapper
+
+    return decorator(func) if func else decorator
+
+
+def playback_fps(frames: int, evaluation_mode: str = "parallel") -> float:
+    """Play frames 1 to frames with the evaluation manager in a mode, and measure the frames per second.
+
+    The interface plays the timeline once, without speed limit. A batch session can't play : the frames are set with
+    currentTime, which evaluates the scene through the evaluation manager too. A first pass builds the evaluation
+    graph and is not timed. The evaluation mode, the playback options and the current time are restored.
+
+    Args:
+        frames (int): Last frame played.
+        evaluation_mode (str): "parallel", "serial" or "off", the DG evaluation.
+
+    Returns:
+        float: Frames per second of the timed pass.
+    """
+
+    flags = ("minTime", "maxTime", "loop", "playbackSpeed", "maxPlaybackSpeed")
+    options = {flag: cmds.playbackOptions(query=True, **{flag: True}) for flag in flags}
+    mode = cmds.evaluationManager(query=True, mode=True)[0]
+    current = cmds.currentTime(query=True)
+    interactive = not cmds.about(batch=True)
+
+    def play():
+        if interactive:
+            cmds.currentTime(1)
+            cmds.play(forward=True, wait=True)
+        else:
+            for frame in range(1, frames + 1):
+                cmds.currentTime(frame, update=True)
+
+    cmds.evaluationManager(mode=evaluation_mode)
+    cmds.playbackOptions(minTime=1, maxTime=frames, loop="once", playbackSpeed=0, maxPlaybackSpeed=0)
+    try:
+        play()
+        start = time.perf_counter()
+        play()
+        duration = time.perf_counter() - start
+    finally:
+        cmds.playbackOptions(**options)
+        cmds.evaluationManager(mode=mode)
+        cmds.currentTime(current)
+
+    return frames / duration
+
+
+def benchmark_builds(
+    variants: list,
+    build: Callable,
+    setup: Callable = None,
+    animate: Callable = None,
+    frames: int = 100,
+    evaluation_mode: str = "parallel",
+) -> dict:
+    """Build each variant of a rig in a new scene, and compare their node count and playback speed.
+
+    Args:
+        variants (list): Values passed to build, such as backend names.
+        build (Callable): Build the rig of a variant, called as build(variant). Its nodes are counted.
+        setup (Callable): Create what the rig is built on, called as setup(frames) before counting the nodes.
+        animate (Callable): Animate the rig from frame 1 to frames, called as animate(frames) after counting the nodes.
+        frames (int): Number of frames played.
+        evaluation_mode (str): Evaluation manager mode of the playback, see playback_fps.
+
+    Returns:
+        dict: Number of created nodes and played frames per second of each variant.
+    """
+
+    results = {}
+
+    for variant in variants:
+        cmds.file(new=True, force=True)
+        if setup:
+            setup(frames)
+
+        nodes_before = set(cmds.ls())
+        build(variant)
+        node_count = len(set(cmds.ls()) - nodes_before)
+
+        if animate:
+            animate(frames)
+        fps = playback_fps(frames, evaluation_mode)
+
+        results[variant] = {"nodes": node_count, "fps": round(fps, 1)}
+        print(f"{variant} : {node_count} nodes, {fps:.1f} fps ({evaluation_mode} playback)")
+
+    return results
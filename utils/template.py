@@ -1,9 +1,7 @@
 # --------------------------------------------------
 from .reloading import ReloadModule
 class RM(ReloadModule):
-    @classmethod
-    def reload_mod(cls):
-        # importer les modules
-        cls.reload("les modules")
+    # les modules modifiés, rechargés avec les modules qui les importent (SUN_DEV=1 uniquement)
+    modules = ("les modules",)
 RM.reload()
-# --------------------------------------------------
\ No newline at end of file
+# --------------------------------------------------